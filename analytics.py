@@ -0,0 +1,219 @@
+# analytics.py
+# Offline statistics over wordlist.txt and the answer pools (WORDS_BY_LENGTH):
+#   - letter and letter-by-position frequencies per length
+#   - best opening words per length under several strategies, with the average
+#     number of candidates left after each opener
+#   - hardest answers (most guesses for the reference solver)
+#
+#   python analytics.py                 # every length, cached by input hash
+#   python analytics.py -l 5 --openers 300 --no-cache
+#
+# The dictionary is published once into shared memory; worker processes attach to it
+# and each scores a shard of openers / answers.
+import argparse
+import hashlib
+import json
+import math
+import os
+import random
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+from game_module import load_game
+
+game = load_game()
+
+ANALYTICS_VERSION = 1
+CACHE_DIR = ".analytics_cache"
+STRATEGIES = ("expected", "entropy", "minimax")
+TOP_N = 10
+
+# ---------------------------------------------------------
+# SHARED DICTIONARY
+# ---------------------------------------------------------
+_WORDS = {}
+
+def _attach(name, lengths):
+    # Worker initializer: map the published dictionary and unpack the lengths we need once
+    shared = game.SharedDictionary.attach(name)
+    for L in lengths: _WORDS[L] = shared.words_of_length(L)
+    shared.close()
+
+# ---------------------------------------------------------
+# WORKER TASKS
+# ---------------------------------------------------------
+def count_letters(task):
+    """Letter and per-position counts for one shard of a length's words."""
+    L, start, end = task
+    letters, positions = Counter(), [Counter() for _ in range(L)]
+    for w in _WORDS[L][start:end]:
+        letters.update(w)
+        for i, ch in enumerate(w): positions[i][ch] += 1
+    return L, letters, positions
+
+def _partition(guess, secrets):
+    buckets = Counter()
+    for s in secrets: buckets[tuple(game.WordleEngine.check_guess(guess, s))] += 1
+    return buckets
+
+def score_openers(task):
+    """Scores a shard of openers against every word of the length and against the answer pool."""
+    L, openers, answers = task
+    secrets = _WORDS[L]
+    n, out = len(secrets), []
+    for g in openers:
+        sizes = _partition(g, secrets).values()
+        ans_sizes = _partition(g, answers).values() if answers else ()
+        out.append({
+            "word": g,
+            "expected": sum(c * c for c in sizes) / n, # average candidates left
+            "entropy": -sum(c / n * math.log2(c / n) for c in sizes),
+            "minimax": max(sizes),
+            "answers_expected": sum(c * c for c in ans_sizes) / len(answers) if answers else None,
+        })
+    return L, out
+
+def solve_answers(task):
+    """Guesses the reference (entropy) solver needs for each answer in a shard."""
+    L, answers, candidates, seed = task
+    out = []
+    for i, secret in enumerate(answers):
+        solver = game.WordSolver(L, words=_WORDS[L], rng=random.Random(seed + i))
+        n = None
+        for k in range(1, 21):
+            guess = solver.best_guess(candidates, strategy="entropy")
+            if guess is None: break
+            if guess == secret:
+                n = k
+                break
+            solver.observe(guess, game.WordleEngine.check_guess(guess, secret))
+        out.append({"word": secret, "guesses": n, "solved_in_time": n is not None and n <= game.MAX_ATTEMPTS})
+    return L, out
+
+# ---------------------------------------------------------
+# DRIVER
+# ---------------------------------------------------------
+def shards(items, parts):
+    step = max(1, math.ceil(len(items) / parts))
+    return [items[i:i + step] for i in range(0, len(items), step)]
+
+def opener_pool(words, letters, size):
+    """Most promising openers by summed frequency of their distinct letters."""
+    return sorted(words, key=lambda w: (-sum(letters[c] for c in set(w)), w))[:size]
+
+def input_hash(wordlist_path, lengths, args):
+    h = hashlib.sha256()
+    with open(wordlist_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""): h.update(chunk)
+    h.update(json.dumps({"answers": {L: game.WORDS_BY_LENGTH[L] for L in lengths}, "lengths": lengths,
+                         "openers": args.openers, "candidates": args.candidates, "seed": args.seed,
+                         "version": ANALYTICS_VERSION}, sort_keys=True).encode())
+    return h.hexdigest()
+
+def analyze(lengths, words, args):
+    words_by_length = {L: sorted(game.words_of_length(L, words)) for L in lengths}
+    answers = {L: [w for w in game.WORDS_BY_LENGTH[L] if w in words] for L in lengths}
+    workers = args.workers
+    shared = game.SharedDictionary.publish(w for ws in words_by_length.values() for w in ws)
+    try:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_attach, initargs=(shared.name, lengths)) as pool:
+            # 1. Frequencies
+            tasks = [(L, s, min(s + math.ceil(len(ws) / workers), len(ws)))
+                     for L, ws in words_by_length.items() for s in range(0, len(ws), max(1, math.ceil(len(ws) / workers)))]
+            letters = {L: Counter() for L in lengths}
+            positions = {L: [Counter() for _ in range(L)] for L in lengths}
+            for L, lc, pc in pool.map(count_letters, tasks):
+                letters[L].update(lc)
+                for i, c in enumerate(pc): positions[L][i].update(c)
+
+            # 2. Openers and 3. hardest answers, all lengths in flight at once
+            opener_tasks = [(L, chunk, answers[L])
+                            for L in lengths
+                            for chunk in shards(opener_pool(words_by_length[L], letters[L], args.openers), workers)]
+            answer_tasks = [(L, chunk, args.candidates, args.seed) for L in lengths for chunk in shards(answers[L], workers)]
+            opener_futs = [pool.submit(score_openers, t) for t in opener_tasks]
+            answer_futs = [pool.submit(solve_answers, t) for t in answer_tasks]
+            scored = {L: [] for L in lengths}
+            for f in opener_futs:
+                L, rows = f.result()
+                scored[L] += rows
+            solved = {L: [] for L in lengths}
+            for f in answer_futs:
+                L, rows = f.result()
+                solved[L] += rows
+    finally:
+        shared.close()
+        shared.unlink()
+
+    report = {}
+    for L in lengths:
+        total = sum(letters[L].values()) or 1
+        best = {
+            "expected": sorted(scored[L], key=lambda r: (r["expected"], r["word"]))[:TOP_N],
+            "entropy": sorted(scored[L], key=lambda r: (-r["entropy"], r["word"]))[:TOP_N],
+            "minimax": sorted(scored[L], key=lambda r: (r["minimax"], r["word"]))[:TOP_N],
+        }
+        report[str(L)] = {
+            "words": len(words_by_length[L]),
+            "answers": len(answers[L]),
+            "letter_freq": {ch: round(c / total, 5) for ch, c in letters[L].most_common()},
+            "position_freq": [{ch: c for ch, c in pos.most_common(5)} for pos in positions[L]],
+            "best_openers": {k: [{"word": r["word"], "avg_remaining": round(r["expected"], 2),
+                                  "entropy_bits": round(r["entropy"], 3), "worst_case": r["minimax"],
+                                  "avg_remaining_answers": None if r["answers_expected"] is None else round(r["answers_expected"], 3)}
+                                 for r in rows] for k, rows in best.items()},
+            "hardest_answers": sorted(solved[L], key=lambda r: (-(r["guesses"] or 99), r["word"]))[:TOP_N],
+        }
+    return report
+
+def print_summary(report):
+    for L, r in report.items():
+        print(f"\n== {L} letters: {r['words']} words, {r['answers']} answers ==")
+        print("  top letters: " + " ".join(f"{ch}:{p:.1%}" for ch, p in list(r["letter_freq"].items())[:8]))
+        for k in STRATEGIES:
+            top = r["best_openers"][k][:3]
+            print(f"  best {k:<8}: " + ", ".join(f"{o['word']} (left {o['avg_remaining']})" for o in top))
+        hard = r["hardest_answers"][:5]
+        print("  hardest answers: " + ", ".join(f"{h['word']} ({h['guesses'] or 'X'})" for h in hard))
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Word-list analytics for WorDuel.")
+    ap.add_argument("-l", "--length", action="append", type=int, choices=sorted(game.WORDS_BY_LENGTH),
+                    help="word length (repeatable, default: all)")
+    ap.add_argument("--openers", type=int, default=150, help="opening words to score per length")
+    ap.add_argument("--candidates", type=int, default=40, help="candidates the reference solver weighs per guess")
+    ap.add_argument("-w", "--workers", type=int, default=os.cpu_count() or 1)
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--wordlist", default="wordlist.txt", help="dictionary to analyze (one word per line)")
+    ap.add_argument("--out", help="also write the report here")
+    ap.add_argument("--no-cache", action="store_true", help="recompute even if a cached report exists")
+    args = ap.parse_args(argv)
+
+    lengths = sorted(set(args.length or game.WORDS_BY_LENGTH))
+    words = game.load_valid_words(args.wordlist, fallback_url=None)
+    if not words:
+        print(f"No words in {args.wordlist}; nothing to analyze.")
+        return 1
+    key = input_hash(args.wordlist, lengths, args)
+    cache_path = os.path.join(CACHE_DIR, f"{key}.json")
+
+    t0 = time.perf_counter()
+    if not args.no_cache and os.path.exists(cache_path):
+        with open(cache_path, "r", encoding="utf-8") as f: report = json.load(f)
+        print(f"Using cached report {cache_path}")
+    else:
+        report = analyze(lengths, words, args)
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        tmp = cache_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f: json.dump(report, f, indent=2)
+        os.replace(tmp, cache_path)
+    print_summary(report)
+    print(f"\nDone in {time.perf_counter() - t0:.2f}s")
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f: json.dump(report, f, indent=2)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,68 +1,114 @@
 # diag.py
-import os, sys
+# Asset health check: finds the avatar layers the game would load, decodes every one of
+# them in parallel and flags anything that will look wrong or load slowly.
+#
+#   python diag.py                      # check, print a summary, write diag_report.json
+#   python diag.py --max-kb 32 --strict # tighter size limit, exit 1 on any warning
+#
+# Exits with status 1 if a layer fails to decode (or, with --strict, on any issue).
+import argparse
+import json
+import os
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
 
-# 1) PIL availability
-try:
-    from PIL import Image
-    print("PIL available: yes")
-except Exception as e:
-    print("PIL available: NO -> install with: pip install pillow")
-    Image = None
+from game_module import load_game, git_commit
+
+game = load_game()
 
-# 2) Where am I running?
-cwd = os.getcwd()
-print("Working dir:", cwd)
+MAX_FILE_KB = 48       # Bigger than this is flagged as oversized
+MAX_RESIZE_FACTOR = 4  # Sources more than this many times DISPLAY_SIZE cost a heavy resize on every load
 
-# 3) Where assets are read from in the game
-ASSETS_DIR = "assets"
-search_dirs = [cwd]
-if os.path.isdir(ASSETS_DIR):
-    search_dirs.append(os.path.join(cwd, ASSETS_DIR))
-print("Search dirs:", search_dirs)
+def kind_of(path):
+    name = os.path.basename(path).lower()
+    return next((k for k in ("base", "expr", "outfit") if name.startswith(k + "_")), None)
 
-# 4) List png files found
-pngs = []
-for d in search_dirs:
+def inspect(path):
+    """Decodes one layer and returns its facts and timings (runs in a worker process)."""
+    from PIL import Image
+    row = {"file": os.path.basename(path), "path": path, "kind": kind_of(path), "bytes": os.path.getsize(path)}
     try:
-        for fn in sorted(os.listdir(d)):
-            if fn.lower().endswith(".png"):
-                full = os.path.join(d, fn)
-                pngs.append(full)
+        t0 = time.perf_counter()
+        with Image.open(path) as im:
+            row.update(size=list(im.size), mode=im.mode, metadata=sorted(im.info))
+            im.load()
+            row["decode_ms"] = round((time.perf_counter() - t0) * 1000, 3)
+            rgba = im.convert("RGBA")
+        alpha = rgba.getchannel("A")
+        row["alpha_bbox"] = alpha.getbbox() # None: nothing visible at all
+        row["opaque"] = alpha.getextrema()[0] == 255
+        # What the game does on every load (load_and_prepare_image)
+        t0 = time.perf_counter()
+        game.load_and_prepare_image(path)
+        row["prepare_ms"] = round((time.perf_counter() - t0) * 1000, 3)
     except Exception as e:
-        print("Could not list", d, ":", e)
+        row["error"] = f"{type(e).__name__}: {e}"
+    return row
+
+def issues_for(row, common_size, max_kb):
+    """Human-readable problems with one layer (empty list if it is healthy)."""
+    if "error" in row: return [f"cannot decode ({row['error']})"]
+    out = []
+    w, h = row["size"]
+    if row["mode"] != "RGBA": out.append(f"mode {row['mode']}, converted to RGBA on every load")
+    if w != h: out.append(f"not square ({w}x{h}), will be stretched")
+    if common_size and row["size"] != common_size: out.append(f"size {w}x{h} differs from most layers ({common_size[0]}x{common_size[1]})")
+    if row["alpha_bbox"] is None: out.append("fully transparent")
+    elif row["opaque"] and row["kind"] in ("expr", "outfit"): out.append("no transparency, hides the layers below")
+    if row["bytes"] > max_kb * 1024: out.append(f"oversized file ({row['bytes'] / 1024:.0f} KB > {max_kb} KB)")
+    if max(w, h) > game.DISPLAY_SIZE * MAX_RESIZE_FACTOR:
+        out.append(f"needs a {w}x{h} -> {game.DISPLAY_SIZE}x{game.DISPLAY_SIZE} resize on every load ({row['prepare_ms']:.1f} ms)")
+    if row["metadata"]: out.append("carries metadata: " + ", ".join(row["metadata"]))
+    return out
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Validate WorDuel avatar layers.")
+    ap.add_argument("--max-kb", type=int, default=MAX_FILE_KB, help="flag files bigger than this")
+    ap.add_argument("-w", "--workers", type=int, default=os.cpu_count() or 1)
+    ap.add_argument("--out", default="diag_report.json", help="where to write the JSON report")
+    ap.add_argument("--strict", action="store_true", help="exit 1 on any issue, not just decode failures")
+    args = ap.parse_args(argv)
+
+    print("PIL available:", "yes" if game.PIL_AVAILABLE else "NO -> install with: pip install pillow")
+    print("Working dir:", os.getcwd())
+    bases, exprs, outfits = game.find_layer_files()
+    paths = sorted({*bases.values(), *exprs.values(), *outfits.values()})
+    print(f"Layers found: {len(bases)} base_, {len(exprs)} expr_, {len(outfits)} outfit_")
+    if not paths:
+        print("\nNo layer PNGs found. Common causes:")
+        print(" - Files still in a zip; unzip them into this folder or 'assets/'")
+        print(" - Filenames need to start with base_, expr_, outfit_ (case-insensitive).")
+        return 1
+    if not game.PIL_AVAILABLE: return 1
 
-print("PNG files discovered:")
-for p in pngs:
-    print(" -", p)
+    t0 = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        rows = list(pool.map(inspect, paths))
+    wall = time.perf_counter() - t0
 
-# 5) Show which files match prefixes the game expects
-bases = [p for p in pngs if os.path.basename(p).lower().startswith("base_")]
-exprs = [p for p in pngs if os.path.basename(p).lower().startswith("expr_")]
-outfits = [p for p in pngs if os.path.basename(p).lower().startswith("outfit_")]
-print("\nMatches by prefix:")
-print(" base_ :", bases or "(none)")
-print(" expr_ :", exprs or "(none)")
-print(" outfit_:", outfits or "(none)")
+    sizes = Counter(tuple(r["size"]) for r in rows if "size" in r)
+    common_size = list(sizes.most_common(1)[0][0]) if sizes else None
+    failed = 0
+    for r in rows:
+        r["issues"] = issues_for(r, common_size, args.max_kb)
+        failed += "error" in r
 
-# 6) If no prefix matches, print suggestions (show top PNG names)
-if not (bases or exprs or outfits):
-    print("\nNo prefix-matching PNGs found. Common causes:")
-    print(" - Files still in a zip; unzip them into this folder or 'assets/'")
-    print(" - Filenames need to start with base_, expr_, outfit_ (case-insensitive).")
-    print("\nPNG filenames found (helpful hints):")
-    for p in pngs[:40]:
-        print("  ", os.path.basename(p))
+    print(f"\n{'file':<24}{'KB':>7}{'size':>11}{'decode ms':>11}{'load ms':>9}  issues")
+    for r in sorted(rows, key=lambda r: -r.get("prepare_ms", 0)):
+        size = "x".join(map(str, r.get("size", []))) or "-"
+        print(f"{r['file']:<24}{r['bytes'] / 1024:>7.1f}{size:>11}{r.get('decode_ms', 0):>11.2f}{r.get('prepare_ms', 0):>9.2f}  "
+              + ("; ".join(r["issues"]) or "ok"))
+    flagged = sum(bool(r["issues"]) for r in rows)
+    print(f"\n{len(rows)} layers checked in {wall:.2f}s: {flagged} with issues, {failed} unreadable")
 
-# 7) If PIL available, attempt to open up to 10 files and show sizes
-if Image:
-    print("\nAttempting to open and read PNGs (first 10):")
-    for p in pngs[:10]:
-        try:
-            im = Image.open(p)
-            print(f"  {os.path.basename(p)} -> size={im.size}, mode={im.mode}")
-            im.close()
-        except Exception as e:
-            print(f"  FAILED to open {p}: {e}")
+    report = {"commit": git_commit(), "display_size": game.DISPLAY_SIZE, "max_kb": args.max_kb,
+              "common_size": common_size, "wall_s": round(wall, 3),
+              "total_bytes": sum(r["bytes"] for r in rows), "assets": rows}
+    with open(args.out, "w", encoding="utf-8") as f: json.dump(report, f, indent=2)
+    print(f"Wrote {args.out}")
+    return 1 if failed or (args.strict and flagged) else 0
 
-print("\nIf you want I can update the game script to accept your exact filenames automatically.")
-print("If you prefer that, paste the exact filenames (case-sensitive) shown above and I will adapt the loader.")
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,149 @@
+# difficulty.py
+# Offline difficulty ratings for every answer in WORDS_BY_LENGTH, written to difficulty.bin
+# for the game's difficulty tiers (see DIFFICULTY RATINGS in the game):
+#   - expected guesses: the reference (entropy) solver's mean over --runs seeded games
+#   - neighbours: dictionary words that differ from the answer in exactly one letter
+#   score = expected guesses + NEIGHBOUR_WEIGHT * neighbours
+#
+#   python difficulty.py                 # rate every length, write difficulty.bin
+#   python difficulty.py -l 5 --runs 32 --show 10
+#
+# The dictionary is published once into shared memory; worker processes attach to it and
+# each rates a shard of (answer, seed) games.
+import argparse
+import json
+import math
+import os
+import random
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+from game_module import load_game, git_commit
+
+game = load_game()
+
+MAX_GUESSES = 20 # A game the solver has not finished by then counts as this many
+
+# ---------------------------------------------------------
+# SHARED DICTIONARY
+# ---------------------------------------------------------
+_WORDS = {}
+
+def _attach(name, lengths):
+    # Worker initializer: map the published dictionary and unpack the lengths we need once
+    shared = game.SharedDictionary.attach(name)
+    for L in lengths: _WORDS[L] = shared.words_of_length(L)
+    shared.close()
+
+# ---------------------------------------------------------
+# WORKER TASKS
+# ---------------------------------------------------------
+def play_games(task):
+    """Guesses the reference solver needs for each (answer, seed) game in a shard."""
+    L, games, candidates = task
+    out = []
+    for secret, seed in games:
+        words = _WORDS[L] if secret in game.VALID_WORDS else _WORDS[L] + [secret]
+        solver = game.WordSolver(L, words=words, rng=random.Random(seed))
+        n = MAX_GUESSES
+        for k in range(1, MAX_GUESSES + 1):
+            guess = solver.best_guess(candidates, strategy="entropy")
+            if guess is None: break
+            if guess == secret:
+                n = k
+                break
+            solver.observe(guess, game.WordleEngine.check_guess(guess, secret))
+        out.append((L, secret, n))
+    return out
+
+def count_neighbours(words, answers):
+    """One-letter neighbours of each answer, by wildcard bucket: "li_ht" holds light/might/...
+    Two different words share at most one bucket, so bucket sizes add up exactly."""
+    L = len(answers[0])
+    buckets = Counter(w[:i] + "_" + w[i + 1:] for w in words for i in range(L))
+    known = set(words)
+    return [sum(buckets[a[:i] + "_" + a[i + 1:]] - (a in known) for i in range(L)) for a in answers]
+
+# ---------------------------------------------------------
+# DRIVER
+# ---------------------------------------------------------
+def shards(items, parts):
+    step = max(1, math.ceil(len(items) / parts))
+    return [items[i:i + step] for i in range(0, len(items), step)]
+
+def rate(lengths, args):
+    words_by_length = {L: sorted(game.words_of_length(L)) for L in lengths}
+    shared = game.SharedDictionary.publish(w for ws in words_by_length.values() for w in ws)
+    guesses = {L: {w: [] for w in game.WORDS_BY_LENGTH[L]} for L in lengths}
+    try:
+        with ProcessPoolExecutor(max_workers=args.workers, initializer=_attach, initargs=(shared.name, lengths)) as pool:
+            games = [(L, (w, args.seed + 1000 * i + r)) for L in lengths
+                     for i, w in enumerate(game.WORDS_BY_LENGTH[L]) for r in range(args.runs)]
+            tasks = [(L, [g for _, g in chunk], args.candidates)
+                     for L in lengths for chunk in shards([g for g in games if g[0] == L], args.workers)]
+            for rows in pool.map(play_games, tasks):
+                for L, secret, n in rows: guesses[L][secret].append(n)
+    finally:
+        shared.close()
+        shared.unlink()
+
+    table, rows = {}, {}
+    for L in lengths:
+        answers = game.WORDS_BY_LENGTH[L]
+        neighbours = count_neighbours(words_by_length[L], answers)
+        rows[L] = []
+        for w, nb in zip(answers, neighbours):
+            expected = sum(guesses[L][w]) / len(guesses[L][w])
+            rows[L].append({"word": w, "expected_guesses": round(expected, 3), "neighbours": nb,
+                            "score": round(game.difficulty_score(expected, nb), 2)})
+        table[L] = [r["score"] for r in rows[L]]
+    return table, rows
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Rate every WorDuel answer word by difficulty.")
+    ap.add_argument("-l", "--length", action="append", type=int, choices=sorted(game.WORDS_BY_LENGTH),
+                    help="word length (repeatable, default: all)")
+    ap.add_argument("--runs", type=int, default=16, help="seeded solver games per answer")
+    ap.add_argument("--candidates", type=int, default=40, help="candidates the reference solver weighs per guess")
+    ap.add_argument("-w", "--workers", type=int, default=os.cpu_count() or 1)
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--out", default=game.DIFFICULTY_FILE, help="where to write the table")
+    ap.add_argument("--report", help="also write every rating as JSON here")
+    ap.add_argument("--show", type=int, default=3, help="easiest/hardest answers to print per length")
+    args = ap.parse_args(argv)
+
+    lengths = sorted(set(args.length or game.WORDS_BY_LENGTH))
+    if not game.VALID_WORDS:
+        print("No dictionary loaded; nothing to rate.")
+        return 1
+    t0 = time.perf_counter()
+    table, rows = rate(lengths, args)
+    # Keep the ratings already in the table for lengths we were not asked to redo
+    if os.path.exists(args.out) and set(lengths) != set(game.WORDS_BY_LENGTH):
+        try:
+            with open(args.out, "rb") as f: table = {**game.unpack_difficulty(f.read()), **table}
+        except ValueError: pass
+
+    for L in lengths:
+        ranked = sorted(rows[L], key=lambda r: (r["score"], r["word"]))
+        fmt = lambda r: f"{r['word']} {r['score']:.2f} ({r['expected_guesses']:.2f}g, {r['neighbours']}n)"
+        print(f"{L} letters, {len(ranked)} answers")
+        print("  easiest: " + ", ".join(fmt(r) for r in ranked[:args.show]))
+        print("  hardest: " + ", ".join(fmt(r) for r in ranked[::-1][:args.show]))
+
+    data = game.pack_difficulty(table)
+    tmp = args.out + ".tmp"
+    with open(tmp, "wb") as f: f.write(data)
+    os.replace(tmp, args.out)
+    print(f"\nWrote {args.out} ({len(data)} bytes, {sum(map(len, table.values()))} answers) in {time.perf_counter() - t0:.2f}s")
+    if args.report:
+        report = {"commit": git_commit(), "runs": args.runs, "candidates": args.candidates, "seed": args.seed,
+                  "neighbour_weight": game.NEIGHBOUR_WEIGHT, "lengths": {str(L): rows[L] for L in lengths}}
+        with open(args.report, "w", encoding="utf-8") as f: json.dump(report, f, indent=2)
+        print(f"Wrote {args.report}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,168 @@
+# download_check.py
+# Exercises download_wordlist against a local HTTP stand-in on 127.0.0.1: interrupted
+# downloads and Range resumes, servers that answer a Range with 200, 416 for an already
+# complete .part file, digest mismatches and truncated chunked bodies.
+#
+#   python download_check.py        # run every case, exit 1 if any fails
+#   python download_check.py -k 416 # only cases whose name contains "416"
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import traceback
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from game_module import load_game
+
+game = load_game()
+
+WORDS = sorted({f"{a}{b}{c}" for a in "abcdefghij" for b in "klmnopqrst" for c in "uvwxyzabcd"})
+BODY = "".join(w + "\n" for w in WORDS).encode("utf-8")
+CUT_AT = len(BODY) // 3 # Where interrupted responses stop
+
+# ---------------------------------------------------------
+# HTTP STAND-IN
+# ---------------------------------------------------------
+class Handler(BaseHTTPRequestHandler):
+    """Serves BODY the way Server.mode says; every Range header it sees goes into Server.ranges."""
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args): pass
+
+    def do_GET(self):
+        mode, rng = self.server.mode, self.headers.get("Range")
+        self.server.ranges.append(rng)
+        start = int(rng[len("bytes="):].split("-")[0]) if rng else 0
+        if mode == "chunked_cut":
+            self.send_response(200)
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            piece = BODY[:CUT_AT]
+            self.wfile.write(f"{len(piece):x}\r\n".encode() + piece + b"\r\n")
+            self.wfile.flush()
+            self.close_connection = True # No terminating 0-length chunk
+            return
+        if rng and mode != "ignore_range":
+            if start >= len(BODY):
+                self.send_response(416)
+                self.send_header("Content-Range", f"bytes */{len(BODY)}")
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            self.send_response(206)
+            self.send_header("Content-Range", f"bytes {start}-{len(BODY) - 1}/{len(BODY)}")
+            body = BODY[start:]
+        else:
+            self.send_response(200)
+            body = BODY
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if mode == "cut":
+            self.wfile.write(body[:CUT_AT])
+            self.close_connection = True
+        else:
+            self.wfile.write(body)
+
+class Server(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), Handler)
+        self.mode, self.ranges = "full", []
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}/words.txt"
+
+# ---------------------------------------------------------
+# CASES
+# ---------------------------------------------------------
+def expect_failure(srv, path, **kw):
+    try: game.download_wordlist(srv.url, path, timeout=5, **kw)
+    except game.WordlistDownloadError as e: return e
+    raise AssertionError("download should have failed")
+
+def case_interrupted_then_resume(srv, path):
+    srv.mode = "cut"
+    expect_failure(srv, path)
+    assert os.path.getsize(path + ".part") == CUT_AT, "partial bytes should be kept"
+    assert not os.path.exists(path)
+    srv.mode, srv.ranges = "full", []
+    words = game.download_wordlist(srv.url, path, expected_digest=game.wordlist_digest(WORDS))
+    assert srv.ranges == [f"bytes={CUT_AT}-"], srv.ranges
+    assert words == set(WORDS) and not os.path.exists(path + ".part")
+    with open(path, "rb") as f: assert f.read() == BODY
+
+def case_range_answered_with_206(srv, path):
+    with open(path + ".part", "wb") as f: f.write(BODY[:CUT_AT])
+    srv.mode = "full"
+    assert game.download_wordlist(srv.url, path) == set(WORDS)
+    with open(path, "rb") as f: assert f.read() == BODY
+
+def case_range_answered_with_200(srv, path):
+    # The server ignores Range and resends everything: the .part file must start over, not grow
+    with open(path + ".part", "wb") as f: f.write(BODY[:CUT_AT])
+    srv.mode = "ignore_range"
+    assert game.download_wordlist(srv.url, path) == set(WORDS)
+    assert srv.ranges == [f"bytes={CUT_AT}-"], srv.ranges
+    with open(path, "rb") as f: assert f.read() == BODY
+
+def case_416_when_part_complete(srv, path):
+    with open(path + ".part", "wb") as f: f.write(BODY)
+    srv.mode = "full"
+    assert game.download_wordlist(srv.url, path, expected_digest=game.wordlist_digest(WORDS)) == set(WORDS)
+    assert srv.ranges == [f"bytes={len(BODY)}-"], srv.ranges
+    assert os.path.exists(path) and not os.path.exists(path + ".part")
+
+def case_digest_mismatch_removes_part(srv, path):
+    srv.mode = "full"
+    e = expect_failure(srv, path, expected_digest="0" * 64)
+    assert "digest mismatch" in str(e), e
+    assert not os.path.exists(path + ".part") and not os.path.exists(path)
+
+def case_truncated_chunked_body(srv, path):
+    srv.mode = "chunked_cut"
+    expect_failure(srv, path)
+    assert os.path.exists(path + ".part"), "partial bytes should be kept for resuming"
+    assert not os.path.exists(path)
+
+def case_load_valid_words_survives(srv, path):
+    # The game's import path: a failed download means no dictionary, never an exception
+    srv.mode = "chunked_cut"
+    assert game.load_valid_words(path, fallback_url=srv.url) == set()
+
+CASES = {name[len("case_"):]: fn for name, fn in globals().items() if name.startswith("case_")}
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Check download_wordlist against a local HTTP server.")
+    ap.add_argument("-k", help="only cases whose name contains this")
+    args = ap.parse_args(argv)
+
+    srv = Server()
+    ran = failed = 0
+    try:
+        for name, fn in CASES.items():
+            if args.k and args.k not in name: continue
+            ran += 1
+            tmp = tempfile.mkdtemp(prefix="worduel-dl-")
+            srv.mode, srv.ranges = "full", []
+            try:
+                fn(srv, os.path.join(tmp, "wordlist.txt"))
+                print(f"ok    {name}")
+            except Exception:
+                failed += 1
+                print(f"FAIL  {name}")
+                traceback.print_exc()
+            finally:
+                shutil.rmtree(tmp, ignore_errors=True)
+    finally:
+        srv.shutdown()
+        srv.server_close()
+    print(f"\n{ran - failed} passed, {failed} failed")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,33 @@
+# game_module.py
+# Loads the game script as an importable module for the command-line tools.
+# The script's file name isn't a valid module name, so it is imported by path.
+import importlib.util
+import os
+import sys
+
+GAME_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "wordle(latest version).py")
+MODULE_NAME = "worduel"
+
+def load_game():
+    """Imports the game script once (no Tk window is created) and returns the module."""
+    mod = sys.modules.get(MODULE_NAME)
+    if mod is not None: return mod
+    spec = importlib.util.spec_from_file_location(MODULE_NAME, GAME_SCRIPT)
+    mod = importlib.util.module_from_spec(spec)
+    sys.modules[MODULE_NAME] = mod
+    try:
+        spec.loader.exec_module(mod)
+    except BaseException:
+        del sys.modules[MODULE_NAME]
+        raise
+    return mod
+
+def git_commit():
+    """Short hash of the checked-out commit, or None outside a git checkout."""
+    import subprocess
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=os.path.dirname(GAME_SCRIPT),
+                             capture_output=True, text=True, timeout=5)
+        return out.stdout.strip() or None
+    except Exception:
+        return None
@@ -0,0 +1,100 @@
+# leaderboard.py
+# Duel ratings from the history file the game appends to (duel_history.wdh, or --ratings).
+#
+#   python leaderboard.py                       # top 10 and the player count
+#   python leaderboard.py --player Ana -k 5     # the 5 rows around Ana
+#   python leaderboard.py --bench 1000000       # time a full recompute over a synthetic history
+#
+# The bench writes --players random names and --bench duels (2-4 seats, random results) to a
+# temporary history, rebuilds every rating from it and times rank / top-K / record on the result.
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+from game_module import load_game, git_commit
+
+game = load_game()
+
+def print_rows(rows):
+    print(f"{'#':>6}  {'player':<24}{'rating':>8}{'duels':>8}{'wins':>7}")
+    for place, name, rating, games, wins in rows:
+        print(f"{place:>6}  {name:<24}{rating:>8.0f}{games:>8}{wins:>7}")
+
+def write_history(path, duels, players, seed):
+    rng = random.Random(seed)
+    names = [f"player{i:06d}" for i in range(players)]
+    with open(path, "wb") as f:
+        f.write(game.HISTORY_MAGIC)
+        for _ in range(duels):
+            seats = rng.sample(names, rng.choice((2, 2, 2, 3, 4)))
+            f.write(game.pack_duel([(n, game.result_byte(a, a <= game.MAX_ATTEMPTS))
+                                    for n, a in ((n, rng.randint(1, game.MAX_ATTEMPTS + 1)) for n in seats)], when=0))
+
+def bench(args):
+    fd, path = tempfile.mkstemp(suffix=".wdh")
+    os.close(fd)
+    try:
+        t0 = time.perf_counter()
+        write_history(path, args.bench, args.players, args.seed)
+        write_s = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        board = game.Leaderboard.recompute(path)
+        recompute_s = time.perf_counter() - t0
+    finally:
+        os.remove(path)
+    board.path = None # Time the in-memory update only; the temp history is gone
+    rng = random.Random(args.seed)
+    names = rng.choices(list(board.ratings), k=10000)
+    t0 = time.perf_counter()
+    for n in names: board.rank(n)
+    rank_us = (time.perf_counter() - t0) / len(names) * 1e6
+    t0 = time.perf_counter()
+    for n in names[:1000]: board.top(args.k, start=board.rank(n) - 1)
+    top_us = (time.perf_counter() - t0) / 1000 * 1e6
+    t0 = time.perf_counter()
+    for _ in range(1000): board.record([(rng.choice(names), rng.randint(1, 7), True), (rng.choice(names), rng.randint(1, 7), True)])
+    record_us = (time.perf_counter() - t0) / 1000 * 1e6
+    print(f"{args.bench} duels, {len(board.ratings)} players: history written in {write_s:.2f}s, "
+          f"recomputed in {recompute_s:.2f}s")
+    print(f"rank {rank_us:.1f} us, top-{args.k} {top_us:.1f} us, record {record_us:.1f} us")
+    print_rows(board.top(args.k))
+    return {"commit": git_commit(), "duels": args.bench, "players": len(board.ratings), "recompute_s": round(recompute_s, 3),
+            "rank_us": round(rank_us, 2), "top_k_us": round(top_us, 2), "record_us": round(record_us, 2), "k": args.k}
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="WorDuel duel ratings.")
+    ap.add_argument("--ratings", default=game.RATINGS_FILE, help="duel history file")
+    ap.add_argument("--player", help="show the rows around this player")
+    ap.add_argument("-k", type=int, default=game.LEADERBOARD_SIZE, help="rows to show")
+    ap.add_argument("--bench", type=int, metavar="DUELS", help="time a recompute over this many synthetic duels")
+    ap.add_argument("--players", type=int, default=50000, help="players in the synthetic history")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--out", help="write the bench results as JSON here")
+    args = ap.parse_args(argv)
+
+    if args.bench:
+        report = bench(args)
+        if args.out:
+            with open(args.out, "w", encoding="utf-8") as f: json.dump(report, f, indent=2)
+        return 0
+    t0 = time.perf_counter()
+    try: board = game.Leaderboard.recompute(args.ratings)
+    except ValueError as e:
+        print(f"{args.ratings}: {e}")
+        return 1
+    if not board.ratings:
+        print(f"No duels in {args.ratings} yet.")
+        return 0
+    print(f"{len(board.ratings)} players rated from {args.ratings} in {time.perf_counter() - t0:.2f}s\n")
+    if args.player and board.rank(args.player) is None:
+        print(f"{args.player} has no rated duels.")
+        return 1
+    print_rows(board.around(args.player, args.k) if args.player else board.top(args.k))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
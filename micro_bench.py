@@ -0,0 +1,158 @@
+# micro_bench.py
+# Times the game's hot paths (scoring, dictionary lookup, link codec, avatar compositing)
+# and checks each one against a per-operation budget.
+#
+#   python micro_bench.py                       # run everything, write micro_bench.json
+#   python micro_bench.py -k check_guess        # only benchmarks whose name contains "check_guess"
+#   python micro_bench.py --no-budget           # just report, never fail
+#
+# Exits with status 1 if any benchmark is slower than its budget.
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import timeit
+
+from game_module import load_game, git_commit
+
+game = load_game()
+
+REPEATS = 5
+ONCE = "once"
+
+# Budgets in microseconds per call. Generous on purpose: they catch regressions, not noise.
+BUDGETS_US = {
+    "check_guess/unique": 15,
+    "check_guess/duplicates": 15,
+    "check_guess/all_green": 15,
+    "check_guess/len7": 20,
+    "valid_words/hit": 1,
+    "valid_words/miss": 1,
+    "shared_dict/hit": 20,
+    "shared_dict/miss": 20,
+    "startup/import": 1_500_000,
+    "load_valid_words/cold": 2_000_000,
+    "load_valid_words/warm": 1_500_000,
+    "link/encode_initial": 30,
+    "link/decode_initial": 60,
+    "link/encode_return": 30,
+    "link/decode_return": 60,
+    "assets/find_layer_files": 5_000,
+    "assets/load_and_prepare_image": 50_000,
+    "assets/compose_layers": 20_000,
+}
+
+def bench(fn, number=None):
+    """Returns (best seconds per call, calls per round) over REPEATS rounds."""
+    t = timeit.Timer(fn)
+    if number is None: number, _ = t.autorange()
+    best = min(t.repeat(repeat=REPEATS, number=number)) / number
+    return best, number
+
+def time_cold_import():
+    """Best-of-3 wall time for a fresh interpreter to import the game (imports + dictionary, no window)."""
+    here = os.path.dirname(os.path.abspath(__file__))
+    cmd = [sys.executable, "-c", "import game_module; game_module.load_game()"]
+    best = None
+    for _ in range(3):
+        t0 = time.perf_counter()
+        subprocess.run(cmd, cwd=here, check=True)
+        dt = time.perf_counter() - t0
+        best = dt if best is None else min(best, dt)
+    return best
+
+def time_cold_load():
+    """Best-of-3 dictionary load in a fresh interpreter, read off the startup profiler's marks
+    around it, so nothing this process already loaded is reused."""
+    here = os.path.dirname(os.path.abspath(__file__))
+    code = ("import game_module; marks = game_module.load_game().STARTUP.marks; "
+            "t = [t for label, t in marks if label.startswith(('imports', 'dictionary load'))]; print(t[1] - t[0])")
+    env = {**os.environ, "WORDUEL_PROFILE_STARTUP": "1"}
+    best = None
+    for _ in range(3):
+        out = subprocess.run([sys.executable, "-c", code], cwd=here, env=env, check=True, capture_output=True, text=True)
+        dt = float(out.stdout.split()[-1])
+        best = dt if best is None else min(best, dt)
+    return best
+
+def collect():
+    """Yields (name, fn, number) for every benchmark; number=None lets timeit pick.
+
+    number=ONCE means fn does its own one-shot timing and returns seconds.
+    """
+    check = game.WordleEngine.check_guess
+    yield "check_guess/unique", lambda: check("crane", "light"), None
+    # Duplicate letters in guess and secret exercise the yellow-count bookkeeping
+    yield "check_guess/duplicates", lambda: check("speed", "erase"), None
+    yield "check_guess/all_green", lambda: check("light", "light"), None
+    yield "check_guess/len7", lambda: check("balloon", "monster"), None
+
+    words = game.VALID_WORDS
+    yield "valid_words/hit", lambda: "light" in words, None
+    yield "valid_words/miss", lambda: "zzqxv" in words, None
+
+    # Binary search over the packed buffer other processes would map
+    shared = game.SharedDictionary(game.SharedDictionary.pack(words))
+    yield "shared_dict/hit", lambda: "light" in shared, None
+    yield "shared_dict/miss", lambda: "zzqxv" in shared, None
+
+    yield "startup/import", time_cold_import, ONCE
+
+    # Cold: the import-time load in a fresh process. Warm: this process loading it again
+    yield "load_valid_words/cold", time_cold_load, ONCE
+    yield "load_valid_words/warm", game.load_valid_words, 1
+
+    flow = game.DuelLinkFlow
+    init_link = flow.create_initial_link(5, "light")
+    ret_link = flow.create_return_link(5, "house", 4, True)
+    yield "link/encode_initial", lambda: flow.create_initial_link(5, "light"), None
+    yield "link/decode_initial", lambda: flow.decode_initial_link(init_link), None
+    yield "link/encode_return", lambda: flow.create_return_link(5, "house", 4, True), None
+    yield "link/decode_return", lambda: flow.decode_return_link(ret_link), None
+
+    yield "assets/find_layer_files", game.find_layer_files, None
+    if game.PIL_AVAILABLE:
+        bases, exprs, outfits = game.find_layer_files()
+        paths = [next(iter(d.values()), None) for d in (bases, outfits, exprs)]
+        path = next((p for p in paths if p), None)
+        if path:
+            yield "assets/load_and_prepare_image", lambda: game.load_and_prepare_image(path), None
+            layers = [game.load_and_prepare_image(p) for p in paths]
+            yield "assets/compose_layers", lambda: game.compose_layers(*layers), None
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Micro-benchmarks for WorDuel hot paths.")
+    ap.add_argument("-k", dest="pattern", help="only run benchmarks whose name contains this")
+    ap.add_argument("--out", default="micro_bench.json", help="where to write the JSON results")
+    ap.add_argument("--no-budget", action="store_true", help="report only, don't fail on budget")
+    args = ap.parse_args(argv)
+
+    results, over = {}, []
+    for name, fn, number in collect():
+        if args.pattern and args.pattern not in name: continue
+        if number == ONCE: per_call, number = fn(), 1
+        else: per_call, number = bench(fn, number)
+        us = per_call * 1e6
+        budget = BUDGETS_US.get(name)
+        ok = budget is None or us <= budget
+        results[name] = {"us_per_call": round(us, 3), "calls_per_round": number, "budget_us": budget, "ok": ok}
+        if not ok: over.append(name)
+        flag = "" if ok else "  OVER BUDGET"
+        print(f"{name:<32} {us:>14.3f} us   (budget {budget} us){flag}")
+
+    report = {"commit": git_commit(), "python": platform.python_version(),
+              "pil": game.PIL_AVAILABLE, "results": results}
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"Wrote {args.out}")
+
+    if over and not args.no_budget:
+        print("Over budget: " + ", ".join(over))
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,152 @@
+# optimize_assets.py
+# Build step: writes a copy of every avatar layer at each size the game loads layers at
+# (LAYER_SIZES: the avatar, the result card, the duel panels) into assets/<size>/, which the
+# game prefers over the originals next to the script.
+#
+#   python optimize_assets.py               # write assets/<size>/*.png and optimize_report.json
+#   python optimize_assets.py --size 160    # only the main avatar size
+#   python optimize_assets.py --dry-run     # report the savings without writing anything
+#
+# Each layer is downsampled exactly as load_and_prepare_image does for that size (RGBA,
+# NEAREST), so the game draws the same pixels and simply skips the resize. Layers with at
+# most 256 distinct colors are stored as palette PNGs when that round-trips exactly, and all
+# metadata chunks are dropped.
+import argparse
+import io
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from game_module import load_game, git_commit
+
+game = load_game()
+
+LAYER_PREFIXES = ("base_", "expr_", "outfit_")
+
+def best_of(fn, runs=5):
+    best = None
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        fn()
+        dt = time.perf_counter() - t0
+        best = dt if best is None else min(best, dt)
+    return round(best * 1000, 3)
+
+def to_palette(im):
+    """Exact palette ("P" + tRNS) copy of an RGBA image, or None if it has more than 256 colors."""
+    from PIL import Image
+    colors = im.getcolors(256)
+    if colors is None: return None
+    rgba = [c for _, c in colors]
+    index = {c: i for i, c in enumerate(rgba)}
+    p = Image.new("P", im.size)
+    raw = im.tobytes()
+    p.putdata([index[px] for px in zip(*[iter(raw)] * 4)])
+    p.putpalette([v for c in rgba for v in c[:3]])
+    p.info["transparency"] = bytes(c[3] for c in rgba)
+    return p
+
+def encode(im):
+    buf = io.BytesIO()
+    im.save(buf, format="PNG", optimize=True) # No pnginfo / icc / dpi: metadata is stripped
+    return buf.getvalue()
+
+def source_layers(out_dir):
+    """The original layer PNGs in the working directory. find_layer_files() is no use here: it
+    prefers assets/, so after the first build it would only ever hand back our own output."""
+    src = os.getcwd()
+    if os.path.abspath(src) == out_dir: return []
+    return sorted(os.path.join(src, fn) for fn in os.listdir(src)
+                  if fn.lower().endswith(".png") and fn.lower().startswith(LAYER_PREFIXES))
+
+def optimize(job):
+    """Shrinks one layer; returns (report row, optimized PNG bytes or None). Runs in a worker process."""
+    from PIL import Image
+    path, size = job
+    row = {"file": os.path.basename(path), "size": size, "source": path, "bytes_before": os.path.getsize(path)}
+    try:
+        with Image.open(path) as src: row["size_before"] = list(src.size)
+        target = game.load_and_prepare_image(path, target_size=size)
+        if target is None: raise ValueError("cannot decode")
+        data, row["format"] = encode(target), "RGBA"
+        pal = to_palette(target)
+        if pal is not None and pal.convert("RGBA").tobytes() == target.tobytes():
+            pal_data = encode(pal)
+            if len(pal_data) < len(data): data, row["format"] = pal_data, "P"
+        # Guard: the optimized file must give the game exactly the pixels it had before
+        check = Image.open(io.BytesIO(data)).convert("RGBA")
+        if check.tobytes() != target.tobytes(): raise ValueError("optimized copy does not match")
+    except Exception as e:
+        row["error"] = f"{type(e).__name__}: {e}"
+        return row, None
+    row["size_after"] = [size, size]
+    row["bytes_after"] = len(data)
+    row["load_ms_before"] = best_of(lambda: game.load_and_prepare_image(path, target_size=size))
+    def load_optimized():
+        im = Image.open(io.BytesIO(data)).convert("RGBA")
+        if im.width != size or im.height != size: im = im.resize((size, size), resample=Image.NEAREST)
+    row["load_ms_after"] = best_of(load_optimized)
+    return row, data
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Write display-sized, metadata-free copies of the avatar layers.")
+    ap.add_argument("--out-dir", default=game.ASSETS_DIR, help="where the optimized layers go (one folder per size)")
+    ap.add_argument("--size", type=int, action="append",
+                    help="target edge in pixels (repeatable, default: every size in LAYER_SIZES)")
+    ap.add_argument("-w", "--workers", type=int, default=os.cpu_count() or 1)
+    ap.add_argument("--report", default="optimize_report.json")
+    ap.add_argument("--dry-run", action="store_true", help="measure only, write no images")
+    args = ap.parse_args(argv)
+
+    if not game.PIL_AVAILABLE:
+        print("PIL is required: pip install pillow")
+        return 1
+    out_dir = os.path.abspath(args.out_dir)
+    sizes = sorted(set(args.size or game.LAYER_SIZES), reverse=True)
+    # Never re-optimize our own output: always start from the originals
+    paths = source_layers(out_dir)
+    if not paths:
+        print("No source layers found.")
+        return 1
+
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        results = list(pool.map(optimize, [(p, size) for size in sizes for p in paths]))
+
+    if not args.dry_run:
+        for size in sizes: os.makedirs(os.path.join(out_dir, str(size)), exist_ok=True)
+    rows, failed = [], 0
+    print(f"{'file':<28}{'KB before':>10}{'KB after':>10}{'load ms':>10}{'->':>4}{'ms':>7}  fmt")
+    for row, data in results:
+        rows.append(row)
+        name = f"{row['size']}/{row['file']}"
+        if data is None:
+            failed += 1
+            print(f"{name:<28}  FAILED: {row['error']}")
+            continue
+        if not args.dry_run:
+            dest = os.path.join(out_dir, str(row["size"]), row["file"])
+            tmp = dest + ".tmp"
+            with open(tmp, "wb") as f: f.write(data)
+            os.replace(tmp, dest)
+        print(f"{name:<28}{row['bytes_before'] / 1024:>10.1f}{row['bytes_after'] / 1024:>10.1f}"
+              f"{row['load_ms_before']:>10.2f}{'':>4}{row['load_ms_after']:>7.2f}  {row['format']}")
+
+    ok = [r for r in rows if "error" not in r]
+    before = sum({r["source"]: r["bytes_before"] for r in ok}.values()) # Each original once, however many sizes
+    after = sum(r["bytes_after"] for r in ok)
+    ms_before, ms_after = sum(r["load_ms_before"] for r in ok), sum(r["load_ms_after"] for r in ok)
+    print(f"\n{len(ok)} layer copies: {before / 1024:.0f} KB -> {after / 1024:.0f} KB "
+          f"(saved {(before - after) / 1024:.0f} KB), load {ms_before:.1f} ms -> {ms_after:.1f} ms")
+    if not args.dry_run: print(f"Wrote {len(ok)} layer copies to {out_dir} (sizes {', '.join(map(str, sizes))})")
+
+    report = {"commit": git_commit(), "sizes": sizes, "dry_run": args.dry_run, "out_dir": out_dir,
+              "bytes_before": before, "bytes_after": after, "bytes_saved": before - after,
+              "load_ms_before": round(ms_before, 3), "load_ms_after": round(ms_after, 3), "layers": rows}
+    with open(args.report, "w", encoding="utf-8") as f: json.dump(report, f, indent=2)
+    print(f"Wrote {args.report}")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,76 @@
+# replay.py
+# Checks or watches games recorded with `python worduel.py --record DIR`.
+#
+#   python replay.py recordings/*.wdr              # headless: re-score every game through the engine
+#   python replay.py --repeat 1000 recordings/*    # same, many times over (CI stress / throughput)
+#   python replay.py --ui some_game.wdr --speed 2  # watch it in the real game window
+#
+# Exits with status 1 if any recorded result no longer matches the engine.
+import argparse
+import glob
+import os
+import sys
+import time
+
+from game_module import load_game
+
+game = load_game()
+
+def expand(paths):
+    out = []
+    for p in paths:
+        if os.path.isdir(p): out += sorted(glob.glob(os.path.join(p, "*.wdr")))
+        else: out += sorted(glob.glob(p)) or [p]
+    return out
+
+def check(paths, repeat):
+    blobs = []
+    for p in paths:
+        with open(p, "rb") as f: blobs.append((p, f.read()))
+    bad = 0
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        for p, data in blobs:
+            res = game.replay_headless(game.decode_replay(data))
+            if res["mismatches"] and repeat == 1:
+                bad += 1
+                for m in res["mismatches"]: print(f"{p}: player {m['player']} recorded {m['recorded']}, engine {m['engine']}")
+            elif res["mismatches"]: bad += 1
+    wall = time.perf_counter() - t0
+    games = len(blobs) * repeat
+    print(f"{games} replays in {wall:.3f}s ({games / wall if wall else 0:,.0f} replays/s), {bad} with mismatches")
+    return 1 if bad else 0
+
+def watch(path, speed):
+    import tkinter as tk
+    with open(path, "rb") as f: replay = game.decode_replay(f.read())
+    root = tk.Tk()
+    root.withdraw()
+    # Closing the viewer (or "Continue" on a single game's result) ends the loop; root goes with it
+    viewer = game.ReplayViewer(root, replay, speed=speed, on_close=root.quit)
+    viewer.win.protocol("WM_DELETE_WINDOW", root.quit)
+    root.mainloop()
+    root.destroy()
+    return 0
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Replay recorded WorDuel games and duels.")
+    ap.add_argument("paths", nargs="+", help="replay files or directories of *.wdr files")
+    ap.add_argument("--repeat", type=int, default=1, help="replay everything this many times (headless)")
+    ap.add_argument("--ui", action="store_true", help="play the first replay in the game window")
+    ap.add_argument("--speed", type=float, default=1.0, help="playback speed for --ui")
+    args = ap.parse_args(argv)
+
+    paths = expand(args.paths)
+    if not paths:
+        print("No replays found.")
+        return 1
+    try:
+        if args.ui: return watch(paths[0], args.speed)
+        return check(paths, max(1, args.repeat))
+    except ValueError as e:
+        print(f"Bad replay: {e}")
+        return 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,53 @@
+# shared_dict.py
+# Publishes the dictionary once so several game / bot processes on one host can share it.
+#
+#   python shared_dict.py file words.wdsd      # write an mmap-able file, then run the game with
+#                                              #   WORDUEL_SHARED_DICT=words.wdsd (or --shared-dict words.wdsd)
+#   python shared_dict.py serve                # publish into shared memory and keep it alive until Ctrl+C;
+#                                              #   start games with WORDUEL_SHARED_DICT=<printed name>
+#
+# Each process then maps the same packed, sorted word arrays read-only instead of building
+# its own ~370k-entry set.
+import argparse
+import os
+import signal
+import sys
+
+from game_module import load_game
+
+game = load_game()
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Publish the WorDuel dictionary for other processes.")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    f = sub.add_parser("file", help="write the packed dictionary to a file")
+    f.add_argument("path")
+    s = sub.add_parser("serve", help="publish into shared memory until interrupted")
+    s.add_argument("--name", help="shared memory name (default: generated)")
+    args = ap.parse_args(argv)
+
+    words = game.load_valid_words() if isinstance(game.VALID_WORDS, game.SharedDictionary) else game.VALID_WORDS
+    if not words:
+        print("No dictionary loaded; nothing to publish.")
+        return 1
+
+    if args.cmd == "file":
+        game.SharedDictionary.write_file(words, args.path)
+        print(f"Wrote {len(words)} words to {args.path} ({os.path.getsize(args.path):,} bytes)")
+        return 0
+
+    shared = game.SharedDictionary.publish(words, name=args.name)
+    print(f"Published {len(shared)} words as {shared.name!r}. Ctrl+C to stop.")
+    print(f"  WORDUEL_SHARED_DICT={shared.name}")
+    try:
+        signal.signal(signal.SIGTERM, lambda *a: sys.exit(0))
+        signal.pause() if hasattr(signal, "pause") else input()
+    except (KeyboardInterrupt, SystemExit, EOFError):
+        pass
+    finally:
+        shared.close()
+        shared.unlink()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
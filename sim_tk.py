@@ -0,0 +1,371 @@
+# sim_tk.py
+# In-process stand-in for the parts of tkinter the game uses, for headless UI runs
+# (ui_sim.py --tk mock) on machines without a display or Xvfb.
+#
+# Widgets keep their options, children and bindings in plain Python objects. after() callbacks
+# go into a queue on a virtual clock that only moves when advance() is called, so scripted
+# sessions run as fast as the handlers do. Nothing is drawn.
+#
+#   import sim_tk; sim_tk.install()   # before the game is imported
+import heapq
+import itertools
+import sys
+import traceback
+import types
+
+END = "end"
+INSERT = "insert"
+
+class TclError(Exception):
+    pass
+
+# ---------------------------------------------------------
+# VIRTUAL CLOCK
+# ---------------------------------------------------------
+class Clock:
+    """after() queue ordered by virtual due time (ms); callbacks only run inside advance()."""
+    def __init__(self):
+        self.now = 0
+        self._queue = [] # (due, seq, after id)
+        self._jobs = {}  # after id -> (widget, fn, args)
+        self._seq = itertools.count()
+
+    def schedule(self, widget, ms, fn, args):
+        seq = next(self._seq)
+        job = f"after#{seq}"
+        self._jobs[job] = (widget, fn, args)
+        heapq.heappush(self._queue, (self.now + max(0, int(ms)), seq, job))
+        return job
+
+    def cancel(self, job):
+        self._jobs.pop(job, None)
+
+    def pending(self):
+        return len(self._jobs)
+
+    def advance(self, ms=0):
+        """Runs every callback due within the next ms (in due order), then moves the clock on."""
+        target = self.now + ms
+        ran = 0
+        while self._queue and self._queue[0][0] <= target:
+            due, _, job = heapq.heappop(self._queue)
+            entry = self._jobs.pop(job, None)
+            if entry is None: continue
+            self.now = max(self.now, due)
+            widget, fn, args = entry
+            ran += 1
+            _call(widget, fn, *args)
+        self.now = target
+        return ran
+
+CLOCK = Clock()
+
+def _call(widget, fn, *args):
+    # Like Tk: an exception in a callback goes to the root's report_callback_exception
+    try: return fn(*args)
+    except Exception:
+        root = widget._root() if widget is not None else None
+        if root is None: raise
+        root.report_callback_exception(*sys.exc_info())
+
+# ---------------------------------------------------------
+# VARIABLES
+# ---------------------------------------------------------
+class Variable:
+    _default = ""
+    def __init__(self, master=None, value=None, name=None):
+        self._value = self._default if value is None else value
+    def get(self): return self._value
+    def set(self, value): self._value = value
+
+class StringVar(Variable):
+    def get(self): return str(self._value)
+
+class IntVar(Variable):
+    _default = 0
+    def get(self):
+        try: return int(self._value)
+        except (TypeError, ValueError): raise TclError(f'expected integer but got "{self._value}"')
+
+class BooleanVar(Variable):
+    _default = False
+    def get(self): return bool(self._value)
+
+class Event:
+    def __init__(self, widget, **kw):
+        self.widget = widget
+        self.__dict__.update(kw)
+
+# ---------------------------------------------------------
+# WIDGETS
+# ---------------------------------------------------------
+class Misc:
+    _default_root = None
+
+    def __init__(self, master=None, cnf=None, **kw):
+        if master is None: master = Misc._default_root
+        self.master = master
+        self.children = {}
+        self.options = {}
+        self.bindings = {}
+        self.manager = None
+        self._destroyed = False
+        self._name = f"!{type(self).__name__.lower()}{next(_names)}"
+        if master is not None: master.children[self._name] = self
+        self.configure(**(cnf or {}), **kw)
+
+    # Options
+    def configure(self, cnf=None, **kw):
+        self._check()
+        self.options.update(cnf or {}, **kw)
+    config = configure
+    def cget(self, key): return self.options.get(key, "")
+    __getitem__ = cget
+    def __setitem__(self, key, value): self.configure(**{key: value})
+    def keys(self): return list(self.options)
+
+    # Tree
+    def _root(self):
+        w = self
+        while w.master is not None: w = w.master
+        return w
+    def winfo_toplevel(self):
+        w = self
+        while not isinstance(w, Wm): w = w.master
+        return w
+    def winfo_children(self): return list(self.children.values())
+    def winfo_exists(self): return 0 if self._destroyed else 1
+    def winfo_ismapped(self): return 0 if self._destroyed or self.manager is None else 1
+    def winfo_manager(self): return self.manager or ""
+    def _check(self):
+        if self._destroyed: raise TclError(f'invalid command name "{self._name}"')
+
+    def destroy(self):
+        for child in list(self.children.values()): child.destroy()
+        if self._destroyed: return
+        self._destroyed = True
+        if self.master is not None: self.master.children.pop(self._name, None)
+
+    # Geometry (only "is it shown" is tracked)
+    def pack(self, **kw): self._check(); self.manager = "pack"
+    pack_configure = pack
+    def pack_forget(self): self.manager = None
+    def grid(self, **kw): self._check(); self.manager = "grid"
+    grid_configure = grid
+    def grid_remove(self): self.manager = None
+    grid_forget = grid_remove
+    def place(self, **kw): self._check(); self.manager = "place"
+    def place_forget(self): self.manager = None
+    def grid_columnconfigure(self, *a, **kw): pass
+    grid_rowconfigure = grid_columnconfigure
+    columnconfigure = grid_columnconfigure
+    rowconfigure = grid_rowconfigure
+
+    # Events
+    def bind(self, sequence, func=None, add=None):
+        self.bindings.setdefault(sequence, [])
+        if not add: self.bindings[sequence].clear()
+        self.bindings[sequence].append(func)
+    def bind_all(self, sequence, func=None, add=None): self._root().bind(sequence, func, add)
+    def unbind(self, sequence, funcid=None): self.bindings.pop(sequence, None)
+    def event_generate(self, sequence, **kw):
+        """Fires this widget's handlers for sequence, then the application-wide (bind_all) ones."""
+        self._check()
+        event = Event(self, **kw)
+        root = self._root()
+        for w in (self, root) if root is not self else (self,):
+            for fn in list(w.bindings.get(sequence, ())):
+                if _call(self, fn, event) == "break": return
+    def focus_set(self): self._root()._focus = self
+    focus_force = focus_set
+    def focus_get(self): return self._root()._focus
+
+    # Event loop
+    def after(self, ms, func=None, *args):
+        if func is None: return None
+        return CLOCK.schedule(self, ms, func, args)
+    def after_idle(self, func, *args): return CLOCK.schedule(self, 0, func, args)
+    def after_cancel(self, job): CLOCK.cancel(job)
+    def update(self): CLOCK.advance(0)
+    def update_idletasks(self): pass
+
+    # Clipboard (one per application)
+    def clipboard_get(self, **kw):
+        text = self._root()._clipboard
+        if text is None: raise TclError("CLIPBOARD selection doesn't exist or form \"STRING\" not defined")
+        return text
+    def clipboard_clear(self, **kw): self._root()._clipboard = None
+    def clipboard_append(self, string, **kw): self._root()._clipboard = (self._root()._clipboard or "") + string
+
+_names = itertools.count(1)
+
+class Wm:
+    """Window-manager calls, recorded but otherwise ignored."""
+    def title(self, text=None):
+        if text is None: return self.options.get("_title", "")
+        self.options["_title"] = text
+    def geometry(self, spec=None): return spec
+    def minsize(self, *a): pass
+    def maxsize(self, *a): pass
+    def resizable(self, *a): pass
+    def protocol(self, name, func=None): self.bindings[name] = [func]
+    def attributes(self, *a): pass
+    def state(self, value=None):
+        if value is None: return self.options.get("_state", "normal")
+        if value not in ("normal", "iconic", "withdrawn", "zoomed"): raise TclError(f'bad argument "{value}"')
+        self.options["_state"] = value
+    def withdraw(self): self.options["_state"] = "withdrawn"
+    def deiconify(self): self.options["_state"] = "normal"
+    def iconify(self): self.options["_state"] = "iconic"
+    def lift(self, *a): pass
+    tkraise = lift
+    def transient(self, *a): pass
+    def close(self):
+        """What the window manager's close button does."""
+        handlers = self.bindings.get("WM_DELETE_WINDOW")
+        if handlers: _call(self, handlers[0])
+        else: self.destroy()
+
+class Tk(Misc, Wm):
+    def __init__(self, *a, **kw):
+        super().__init__(None)
+        self._focus = None
+        self._clipboard = None
+        Misc._default_root = self
+    def report_callback_exception(self, exc, val, tb):
+        traceback.print_exception(exc, val, tb)
+    def mainloop(self, n=0): pass
+    def quit(self): pass
+    def destroy(self):
+        super().destroy()
+        if Misc._default_root is self: Misc._default_root = None
+
+class Toplevel(Misc, Wm):
+    pass
+
+class Frame(Misc): pass
+class Label(Misc): pass
+class Scrollbar(Misc): pass
+
+class Button(Misc):
+    def invoke(self):
+        """Presses the button the way a click does: nothing happens while it is disabled."""
+        self._check()
+        if self.cget("state") == "disabled": return None
+        cmd = self.cget("command")
+        return _call(self, cmd) if cmd else None
+
+class Checkbutton(Button):
+    def invoke(self):
+        self._check()
+        if self.cget("state") == "disabled": return None
+        var = self.cget("variable")
+        if var: var.set(not var.get())
+        cmd = self.cget("command")
+        return _call(self, cmd) if cmd else None
+
+class Entry(Misc):
+    """Text lives in the textvariable when there is one, so both views stay in sync."""
+    def __init__(self, master=None, cnf=None, **kw):
+        self._text = ""
+        super().__init__(master, cnf, **kw)
+    def _var(self): return self.options.get("textvariable") or None
+    def get(self):
+        var = self._var()
+        return str(var._value) if var is not None else self._text # Raw text, like the Tcl variable
+    def _set(self, text):
+        var = self._var()
+        if var is not None: var.set(text)
+        else: self._text = text
+    def _index(self, i, text):
+        if i == END: return len(text)
+        return max(0, min(int(i), len(text)))
+    def insert(self, index, string):
+        self._check()
+        if self.cget("state") in ("disabled", "readonly"): return
+        text = self.get()
+        i = self._index(index, text)
+        self._set(text[:i] + string + text[i:])
+    def delete(self, first, last=None):
+        self._check()
+        if self.cget("state") in ("disabled", "readonly"): return
+        text = self.get()
+        a = self._index(first, text)
+        b = a + 1 if last is None else self._index(last, text)
+        self._set(text[:a] + text[b:])
+    def icursor(self, index): pass
+    def selection_range(self, *a): pass
+
+class Spinbox(Entry):
+    def __init__(self, master=None, cnf=None, **kw):
+        super().__init__(master, cnf, **kw)
+        if self._var() is None: self._text = str(self.options.get("from_", ""))
+
+class OptionMenu(Button):
+    def __init__(self, master, variable, value, *values, **kw):
+        super().__init__(master, **kw)
+        self.variable, self.values = variable, (value, *values)
+    def choose(self, value):
+        if value not in self.values: raise TclError(f'bad value "{value}"')
+        self.variable.set(value)
+
+class Canvas(Misc):
+    def __init__(self, master=None, cnf=None, **kw):
+        self.items = {}
+        self._ids = itertools.count(1)
+        super().__init__(master, cnf, **kw)
+    def _create(self, kind, coords, kw):
+        self._check()
+        i = next(self._ids)
+        self.items[i] = dict(kw, kind=kind, coords=coords)
+        return i
+    def create_image(self, *coords, **kw): return self._create("image", coords, kw)
+    def create_oval(self, *coords, **kw): return self._create("oval", coords, kw)
+    def create_arc(self, *coords, **kw): return self._create("arc", coords, kw)
+    def create_rectangle(self, *coords, **kw): return self._create("rectangle", coords, kw)
+    def create_line(self, *coords, **kw): return self._create("line", coords, kw)
+    def create_text(self, *coords, **kw): return self._create("text", coords, kw)
+    def itemconfigure(self, item, **kw):
+        self._check()
+        if item not in self.items: raise TclError(f'item "{item}" doesn\'t exist')
+        self.items[item].update(kw)
+    itemconfig = itemconfigure
+    def find_withtag(self, tag):
+        return tuple(i for i, it in self.items.items()
+                     if tag in (i, "all") or tag in ((it.get("tags"),) if isinstance(it.get("tags"), str) else it.get("tags") or ()))
+    def delete(self, *items):
+        if "all" in items: self.items.clear()
+        for i in items: self.items.pop(i, None)
+
+class PhotoImage:
+    """Stand-in for ImageTk.PhotoImage / tkinter.PhotoImage: remembers the size only."""
+    def __init__(self, image=None, size=None, **kw):
+        self.size = getattr(image, "size", size) or (kw.get("width", 0), kw.get("height", 0))
+    def width(self): return self.size[0]
+    def height(self): return self.size[1]
+
+# ---------------------------------------------------------
+# MESSAGE BOXES
+# ---------------------------------------------------------
+DIALOGS = [] # (kind, title, message), oldest first
+
+def _dialog(kind, answer=None):
+    def show(title=None, message=None, **kw):
+        DIALOGS.append((kind, title, message))
+        return answer
+    return show
+
+messagebox = types.ModuleType("tkinter.messagebox")
+messagebox.showinfo = _dialog("info", "ok")
+messagebox.showwarning = _dialog("warning", "ok")
+messagebox.showerror = _dialog("error", "ok")
+messagebox.askyesno = _dialog("yesno", True)
+messagebox.askokcancel = _dialog("okcancel", True)
+
+def install():
+    """Makes `import tkinter` (and tkinter.messagebox) resolve to this module. Call before importing the game."""
+    mod = sys.modules[__name__]
+    mod.messagebox = messagebox
+    sys.modules["tkinter"] = mod
+    sys.modules["tkinter.messagebox"] = messagebox
+    return mod
@@ -0,0 +1,123 @@
+# solver_bench.py
+# Plays a solver strategy against every answer in WORDS_BY_LENGTH and reports how it did.
+#
+#   python solver_bench.py                          # every strategy, every length
+#   python solver_bench.py -s entropy -l 5 -c 100   # one strategy / length, weigh 100 candidates
+#   python solver_bench.py --out new.json --compare old.json
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from game_module import load_game, git_commit
+
+game = load_game()
+
+# Solvers keep guessing past MAX_ATTEMPTS so the mean still means something; this caps runaway games.
+GUESS_CAP = 20
+
+_candidates_by_length = {}
+
+def _base_candidates(length):
+    # Per worker process: filter the dictionary once per length, not once per game
+    if length not in _candidates_by_length:
+        _candidates_by_length[length] = game.WordSolver(length).candidates
+    return _candidates_by_length[length]
+
+def play_game(job):
+    """Plays one game; returns (length, secret, guesses). guesses is None if the cap was hit."""
+    strategy, length, secret, max_candidates, seed = job
+    solver = game.WordSolver(length, words=_base_candidates(length), rng=random.Random(seed))
+    for n in range(1, GUESS_CAP + 1):
+        guess = solver.best_guess(max_candidates, strategy=strategy)
+        if guess is None: return length, secret, None
+        if guess == secret: return length, secret, n
+        solver.observe(guess, game.WordleEngine.check_guess(guess, secret))
+    return length, secret, None
+
+def summarize(guesses, wall=None):
+    solved = [g for g in guesses if g is not None]
+    dist = {}
+    for g in guesses:
+        key = str(g) if g is not None and g <= game.MAX_ATTEMPTS else "fail"
+        dist[key] = dist.get(key, 0) + 1
+    out = {
+        "games": len(guesses),
+        "mean_guesses": round(sum(solved) / len(solved), 4) if solved else None,
+        "distribution": dict(sorted(dist.items(), key=lambda kv: (kv[0] == "fail", kv[0]))),
+        "failures": dist.get("fail", 0),
+    }
+    if wall is not None:
+        out["wall_s"] = round(wall, 4)
+        out["games_per_s"] = round(len(guesses) / wall, 2) if wall else None
+    return out
+
+def run(strategies, lengths, max_candidates, workers, seed):
+    results = {}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for strategy in strategies:
+            jobs = [(strategy, L, secret, max_candidates, seed + i)
+                    for L in lengths for i, secret in enumerate(game.WORDS_BY_LENGTH[L])
+                    if not game.VALID_WORDS or secret in game.VALID_WORDS]
+            t0 = time.perf_counter()
+            per_length = {L: [] for L in lengths}
+            for L, secret, n in pool.map(play_game, jobs, chunksize=4):
+                per_length[L].append(n)
+            wall = time.perf_counter() - t0
+            results[strategy] = {
+                "overall": summarize([n for L in lengths for n in per_length[L]], wall),
+                "by_length": {str(L): summarize(per_length[L]) for L in lengths},
+            }
+            o = results[strategy]["overall"]
+            print(f"{strategy:>9}: mean={o['mean_guesses']} fail={o['failures']}/{o['games']} "
+                  f"wall={o['wall_s']:.2f}s ({o['games_per_s']} games/s)")
+    return results
+
+def compare(current, baseline_path):
+    with open(baseline_path, "r", encoding="utf-8") as f:
+        base = json.load(f)
+    print(f"\nvs {baseline_path} (commit {base.get('commit')}):")
+    for strategy, res in current["results"].items():
+        old = base.get("results", {}).get(strategy)
+        if not old:
+            print(f"  {strategy}: not in baseline")
+            continue
+        o, b = res["overall"], old["overall"]
+        dm = (o["mean_guesses"] or 0) - (b["mean_guesses"] or 0)
+        dt = (o["games_per_s"] or 0) / (b["games_per_s"] or 1)
+        print(f"  {strategy}: mean {dm:+.3f} guesses, failures {o['failures'] - b['failures']:+d}, throughput x{dt:.2f}")
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Benchmark WorDuel solver strategies over every answer word.")
+    ap.add_argument("-s", "--strategy", action="append", choices=game.SOLVER_STRATEGIES,
+                    help="strategy to run (repeatable, default: all)")
+    ap.add_argument("-l", "--length", action="append", type=int, choices=sorted(game.WORDS_BY_LENGTH),
+                    help="word length to run (repeatable, default: all)")
+    ap.add_argument("-c", "--candidates", type=int, default=40, help="candidates weighed per guess")
+    ap.add_argument("-w", "--workers", type=int, default=os.cpu_count(), help="worker processes")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--out", default="solver_bench.json", help="where to write the JSON results")
+    ap.add_argument("--compare", metavar="JSON", help="earlier results file to diff against")
+    args = ap.parse_args(argv)
+
+    strategies = args.strategy or list(game.SOLVER_STRATEGIES)
+    lengths = sorted(set(args.length or game.WORDS_BY_LENGTH))
+    report = {
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "settings": {"candidates": args.candidates, "seed": args.seed, "workers": args.workers,
+                     "max_attempts": game.MAX_ATTEMPTS, "guess_cap": GUESS_CAP},
+        "results": run(strategies, lengths, args.candidates, args.workers, args.seed),
+    }
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"Wrote {args.out}")
+    if args.compare: compare(report, args.compare)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
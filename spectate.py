@@ -0,0 +1,108 @@
+# spectate.py
+# Watches local duels broadcast by a game started with --broadcast PORT.
+#
+#   python worduel.py --broadcast 8765            # the game hosting the duel
+#   python spectate.py 8765                       # read-only boards in a window
+#   python spectate.py 8765 --text                # print the event stream
+#   python spectate.py 8765 --load 300 --seconds 60 --slow 20
+#                                                 # 300 headless spectators, 20 of which never read
+import argparse
+import json
+import selectors
+import socket
+import sys
+import time
+
+from game_module import load_game
+
+game = load_game()
+
+def watch(port, host):
+    import tkinter as tk
+    root = tk.Tk()
+    root.withdraw()
+    try: view = game.SpectatorWindow(root, port, host)
+    except OSError as e:
+        print(f"Can't connect to {host}:{port}: {e}")
+        return 1
+    view.win.protocol("WM_DELETE_WINDOW", root.destroy)
+    root.mainloop()
+    return 0
+
+def text(port, host):
+    try: sock = socket.create_connection((host, port), timeout=5)
+    except OSError as e:
+        print(f"Can't connect to {host}:{port}: {e}")
+        return 1
+    sock.settimeout(None)
+    for line in sock.makefile("rb"):
+        ev = json.loads(line)
+        if ev["type"] == "snapshot":
+            duel = ev["duel"]
+            print("snapshot: " + ("no duel yet" if duel is None else
+                  f"{', '.join(duel['names'])}, {duel['length']} letters, {sum(map(len, duel['boards']))} guesses so far"))
+        else:
+            print(json.dumps(ev))
+    print("Broadcast ended.")
+    return 0
+
+def load(port, host, clients, seconds, slow):
+    """Opens many spectators at once and reports what each received (the fan-out check)."""
+    sel = selectors.DefaultSelector()
+    stats = {}
+    for i in range(clients):
+        sock = socket.create_connection((host, port))
+        sock.setblocking(False)
+        # Slow spectators connect but never read: the server should coalesce, then drop them
+        stats[sock] = {"slow": i < slow, "messages": 0, "snapshots": 0, "closed": False, "buf": b""}
+        if i >= slow: sel.register(sock, selectors.EVENT_READ)
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        for key, _ in sel.select(timeout=0.5):
+            s = stats[key.fileobj]
+            try: data = key.fileobj.recv(65536)
+            except BlockingIOError: continue
+            except OSError: data = b""
+            if not data:
+                s["closed"] = True
+                sel.unregister(key.fileobj)
+                continue
+            *lines, s["buf"] = (s["buf"] + data).split(b"\n")
+            for line in lines:
+                s["messages"] += 1
+                s["snapshots"] += b'"type":"snapshot"' in line
+    for sock, s in stats.items():
+        if s["slow"]:
+            # A dropped slow spectator sees the connection closed once it finally reads
+            try:
+                sock.setblocking(True)
+                sock.settimeout(0.2)
+                while sock.recv(1 << 20): pass
+                s["closed"] = True
+            except socket.timeout: pass
+            except OSError: s["closed"] = True
+        sock.close()
+    for slow_group in (False, True):
+        group = [s for s in stats.values() if s["slow"] == slow_group]
+        if not group: continue
+        msgs = [s["messages"] for s in group]
+        print(f"{'slow' if slow_group else 'reading'} spectators: {len(group)}, messages min/max {min(msgs)}/{max(msgs)}, "
+              f"extra snapshots {sum(max(0, s['snapshots'] - 1) for s in group)}, disconnected {sum(s['closed'] for s in group)}")
+    return 0
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Spectate WorDuel local duels broadcast with --broadcast PORT.")
+    ap.add_argument("port", type=int)
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--text", action="store_true", help="print events instead of opening a window")
+    ap.add_argument("--load", type=int, metavar="N", help="connect N headless spectators and report what they got")
+    ap.add_argument("--seconds", type=float, default=30, help="how long --load listens")
+    ap.add_argument("--slow", type=int, default=0, help="with --load: this many spectators never read")
+    args = ap.parse_args(argv)
+
+    if args.load: return load(args.port, args.host, args.load, args.seconds, args.slow)
+    if args.text: return text(args.port, args.host)
+    return watch(args.port, args.host)
+
+if __name__ == "__main__":
+    sys.exit(main())
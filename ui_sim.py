@@ -0,0 +1,513 @@
+# ui_sim.py
+# Drives MainApp end to end from scripts: character creation, single player, local duel and
+# both legs of a link duel. Buttons are pressed with invoke() and keys with event_generate(),
+# like a player would; every step is timed, and so are the UI hot paths it runs through
+# (_apply_turn_state, submit_guess, view switches, avatar frames).
+#
+#   python ui_sim.py                              # 200 sessions, mocked Tk unless there is a display
+#   xvfb-run -a python ui_sim.py --tk real        # the real Tk under a virtual X server
+#   python ui_sim.py -n 500 -s local_duel --out new.json --compare old.json
+#
+# Exits with status 1 if any session fails, or (with --compare) if a step got slower.
+import argparse
+import contextlib
+import json
+import os
+import platform
+import random
+import sys
+import time
+import traceback
+import types
+from concurrent.futures import ProcessPoolExecutor
+
+from game_module import git_commit, load_game
+
+SCENARIOS = ("creation", "single", "local_duel", "link_duel")
+WAIT_TIMEOUT_S = 20     # Real seconds a step may wait for bots, baking or polls
+POLL_MS = 50            # Virtual (mock) or real time between checks while waiting
+SOLVER_CANDIDATES = 30
+HOT_PATHS = (
+    ("MainApp", "_apply_turn_state"),
+    ("MainApp", "_player_made_guess"),
+    ("PlayerPanel", "submit_guess"),
+    ("SingleGameWindow", "submit_guess"),
+    ("SingleGameWindow", "acquire"),
+    ("ViewManager", "show"),
+    ("AvatarReactor", "_tick"),
+)
+
+game = tk = sim = None
+_hot = {}      # "Class.method" -> [ms] for the current session
+_windows = []  # Every SingleGameWindow handed out this session, oldest first
+_words = {}
+
+class SimFailure(Exception):
+    pass
+
+# ---------------------------------------------------------
+# WORKER SETUP
+# ---------------------------------------------------------
+def _init_worker(backend):
+    global game, tk, sim
+    os.environ.setdefault("WORDUEL_RATINGS", os.devnull) # Simulated duels stay off the real leaderboard
+    if backend == "mock":
+        import sim_tk
+        sim = sim_tk.install()
+    game = load_game()
+    tk = game.tk
+    if sim is not None and game.PIL_AVAILABLE:
+        game.ImageTk = types.SimpleNamespace(PhotoImage=sim.PhotoImage) # Nothing to hand pixels to
+    _instrument()
+
+def _timed(key, fn):
+    def run(*args, **kw):
+        t0 = time.perf_counter()
+        try: return fn(*args, **kw)
+        finally: _hot.setdefault(key, []).append((time.perf_counter() - t0) * 1000)
+    return run
+
+def _instrument():
+    for cls_name, name in HOT_PATHS:
+        cls = getattr(game, cls_name)
+        raw = cls.__dict__[name]
+        if isinstance(raw, classmethod): setattr(cls, name, classmethod(_timed(f"{cls_name}.{name}", raw.__func__)))
+        else: setattr(cls, name, _timed(f"{cls_name}.{name}", raw))
+    acquire = game.SingleGameWindow.__dict__["acquire"].__func__
+    def tracked(cls, *args, **kw):
+        win = acquire(cls, *args, **kw)
+        _windows.append(win)
+        return win
+    game.SingleGameWindow.acquire = classmethod(tracked)
+
+def words(length):
+    # Per worker process: filter the dictionary once per length
+    if length not in _words: _words[length] = game.WordSolver(length).candidates
+    return _words[length]
+
+# ---------------------------------------------------------
+# DRIVER
+# ---------------------------------------------------------
+class Driver:
+    """One Tk root per session, plus the helpers scripts use to find widgets and act on them."""
+    def __init__(self, seed):
+        self.rng = random.Random(seed)
+        game.random.seed(seed) # Secrets, bot picks
+        self.root = tk.Tk()
+        self.errors = []
+        self.root.report_callback_exception = self._report
+        self.dialogs = []
+        game.messagebox = types.SimpleNamespace(showinfo=self._dialog("info"), showerror=self._dialog("error"))
+        self.steps = []
+        _hot.clear()
+        _windows.clear()
+
+    def _report(self, exc, val, tb):
+        self.errors.append("".join(traceback.format_exception(exc, val, tb)).strip())
+
+    def _dialog(self, kind):
+        def show(title=None, message=None, **kw):
+            self.dialogs.append((kind, title, message))
+            return "ok"
+        return show
+
+    def close(self):
+        try: self.root.destroy()
+        except tk.TclError: pass
+        # Both hold on to this root's windows and images
+        game.SingleGameWindow._pool.clear()
+        game._reaction_cache.clear()
+
+    # Time
+    def settle(self):
+        """Runs whatever the last action queued for right now (after_idle, zero-delay after)."""
+        if sim: sim.CLOCK.advance(0)
+        else: self.root.update()
+
+    def wait(self, pred, what, timeout_s=WAIT_TIMEOUT_S):
+        deadline = time.perf_counter() + timeout_s
+        while not pred():
+            self._check_errors(what)
+            if time.perf_counter() > deadline: raise SimFailure(f"timed out waiting for {what}")
+            if sim:
+                # Virtual time runs ahead; the real sleep lets background threads (bots, baking) finish
+                if not sim.CLOCK.advance(POLL_MS): time.sleep(0.001)
+            else:
+                self.root.update()
+                time.sleep(POLL_MS / 1000)
+
+    @contextlib.contextmanager
+    def step(self, name):
+        """Times an action plus the work it queued for right away, and fails on any Tk callback error."""
+        t0 = time.perf_counter()
+        yield
+        self.settle()
+        self.steps.append((name, (time.perf_counter() - t0) * 1000))
+        self._check_errors(name)
+
+    def _check_errors(self, where):
+        if self.errors: raise SimFailure(f"{where}: callback raised\n{self.errors[0]}")
+
+    # Finding widgets
+    def shown(self, w):
+        """True if w and every parent up to its window are managed, and the window isn't withdrawn."""
+        while not isinstance(w, tk.Wm):
+            if not w.winfo_exists() or not w.winfo_manager(): return False
+            w = w.master
+        return w.winfo_exists() and w.state() != "withdrawn"
+
+    def walk(self, within=None):
+        stack = [within or self.root]
+        while stack:
+            w = stack.pop()
+            yield w
+            stack.extend(reversed(w.winfo_children()))
+
+    def find_all(self, kind, text=None, within=None):
+        return [w for w in self.walk(within) if isinstance(w, kind) and self.shown(w)
+                and (text is None or w.cget("text") == text)]
+
+    def find(self, kind, text=None, within=None):
+        found = self.find_all(kind, text, within)
+        if not found:
+            seen = sorted({str(w.cget("text")) for w in self.find_all(tk.Button, within=within)})
+            raise SimFailure(f"no {kind.__name__} {text!r} on screen (buttons: {', '.join(seen)})")
+        return found[0]
+
+    def has_text(self, text, within=None):
+        return any(w.cget("text") == text for w in self.find_all(tk.Label, within=within))
+
+    def window(self, title):
+        wins = [w for w in self.root.winfo_children() if isinstance(w, tk.Toplevel) and w.winfo_exists() and w.title() == title]
+        if not wins: raise SimFailure(f"no window titled {title!r}")
+        return wins[-1]
+
+    # Acting
+    def click(self, text, within=None, kind=None):
+        self.find(kind or tk.Button, text, within).invoke()
+
+    def fill(self, entry, text):
+        entry.delete(0, tk.END)
+        entry.insert(0, str(text))
+
+    def key(self, widget, sequence="<Return>"):
+        widget.event_generate(sequence)
+
+    def type_guess(self, board, word):
+        """Types word on the board's on-screen keyboard and presses Return in its entry."""
+        for ch in word: board.key_buttons[ch].invoke()
+        self.key(board.guess_entry)
+
+# ---------------------------------------------------------
+# SCRIPT PIECES
+# ---------------------------------------------------------
+class Player:
+    """Picks guesses for one board: solver-strong, or sloppy (any dictionary word)."""
+    def __init__(self, rng, length, sloppy=False):
+        self.rng, self.sloppy = rng, sloppy
+        self.solver = game.WordSolver(length, words=words(length), rng=rng)
+
+    def guess(self):
+        if self.sloppy: return self.rng.choice(words(self.solver.word_length))
+        return self.solver.best_guess(SOLVER_CANDIDATES)
+
+    def saw(self, guess, secret):
+        self.solver.observe(guess, game.WordleEngine.check_guess(guess, secret))
+
+def boot(d):
+    with d.step("boot"):
+        app = game.MainApp(d.root)
+    return app
+
+def create_profile(d, app, name):
+    with d.step("creator/name"):
+        d.fill(d.find(tk.Entry, within=app.center_frame), name)
+    for category in ("Base", "Expr", "Outfit"):
+        with d.step("creator/toggle"):
+            d.click(category, within=app.center_frame)
+        for _ in range(d.rng.randint(0, 2)):
+            with d.step("creator/cycle"):
+                d.click(d.rng.choice("❮❯"), within=app.center_frame)
+    with d.step("creator/save"):
+        d.click("Save & Continue", within=app.center_frame)
+
+def play_single_board(d, board, player, name, bad_word=False):
+    """Plays a SingleGameWindow to the end; returns True if it was won."""
+    if bad_word:
+        with d.step(f"{name}/rejected"):
+            d.type_guess(board, "q" * board.word_length)
+        if board.attempt: raise SimFailure(f"{name}: a non-word was accepted")
+        with d.step(f"{name}/erase"):
+            for _ in range(board.word_length): d.click("⌫", within=board.win)
+        if board.guess_var.get(): raise SimFailure(f"{name}: backspace left {board.guess_var.get()!r}")
+    while board.attempts_used is None:
+        guess, before = player.guess(), board.attempt
+        with d.step(f"{name}/guess"):
+            d.type_guess(board, guess)
+        if board.attempt != before + 1: raise SimFailure(f"{name}: {guess!r} was not accepted")
+        player.saw(guess, board.secret)
+    title = "YOU WON!" if board.guessed else "YOU LOST"
+    if not d.has_text(title, within=board.win): raise SimFailure(f"{name}: result overlay missing {title!r}")
+    return board.guessed
+
+def start_menu(d):
+    app = boot(d)
+    name = f"Sim{d.rng.randint(1, 999)}"
+    create_profile(d, app, name)
+    if not d.has_text(f"Haii {name}"): raise SimFailure("main menu doesn't greet the new profile")
+    return app
+
+# ---------------------------------------------------------
+# SCENARIOS
+# ---------------------------------------------------------
+def scenario_creation(d):
+    app = start_menu(d)
+    with d.step("menu/stats"):
+        d.click("Stats")
+    with d.step("menu/back"):
+        d.click("Back")
+    with d.step("menu/theme"):
+        d.click("◐")
+    if game.THEMES.name == game.DEFAULT_PALETTE: raise SimFailure("theme button did not switch palettes")
+    with d.step("menu/theme"):
+        d.click("◐")
+
+def scenario_single(d):
+    app = start_menu(d)
+    length = d.rng.choice(sorted(game.WORDS_BY_LENGTH))
+    hard = d.rng.random() < 0.3
+    with d.step("single/open"):
+        d.click("Single Player")
+    with d.step("single/options"):
+        d.fill(d.find(tk.Spinbox, within=app.center_frame), length)
+        if hard: d.click("Hard mode (use every hint)", kind=tk.Checkbutton)
+    for game_no in range(d.rng.choice((1, 1, 2))):
+        with d.step("single/start"):
+            d.click("START GAME") if game_no == 0 else d.click("Play Again", within=board.win)
+        board = _windows[-1]
+        if board.word_length != length or board.hard_mode != hard: raise SimFailure("game window has the wrong settings")
+        player = Player(d.rng, length, sloppy=not hard and d.rng.random() < 0.3)
+        play_single_board(d, board, player, "single", bad_word=d.rng.random() < 0.5)
+    with d.step("single/continue"):
+        d.click("Continue", within=board.win)
+    if board.win.state() != "withdrawn": raise SimFailure("finished game window was not parked in the pool")
+
+def scenario_local_duel(d):
+    app = start_menu(d)
+    players = d.rng.choice((2, 2, 3, 4))
+    bots = d.rng.randint(0, players - 1)
+    length = d.rng.choice(sorted(game.WORDS_BY_LENGTH))
+    with d.step("duel/open"):
+        d.click("Duel Mode")
+    with d.step("duel/local"):
+        d.click("Local Duel (Same PC)")
+    with d.step("duel/options"):
+        players_box, bots_box = d.find_all(tk.Spinbox, within=app.center_frame)
+        d.fill(players_box, players)
+        d.fill(bots_box, bots)
+    with d.step("duel/next"):
+        d.click("NEXT")
+    for i in range(2, players - bots + 1): create_profile(d, app, f"Friend{i}")
+    with d.step("duel/words"):
+        entries = d.find_all(tk.Entry, within=app.center_frame)
+        if len(entries) != players - bots: raise SimFailure(f"{len(entries)} secret boxes for {players - bots} humans")
+        for e in entries: d.fill(e, d.rng.choice(game.WORDS_BY_LENGTH[length]))
+    with d.step("duel/fight"):
+        d.click("FIGHT!")
+
+    humans = {}
+    over = lambda: d.has_text("DUEL OVER")
+    def my_turn():
+        pid = app.turns.active
+        return pid is not None and not app.duel_bots.get(pid) and pid in app.duel_panels
+    while not over():
+        d.wait(lambda: over() or my_turn(), "the next human turn")
+        if over(): break
+        pid = app.turns.active
+        panel = app.duel_panels[pid]
+        player = humans.get(pid) or humans.setdefault(pid, Player(d.rng, panel.word_length, sloppy=d.rng.random() < 0.3))
+        guess, before = player.guess(), panel.attempt
+        with d.step("duel/guess"):
+            d.type_guess(panel, guess)
+        if panel.attempt != before + 1: raise SimFailure(f"duel: {guess!r} was not accepted")
+        player.saw(guess, panel.secret)
+
+    ranking = app._rank_duel_results()
+    attempts, guessed = app.results[ranking[0]]
+    winners = [p for p in ranking if app.results[p] == (attempts, True)] if guessed else []
+    expect = "Nobody won..." if not winners else "It's a Tie!" if len(winners) > 1 else f"Player {app.duel_ids.index(winners[0]) + 1} Wins!"
+    if not d.has_text(expect): raise SimFailure(f"duel overlay should say {expect!r}")
+    # Ratings load in the background at launch, so the card may get its rating lines a little later
+    d.wait(lambda: any("  ·  #" in str(w.cget("text")) for w in d.find_all(tk.Label, within=app.center_frame)), "the rating changes")
+    with d.step("duel/back"):
+        d.click("Back to Menu")
+
+def scenario_link_duel(d):
+    app = start_menu(d)
+    length = d.rng.choice(sorted(game.WORDS_BY_LENGTH))
+    host_secret, friend_secret = d.rng.choice(words(length)), d.rng.choice(words(length))
+
+    # Leg 1, host: make the challenge link
+    with d.step("link/open"):
+        d.click("Duel Mode")
+    with d.step("link/create"):
+        d.click("Create Link (Send to Friend)")
+    with d.step("link/generate"):
+        d.fill(d.find(tk.Entry, within=app.center_frame), host_secret)
+        d.click("Generate Link")
+    top = d.window("Copy Link")
+    link = d.find(tk.Entry, within=top).get()
+    with d.step("link/done"):
+        d.click("Done", within=top)
+
+    # Leg 1, friend: play the host's word and send a return link
+    with d.step("link/join"):
+        d.fill(app.link_entry, link)
+        d.click("JOIN")
+    board = _windows[-1]
+    if board.secret != host_secret: raise SimFailure("joined game has the wrong secret")
+    friend_won = play_single_board(d, board, Player(d.rng, length), "link")
+    with d.step("link/continue"):
+        d.click("Continue", within=board.win)
+    pop = d.window("Round 2 Setup")
+    with d.step("link/return"):
+        d.fill(d.find(tk.Entry, within=pop), friend_secret)
+        d.click("Create Return Link", within=pop)
+    back = d.window("Send Back")
+    ret_link = d.find(tk.Entry, within=back).get()
+    back.destroy()
+
+    # Leg 2, host: play the friend's word, from the join box or through the inbox
+    via_inbox = d.rng.random() < 0.5
+    if via_inbox:
+        d.root.clipboard_clear()
+        d.root.clipboard_append(f"my turn! {ret_link}")
+        with d.step("inbox/open"):
+            d.click("Inbox")
+        d.wait(lambda: d.find_all(tk.Button, "Play"), "the return link in the inbox")
+        with d.step("inbox/play"):
+            d.click("Play")
+    else:
+        with d.step("link/join"):
+            d.fill(app.link_entry, ret_link)
+            d.click("JOIN")
+    board = _windows[-1]
+    if board.secret != friend_secret: raise SimFailure("return game has the wrong secret")
+    host_won = play_single_board(d, board, Player(d.rng, length), "link")
+    with d.step("link/continue"):
+        d.click("Continue", within=board.win)
+
+    if via_inbox:
+        if not any(str(w.cget("text")).startswith("Winner:") for w in d.find_all(tk.Label)):
+            raise SimFailure("inbox does not show the duel result")
+    else:
+        results = [m for kind, title, m in d.dialogs if title == "Duel Result"]
+        if not results: raise SimFailure("no duel result was announced")
+        if host_won != friend_won: expect = "Winner: Friend" if friend_won else "Winner: " + app.profile["username"]
+        else: expect = "Winner:"
+        if not results[-1].startswith(expect): raise SimFailure(f"duel result {results[-1]!r}, expected {expect!r}")
+
+# ---------------------------------------------------------
+# RUNNER
+# ---------------------------------------------------------
+def run_session(job):
+    """Runs one scripted session in a fresh root; returns its outcome and timings."""
+    scenario, seed = job
+    d = Driver(seed)
+    out = {"scenario": scenario, "seed": seed, "ok": True}
+    t0 = time.perf_counter()
+    try: globals()["scenario_" + scenario](d)
+    except SimFailure as e: out.update(ok=False, error=str(e))
+    except Exception as e: out.update(ok=False, error="".join(traceback.format_exception(type(e), e, e.__traceback__)).strip())
+    finally: d.close()
+    out["wall_ms"] = (time.perf_counter() - t0) * 1000
+    out["steps"] = d.steps
+    out["hot"] = {k: list(v) for k, v in _hot.items()}
+    return out
+
+def percentile(samples, q):
+    s = sorted(samples)
+    return s[min(len(s) - 1, int(q * len(s)))] if s else None
+
+def summarize(samples):
+    return {"n": len(samples), "p50": round(percentile(samples, 0.5), 3), "p95": round(percentile(samples, 0.95), 3),
+            "max": round(max(samples), 3), "total": round(sum(samples), 3)}
+
+def resolve_backend(choice):
+    if choice != "auto": return choice
+    has_display = bool(os.environ.get("DISPLAY")) or sys.platform in ("win32", "darwin")
+    return "real" if has_display else "mock"
+
+def compare(report, baseline_path, max_slowdown):
+    """Prints p95 changes against an earlier run; returns the names that got slower than allowed."""
+    with open(baseline_path, "r", encoding="utf-8") as f: base = json.load(f)
+    print(f"\nvs {baseline_path} (commit {base.get('commit')}, tk {base.get('tk')}):")
+    slower = []
+    for section in ("steps", "hot_paths"):
+        for name, cur in report[section].items():
+            old = base.get(section, {}).get(name)
+            if not old or not old["p95"]: continue
+            ratio = cur["p95"] / old["p95"]
+            flag = ""
+            if ratio > max_slowdown:
+                slower.append(name)
+                flag = "  SLOWER"
+            print(f"  {name:<32} p95 {old['p95']:>8.2f} -> {cur['p95']:>8.2f} ms  x{ratio:.2f}{flag}")
+    return slower
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Scripted headless sessions through the WorDuel UI.")
+    ap.add_argument("-n", "--sessions", type=int, default=200)
+    ap.add_argument("-s", "--scenario", action="append", choices=SCENARIOS, help="scenario to run (repeatable, default: all)")
+    ap.add_argument("--tk", choices=("auto", "real", "mock"), default="auto",
+                    help="real Tk (needs a display, e.g. xvfb-run) or the in-process stand-in")
+    ap.add_argument("-w", "--workers", type=int, default=os.cpu_count() or 1)
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--out", default="ui_sim.json", help="where to write the JSON results")
+    ap.add_argument("--compare", metavar="JSON", help="earlier results file to diff p95 latencies against")
+    ap.add_argument("--max-slowdown", type=float, default=1.5, help="p95 ratio over the baseline that fails the run")
+    args = ap.parse_args(argv)
+
+    backend = resolve_backend(args.tk)
+    scenarios = args.scenario or list(SCENARIOS)
+    jobs = [(scenarios[i % len(scenarios)], args.seed + i) for i in range(args.sessions)]
+    print(f"{len(jobs)} sessions ({', '.join(scenarios)}) on {args.workers} workers, tk={backend}")
+
+    t0 = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=args.workers, initializer=_init_worker, initargs=(backend,)) as pool:
+        results = list(pool.map(run_session, jobs))
+    wall = time.perf_counter() - t0
+
+    steps, hot = {}, {}
+    for r in results:
+        for name, ms in r["steps"]: steps.setdefault(name, []).append(ms)
+        for name, samples in r["hot"].items(): hot.setdefault(name, []).extend(samples)
+    failures = [r for r in results if not r["ok"]]
+    by_scenario = {s: {"sessions": sum(r["scenario"] == s for r in results),
+                       "failures": sum(r["scenario"] == s for r in failures)} for s in scenarios}
+
+    print(f"\n{'step':<32}{'n':>7}{'p50 ms':>10}{'p95 ms':>10}{'max ms':>10}")
+    for title, table in (("steps", steps), ("hot paths", hot)):
+        for name in sorted(table):
+            s = summarize(table[name])
+            print(f"{name:<32}{s['n']:>7}{s['p50']:>10.2f}{s['p95']:>10.2f}{s['max']:>10.2f}")
+        print()
+    for s, c in by_scenario.items(): print(f"{s:<12} {c['sessions'] - c['failures']}/{c['sessions']} ok")
+    for r in failures[:10]: print(f"\nFAILED {r['scenario']} seed={r['seed']}: {r['error']}")
+    print(f"\n{len(results) - len(failures)}/{len(results)} sessions passed in {wall:.2f}s")
+
+    report = {"commit": git_commit(), "python": platform.python_version(), "tk": backend,
+              "settings": {"sessions": args.sessions, "seed": args.seed, "workers": args.workers},
+              "wall_s": round(wall, 3), "scenarios": by_scenario,
+              "steps": {k: summarize(v) for k, v in sorted(steps.items())},
+              "hot_paths": {k: summarize(v) for k, v in sorted(hot.items())},
+              "failures": [{k: r[k] for k in ("scenario", "seed", "error")} for r in failures]}
+    with open(args.out, "w", encoding="utf-8") as f: json.dump(report, f, indent=2)
+    print(f"Wrote {args.out}")
+
+    slower = compare(report, args.compare, args.max_slowdown) if args.compare else []
+    if slower: print("Slower than baseline: " + ", ".join(slower))
+    return 1 if failures or slower else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,11 +1,272 @@
+import time
+_STARTUP_T0 = time.perf_counter()
 import tkinter as tk
 from tkinter import messagebox
 import random
-import base64
-import urllib.parse
-import urllib.request
-import ssl
 import os
+import sys
+import math
+import struct
+import re
+import weakref
+from collections import OrderedDict
+
+# ---------------------------------------------------------
+# COMMAND-LINE / ENVIRONMENT OPTIONS
+# ---------------------------------------------------------
+def cli_option(flag, env_var, argv=None, environ=None):
+    """Value of "--flag VALUE" / "--flag=VALUE" on the command line, else of env_var (or None)."""
+    argv = sys.argv[1:] if argv is None else argv
+    environ = os.environ if environ is None else environ
+    value = environ.get(env_var)
+    for i, arg in enumerate(argv):
+        if arg.startswith(flag + "="): value = arg.split("=", 1)[1]
+        elif arg == flag and i + 1 < len(argv): value = argv[i + 1]
+    return value
+
+def cli_switch(flag, env_var, argv=None, environ=None):
+    """True if the bare --flag is on the command line or env_var is "1"."""
+    argv = sys.argv[1:] if argv is None else argv
+    environ = os.environ if environ is None else environ
+    return flag in argv or environ.get(env_var) == "1"
+
+# ---------------------------------------------------------
+# STARTUP PROFILING
+# ---------------------------------------------------------
+class StartupProfiler:
+    """Collects labelled timestamps from process start to first paint (opt-in).
+
+    Enable with --profile-startup or WORDUEL_PROFILE_STARTUP=1. With
+    --startup-budget MS (or WORDUEL_STARTUP_BUDGET_MS) the game quits right
+    after the first paint and exits with status 1 if the budget was blown.
+    """
+    def __init__(self, t0, argv=None, environ=None):
+        self.t0 = t0
+        self.marks = []
+        self.budget_ms = None
+        budget = cli_option("--startup-budget", "WORDUEL_STARTUP_BUDGET_MS", argv, environ)
+        if budget:
+            try: self.budget_ms = float(budget)
+            except ValueError: pass
+        self.enabled = cli_switch("--profile-startup", "WORDUEL_PROFILE_STARTUP", argv, environ) or self.budget_ms is not None
+
+    def mark(self, label):
+        """Records label once; later marks with the same label are ignored."""
+        if not self.enabled or any(l == label for l, _ in self.marks): return
+        self.marks.append((label, time.perf_counter()))
+
+    def total_ms(self):
+        return (self.marks[-1][1] - self.t0) * 1000 if self.marks else 0.0
+
+    def report(self, out=None):
+        out = out or sys.stderr
+        print("Startup timeline (ms since first import):", file=out)
+        prev = self.t0
+        for label, t in self.marks:
+            print(f"  {(t - self.t0) * 1000:8.1f}  (+{(t - prev) * 1000:7.1f})  {label}", file=out)
+            prev = t
+        if self.budget_ms is not None:
+            verdict = "OK" if self.total_ms() <= self.budget_ms else "OVER BUDGET"
+            print(f"  total {self.total_ms():.1f} ms, budget {self.budget_ms:.0f} ms: {verdict}", file=out)
+
+    def over_budget(self):
+        return self.budget_ms is not None and self.total_ms() > self.budget_ms
+
+STARTUP = StartupProfiler(_STARTUP_T0)
+
+# ---------------------------------------------------------
+# METRICS (opt-in)
+# ---------------------------------------------------------
+class Histogram:
+    """Fixed-bucket latency histogram in milliseconds (Prometheus-style cumulative buckets)."""
+    BOUNDS_MS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000)
+
+    def __init__(self):
+        self.counts = [0] * (len(self.BOUNDS_MS) + 1) # Last slot is +Inf
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, ms):
+        i = 0
+        for b in self.BOUNDS_MS:
+            if ms <= b: break
+            i += 1
+        self.counts[i] += 1
+        self.count += 1
+        self.sum += ms
+        if ms > self.max: self.max = ms
+
+    def quantile(self, q):
+        """Upper bound of the bucket holding the q-quantile (max for the +Inf bucket)."""
+        if not self.count: return 0.0
+        rank, seen = q * self.count, 0
+        for i, c in enumerate(self.counts):
+            seen += c
+            if seen >= rank: return self.BOUNDS_MS[i] if i < len(self.BOUNDS_MS) else self.max
+        return self.max
+
+class _NullTimer:
+    def __enter__(self): return self
+    def __exit__(self, *exc): return False
+
+class _Timer:
+    __slots__ = ("metrics", "name", "t0")
+    def __init__(self, metrics, name):
+        self.metrics, self.name = metrics, name
+    def __enter__(self):
+        self.t0 = time.perf_counter()
+        return self
+    def __exit__(self, *exc):
+        self.metrics.observe(self.name, (time.perf_counter() - self.t0) * 1000)
+        return False
+
+class Metrics:
+    """Counters and latency histograms for the interactive hot paths.
+
+    Off by default; enable with --metrics or WORDUEL_METRICS=1. When off every
+    hook is a no-op. --metrics-out PATH (or WORDUEL_METRICS_OUT) dumps the
+    numbers at exit, as Prometheus text for *.prom files and JSON otherwise.
+    F12 opens a live overlay.
+    """
+    _NULL = _NullTimer()
+
+    def __init__(self, enabled=False, out_path=None):
+        self.enabled = enabled
+        self.out_path = out_path
+        self.counters = {}
+        self.histograms = {}
+
+    @classmethod
+    def from_env(cls, argv=None, environ=None):
+        out = cli_option("--metrics-out", "WORDUEL_METRICS_OUT", argv, environ)
+        enabled = cli_switch("--metrics", "WORDUEL_METRICS", argv, environ) or bool(out)
+        return cls(enabled, out)
+
+    def inc(self, name, n=1):
+        if self.enabled: self.counters[name] = self.counters.get(name, 0) + n
+
+    def observe(self, name, ms):
+        if not self.enabled: return
+        h = self.histograms.get(name)
+        if h is None: h = self.histograms[name] = Histogram()
+        h.observe(ms)
+
+    def timer(self, name):
+        """Context manager that records the block's duration (ms) into histogram name."""
+        return _Timer(self, name) if self.enabled else self._NULL
+
+    def snapshot(self):
+        return {
+            "counters": dict(self.counters),
+            "histograms_ms": {
+                name: {"count": h.count, "sum": round(h.sum, 3), "max": round(h.max, 3),
+                       "p50": h.quantile(0.5), "p95": h.quantile(0.95), "p99": h.quantile(0.99)}
+                for name, h in self.histograms.items()
+            },
+        }
+
+    def to_prometheus(self):
+        lines = []
+        for name, v in sorted(self.counters.items()):
+            lines += [f"# TYPE worduel_{name}_total counter", f"worduel_{name}_total {v}"]
+        for name, h in sorted(self.histograms.items()):
+            metric = f"worduel_{name}"
+            lines.append(f"# TYPE {metric} histogram")
+            seen = 0
+            for b, c in zip(Histogram.BOUNDS_MS + ("+Inf",), h.counts):
+                seen += c
+                lines.append(f'{metric}_bucket{{le="{b}"}} {seen}')
+            lines += [f"{metric}_sum {h.sum:.6f}", f"{metric}_count {h.count}"]
+        return "\n".join(lines) + "\n"
+
+    def dump(self, path=None):
+        path = path or self.out_path
+        if not path: return
+        import json
+        with open(path, "w", encoding="utf-8") as f:
+            if path.endswith(".prom"): f.write(self.to_prometheus())
+            else: json.dump(self.snapshot(), f, indent=2)
+
+METRICS = Metrics.from_env()
+if METRICS.out_path:
+    import atexit
+    atexit.register(METRICS.dump)
+
+# ---------------------------------------------------------
+# GUESS TIMING TELEMETRY
+# ---------------------------------------------------------
+class QuantileSketch:
+    """Streaming quantiles over log-spaced buckets: O(1) per sample, ~rel_err relative error."""
+    MIN_VALUE = 1e-3
+
+    def __init__(self, rel_err=0.02):
+        self.gamma = (1 + rel_err) / (1 - rel_err)
+        self._log_gamma = math.log(self.gamma)
+        self.buckets = {}
+        self.zeros = 0 # Samples below MIN_VALUE
+        self.count = 0
+
+    def add(self, x):
+        self.count += 1
+        if x < self.MIN_VALUE:
+            self.zeros += 1
+            return
+        k = math.ceil(math.log(x) / self._log_gamma)
+        self.buckets[k] = self.buckets.get(k, 0) + 1
+
+    def quantile(self, q):
+        if not self.count: return None
+        rank = q * (self.count - 1)
+        seen = self.zeros
+        if rank < seen: return 0.0
+        for k in sorted(self.buckets):
+            seen += self.buckets[k]
+            if seen > rank: return 2 * self.gamma ** k / (self.gamma + 1)
+        return 2 * self.gamma ** max(self.buckets) / (self.gamma + 1)
+
+class GuessTelemetry:
+    """Per-guess think time and submit-to-render latency for this session.
+
+    Raw samples sit in a ring buffer; percentiles come from one QuantileSketch
+    per (player, word length, metric), so reading stats never rescans history.
+    """
+    RING_SIZE = 512
+    METRICS = ("think_ms", "render_ms")
+
+    def __init__(self):
+        from collections import deque
+        self.recent = deque(maxlen=self.RING_SIZE) # [wall time, player, length, think_ms, render_ms]
+        self.sketches = {}
+
+    def _sketch(self, player, length, metric):
+        key = (player, length, metric)
+        sk = self.sketches.get(key)
+        if sk is None: sk = self.sketches[key] = QuantileSketch()
+        return sk
+
+    def record_guess(self, widget, player, length, think_ms, t_submit, on_rendered=None):
+        """Stores think_ms now and the render latency once Tk has drawn the row (after_idle)."""
+        sample = [time.time(), player, length, think_ms, None]
+        self.recent.append(sample)
+        self._sketch(player, length, "think_ms").add(think_ms)
+
+        def rendered():
+            ms = (time.perf_counter() - t_submit) * 1000
+            sample[4] = ms
+            self._sketch(player, length, "render_ms").add(ms)
+            if on_rendered: on_rendered()
+        widget.after_idle(rendered)
+
+    def summary(self):
+        """{(player, length): {metric: {"n", "p50", "p95", "p99"}}} for the stats screen."""
+        out = {}
+        for (player, length, metric), sk in sorted(self.sketches.items()):
+            out.setdefault((player, length), {})[metric] = {
+                "n": sk.count, "p50": sk.quantile(0.5), "p95": sk.quantile(0.95), "p99": sk.quantile(0.99)}
+        return out
+
+TELEMETRY = GuessTelemetry()
 
 # ---------------------------------------------------------
 # DEPENDENCIES & ASSETS
@@ -15,27 +276,169 @@ try:
     PIL_AVAILABLE = True
 except Exception:
     PIL_AVAILABLE = False
+STARTUP.mark("imports (tkinter, PIL)")
 
 # ---------------------------------------------------------
 # THEME & CONFIG
 # ---------------------------------------------------------
 MAX_ATTEMPTS = 6
-
-THEME = {
-    "bg": "#f8f5ff",           # Very light lavender background
-    "card_bg": "#ffffff",      # White cards
-    "text_main": "#4a4a6a",    # Dark purplish grey text
-    "muted": "#8d8d9e",        # Muted text
-    "primary": "#b088ff",      # Cute purple button
-    "primary_hover": "#9e70f7",
-    "secondary": "#eaddff",    # Light purple accent
-    "success": "#9bf6c2",      # Mint green (Win)
-    "warning": "#ffeebb",      # Pastel Yellow (Present)
-    "error": "#ffb3b3",        # Pastel Red (Lose)
-    "grey": "#e0e0e0",         # Absent
-    "tile_text": "#5c5c70",
-    "white": "#ffffff"
+MAX_DUEL_PLAYERS = 8
+DUEL_PANELS_PER_ROW = 4
+
+# Bot difficulty: (how many candidate words it weighs per move, seconds it may think)
+BOT_LEVELS = {
+    "Easy": (1, 0.3),
+    "Medium": (40, 0.8),
+    "Hard": (300, 2.0),
+}
+BOT_POLL_MS = 50
+SOLVER_STRATEGIES = ("expected", "entropy", "minimax", "random")
+BOT_MIN_THINK_MS = 400
+INBOX_POLL_MS = 1000 # How often the link inbox looks at the clipboard
+GAME_WINDOW_POOL_SIZE = 2 # Idle game windows kept per word length for the next game
+TRAP_MIN_WORDS = 3 # One-letter look-alikes needed before a board or result warns about a trap
+TRAP_SHOWN_WORDS = 4 # Look-alikes the result card lists by name (the board only counts them)
+# Screens MainApp keeps built: its 8 menu screens plus the one transient board or form on show,
+# so normal play never evicts. The least recently shown is dropped past this.
+VIEW_CACHE_SIZE = 9
+
+# Every color the UI uses, by role. THEME always holds the active palette.
+PALETTES = {
+    "pastel": {
+        "bg": "#f8f5ff",           # Very light lavender background
+        "card_bg": "#ffffff",      # White cards
+        "text_main": "#4a4a6a",    # Dark purplish grey text
+        "muted": "#8d8d9e",        # Muted text
+        "primary": "#b088ff",      # Cute purple button
+        "primary_hover": "#9e70f7",
+        "on_primary": "#ffffff",
+        "secondary": "#eaddff",    # Light purple accent
+        "success": "#9bf6c2",      # Mint green (Win)
+        "warning": "#ffeebb",      # Pastel Yellow (Present)
+        "error": "#ffb3b3",        # Pastel Red (Lose)
+        "grey": "#e0e0e0",         # Absent
+        "tile_text": "#5c5c70",
+        "absent_text": "#999999",
+        "win": "#76c893",
+        "lose": "#ff8fab",
+        "white": "#ffffff"
+    },
+    # Colorblind-safe: orange = right spot, blue = in the word, strong text contrast
+    "high_contrast": {
+        "bg": "#ffffff",
+        "card_bg": "#ffffff",
+        "text_main": "#000000",
+        "muted": "#333333",
+        "primary": "#0b3d91",
+        "primary_hover": "#072a66",
+        "on_primary": "#ffffff",
+        "secondary": "#d6e4ff",
+        "success": "#f5793a",
+        "warning": "#85c0f9",
+        "error": "#d00000",
+        "grey": "#787c7e",
+        "tile_text": "#000000",
+        "absent_text": "#ffffff",
+        "win": "#b34700",
+        "lose": "#d00000",
+        "white": "#ffffff"
+    },
 }
+DEFAULT_PALETTE = "pastel"
+
+# Named styles: widget option -> palette role
+STYLES = {
+    "surface": {"bg": "bg"},
+    "card": {"bg": "card_bg"},
+    "border": {"bg": "grey"},
+    "label": {"bg": "bg", "fg": "text_main"},
+    "label.muted": {"bg": "bg", "fg": "muted"},
+    "label.title": {"bg": "bg", "fg": "primary"},
+    "label.win": {"bg": "bg", "fg": "win"},
+    "label.lose": {"bg": "bg", "fg": "lose"},
+    "label.success": {"bg": "bg", "fg": "success"},
+    "label.error": {"bg": "bg", "fg": "error"},
+    "card.label": {"bg": "card_bg", "fg": "muted"},
+    "card.title": {"bg": "card_bg", "fg": "primary"},
+    "card.value": {"bg": "card_bg", "fg": "text_main"},
+    "entry": {"bg": "card_bg", "fg": "text_main", "insertbackground": "text_main"},
+    "entry.soft": {"bg": "bg", "fg": "text_main", "insertbackground": "text_main"},
+    "spinbox": {"bg": "card_bg", "fg": "text_main", "insertbackground": "text_main", "buttonbackground": "secondary"},
+    "check": {"bg": "bg", "fg": "muted", "activebackground": "bg", "selectcolor": "card_bg"},
+    "button.primary": {"bg": "primary", "fg": "on_primary", "activebackground": "primary_hover", "activeforeground": "on_primary"},
+    "button.secondary": {"bg": "secondary", "fg": "text_main", "activebackground": "primary_hover"},
+    "button.plain": {"bg": "card_bg", "fg": "text_main", "activebackground": "grey"},
+    "button.tool": {"bg": "secondary", "fg": "text_main", "activebackground": "grey"},
+    "button.link": {"bg": "bg", "fg": "muted", "activebackground": "bg", "activeforeground": "text_main"},
+    "overlay": {"bg": "card_bg"},
+    "tile.empty": {"bg": "card_bg", "fg": "tile_text"},
+    "tile.grey": {"bg": "grey", "fg": "absent_text"},
+    "tile.yellow": {"bg": "warning", "fg": "tile_text"},
+    "tile.green": {"bg": "success", "fg": "tile_text"},
+    "tile.error": {"bg": "error", "fg": "tile_text"},
+    "key.empty": {"bg": "card_bg", "fg": "text_main", "activebackground": "grey"},
+    "key.grey": {"bg": "grey", "fg": "absent_text", "activebackground": "grey"},
+    "key.yellow": {"bg": "warning", "fg": "text_main", "activebackground": "grey"},
+    "key.green": {"bg": "success", "fg": "text_main", "activebackground": "grey"},
+}
+
+# Tile / key states, weakest first: a key only ever moves to a stronger state
+HINT_STATES = ("empty", "grey", "yellow", "green")
+HINT_RANK = {s: i for i, s in enumerate(HINT_STATES)}
+
+class ThemeEngine:
+    """Resolves STYLES against each palette once and restyles every registered widget on a switch.
+
+    style(widget, name) colors a widget and remembers which style it wears; switch(palette)
+    reconfigures all of them in one pass, without rebuilding any window.
+    """
+    def __init__(self, palettes, styles, name=DEFAULT_PALETTE):
+        self.palettes = palettes
+        self.styles = styles
+        self._tables = {}
+        self._widgets = weakref.WeakKeyDictionary() # widget -> style name; destroyed widgets drop out
+        self.name = name if name in palettes else DEFAULT_PALETTE
+        self.palette = dict(palettes[self.name])
+        self.table = self._table(self.name)
+
+    def _table(self, name):
+        if name not in self._tables:
+            p = self.palettes[name]
+            self._tables[name] = {s: {opt: p[role] for opt, role in opts.items()} for s, opts in self.styles.items()}
+        return self._tables[name]
+
+    def __getitem__(self, style):
+        return self.table[style]
+
+    def style(self, widget, style, **extra):
+        """Applies a named style (plus any extra options, in the same configure call); returns widget."""
+        widget.configure(**self.table[style], **extra) if extra else widget.configure(**self.table[style])
+        self._widgets[widget] = style
+        return widget
+
+    def switch(self, name):
+        """Makes palette name active and restyles every live widget. Returns how many were restyled."""
+        if name not in self.palettes or name == self.name: return 0
+        with METRICS.timer("theme_switch_ms"):
+            self.name = name
+            self.table = self._table(name)
+            self.palette.clear()
+            self.palette.update(self.palettes[name])
+            n = 0
+            for widget, style in list(self._widgets.items()):
+                try:
+                    widget.configure(**self.table[style])
+                    n += 1
+                except tk.TclError:
+                    self._widgets.pop(widget, None)
+        return n
+
+    def cycle(self):
+        names = list(self.palettes)
+        return self.switch(names[(names.index(self.name) + 1) % len(names)])
+
+THEMES = ThemeEngine(PALETTES, STYLES, cli_option("--theme", "WORDUEL_THEME") or DEFAULT_PALETTE)
+THEME = THEMES.palette # Active palette colors, for canvas drawing
 
 WORDS_BY_LENGTH = {
     3: ["cat", "dog", "sun", "car", "map", "bag", "hot", "cup", "key", "ice", "pen", "jam", "egg", "owl", "fox"],
@@ -46,10 +449,101 @@ WORDS_BY_LENGTH = {
 }
 
 DEFAULT_WORDLIST_URL = "https://raw.githubusercontent.com/dwyl/english-words/master/words_alpha.txt"
+# sha256 of the normalized list (unique lowercase words, sorted, one per line) -- same bytes as the shipped wordlist.txt
+DEFAULT_WORDLIST_DIGEST = "1198a3786bed510b4f8127f73a74c38596088a220d318d962e689dc6f0792599"
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
 
 # ---------------------------------------------------------
 # HELPERS: WORD LOADING & ENCODING
 # ---------------------------------------------------------
+class WordlistDownloadError(Exception):
+    """The remote word list could not be fetched or failed its integrity check."""
+
+def wordlist_digest(words):
+    """sha256 of the normalized list, so CRLF endings or ordering on the server don't matter."""
+    import hashlib
+    h = hashlib.sha256()
+    for w in sorted(words):
+        h.update(w.encode("utf-8"))
+        h.update(b"\n")
+    return h.hexdigest()
+
+def download_wordlist(url, local_path, expected_digest=None, timeout=5, chunk_size=DOWNLOAD_CHUNK_SIZE):
+    """Streams url to local_path and returns its word set, built in the same pass.
+
+    Chunks land in local_path + ".part"; an interrupted download leaves that
+    file behind and the next call resumes it with an HTTP Range request. The
+    finished list is checked against expected_digest (if given) and only then
+    moved over local_path, so a reader never sees a truncated file.
+    """
+    # Only needed when the local list is missing, so keep them off the startup path
+    import http.client
+    import ssl
+    import urllib.error
+    import urllib.request
+
+    part = local_path + ".part"
+    words = set()
+    carry = b""
+
+    def feed(data):
+        nonlocal carry
+        lines = (carry + data).split(b"\n")
+        carry = lines.pop()
+        for raw in lines: add(raw)
+
+    def add(raw):
+        try: w = raw.decode("utf-8").strip().lower()
+        except UnicodeDecodeError: return
+        if w: words.add(w)
+
+    # Resume: the bytes we already have still need to go into the set
+    offset = 0
+    if os.path.exists(part):
+        with open(part, "rb") as f:
+            for chunk in iter(lambda: f.read(chunk_size), b""):
+                feed(chunk)
+                offset += len(chunk)
+
+    headers = {"Range": f"bytes={offset}-"} if offset else {}
+    req = urllib.request.Request(url, headers=headers)
+    try:
+        with urllib.request.urlopen(req, context=ssl.create_default_context(), timeout=timeout) as resp:
+            if offset and resp.status != 206:
+                # Server ignored the Range header and is sending everything again
+                words.clear()
+                carry = b""
+                mode = "wb"
+            else: mode = "ab"
+            expected = resp.headers.get("Content-Length")
+            received = 0
+            with open(part, mode) as out:
+                for chunk in iter(lambda: resp.read(chunk_size), b""):
+                    out.write(chunk)
+                    feed(chunk)
+                    received += len(chunk)
+                out.flush()
+                os.fsync(out.fileno())
+            # A dropped connection can look like a clean EOF; the .part file is kept for resuming
+            if expected is not None and received < int(expected):
+                raise WordlistDownloadError(f"{url}: connection closed after {received} of {expected} bytes")
+    except urllib.error.HTTPError as e:
+        # 416: the partial file was already complete
+        if not (e.code == 416 and offset): raise WordlistDownloadError(f"{url}: HTTP {e.code}") from e
+    except (OSError, http.client.HTTPException) as e:
+        # URLError, timeouts, disk errors, truncated chunked bodies (IncompleteRead); the .part file is kept for resuming
+        raise WordlistDownloadError(f"{url}: {e!r}") from e
+
+    if carry: add(carry)
+    if not words: raise WordlistDownloadError(f"{url}: empty word list")
+    if expected_digest:
+        got = wordlist_digest(words)
+        if got != expected_digest:
+            os.remove(part)
+            raise WordlistDownloadError(f"{url}: digest mismatch (got {got})")
+    os.replace(part, local_path)
+    return words
+
 def load_valid_words(local_path="wordlist.txt", fallback_url=DEFAULT_WORDLIST_URL):
     words = set()
     if os.path.exists(local_path):
@@ -59,45 +553,174 @@ def load_valid_words(local_path="wordlist.txt", fallback_url=DEFAULT_WORDLIST_UR
                     w = line.strip().lower()
                     if w: words.add(w)
             if words: return words
-        except Exception: pass
+        except (OSError, UnicodeDecodeError) as e:
+            print(f"WorDuel: could not read {local_path}: {e}", file=sys.stderr)
+    if not fallback_url: return words
+    # The pinned digest only describes the default list
+    digest = DEFAULT_WORDLIST_DIGEST if fallback_url == DEFAULT_WORDLIST_URL else None
     try:
-        ctx = ssl.create_default_context()
-        with urllib.request.urlopen(fallback_url, context=ctx, timeout=5) as resp:
-            for raw in resp:
-                try: w = raw.decode("utf-8").strip().lower()
-                except: continue
-                if w: words.add(w)
-        if words:
-            try:
-                with open(local_path, "w", encoding="utf-8") as f:
-                    for w in sorted(words): f.write(w + "\n")
-            except: pass
-            return words
-    except: pass
-    return words
+        return download_wordlist(fallback_url, local_path, expected_digest=digest)
+    except WordlistDownloadError as e:
+        print(f"WorDuel: word list download failed, playing without a dictionary: {e}", file=sys.stderr)
+        return set()
 
-VALID_WORDS = load_valid_words()
+# ---------------------------------------------------------
+# SHARED DICTIONARY (multi-process deployments)
+# ---------------------------------------------------------
+SHARED_DICT_MAGIC = b"WDSD"
+SHARED_DICT_VERSION = 1
+_SD_HEADER = struct.Struct("<4sII") # magic, version, number of lengths
+_SD_ENTRY = struct.Struct("<IIQ")   # word length, word count, byte offset
+
+class SharedDictionary:
+    """Read-only word set over one packed buffer that many processes can map.
+
+    Words of each length are stored sorted and back to back, so membership is
+    a binary search over the buffer and no process builds its own set. The
+    buffer lives in multiprocessing.shared_memory (publish / attach) or in a
+    file that is mmap'd (write_file / open_file).
+    """
+    def __init__(self, buf, owner=None):
+        self._owner = owner # SharedMemory or mmap that backs buf
+        self._buf = memoryview(buf)
+        magic, version, n = _SD_HEADER.unpack_from(self._buf, 0)
+        if magic != SHARED_DICT_MAGIC or version != SHARED_DICT_VERSION:
+            raise ValueError("not a WorDuel shared dictionary")
+        self._sections = {}
+        for i in range(n):
+            length, count, offset = _SD_ENTRY.unpack_from(self._buf, _SD_HEADER.size + i * _SD_ENTRY.size)
+            self._sections[length] = (count, offset)
+        self._len = sum(c for c, _ in self._sections.values())
+
+    @staticmethod
+    def pack(words):
+        by_length = {}
+        for w in words:
+            if w.isascii() and w.isalpha(): by_length.setdefault(len(w), set()).add(w)
+        lengths = sorted(by_length)
+        offset = _SD_HEADER.size + len(lengths) * _SD_ENTRY.size
+        out = bytearray(_SD_HEADER.pack(SHARED_DICT_MAGIC, SHARED_DICT_VERSION, len(lengths)))
+        sections = []
+        for L in lengths:
+            data = "".join(sorted(by_length[L])).encode("ascii")
+            out += _SD_ENTRY.pack(L, len(by_length[L]), offset)
+            sections.append(data)
+            offset += len(data)
+        for data in sections: out += data
+        return bytes(out)
+
+    @classmethod
+    def publish(cls, words, name=None):
+        """Packs words into a new shared memory block; the caller owns it (close() then unlink())."""
+        from multiprocessing import shared_memory
+        data = cls.pack(words)
+        shm = shared_memory.SharedMemory(name=name, create=True, size=len(data))
+        shm.buf[:len(data)] = data
+        return cls(shm.buf, owner=shm)
+
+    @classmethod
+    def attach(cls, name):
+        """Maps an already published block by name, without copying it.
+
+        On Python < 3.13 an attaching process that is not a child of the
+        publisher may unlink the block when it exits; use the file form there.
+        """
+        from multiprocessing import shared_memory
+        try: shm = shared_memory.SharedMemory(name=name, track=False)
+        except TypeError: shm = shared_memory.SharedMemory(name=name)
+        return cls(shm.buf, owner=shm)
+
+    @classmethod
+    def write_file(cls, words, path):
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f: f.write(cls.pack(words))
+        os.replace(tmp, path)
+
+    @classmethod
+    def open_file(cls, path):
+        import mmap
+        with open(path, "rb") as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls(mm, owner=mm)
+
+    @property
+    def name(self):
+        return getattr(self._owner, "name", None)
+
+    def __contains__(self, word):
+        if not isinstance(word, str) or not word.isascii(): return False
+        section = self._sections.get(len(word))
+        if section is None: return False
+        count, offset = section
+        key, L, buf = word.encode("ascii"), len(word), self._buf
+        lo, hi = 0, count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            p = offset + mid * L
+            cur = buf[p:p + L].tobytes()
+            if cur < key: lo = mid + 1
+            elif cur > key: hi = mid
+            else: return True
+        return False
+
+    def __len__(self):
+        return self._len
+
+    def __iter__(self):
+        for L in sorted(self._sections): yield from self.words_of_length(L)
+
+    def words_of_length(self, length):
+        """Sorted list of every word with this many letters."""
+        section = self._sections.get(length)
+        if section is None: return []
+        count, offset = section
+        raw = self._buf[offset:offset + count * length].tobytes().decode("ascii")
+        return [raw[i * length:(i + 1) * length] for i in range(count)]
+
+    def close(self):
+        self._buf.release()
+        if self._owner is not None: self._owner.close()
+
+    def unlink(self):
+        """Removes a block created by publish(); attached readers keep their mapping."""
+        if hasattr(self._owner, "unlink"): self._owner.unlink()
+
+def words_of_length(length, words=None):
+    """Every alphabetic word of this length from words (default VALID_WORDS)."""
+    words = VALID_WORDS if words is None else words
+    if isinstance(words, SharedDictionary): return words.words_of_length(length)
+    return [w for w in words if len(w) == length and w.isalpha()]
+
+def load_dictionary():
+    """VALID_WORDS for this process: a published shared dictionary if one is named, else wordlist.txt."""
+    source = cli_option("--shared-dict", "WORDUEL_SHARED_DICT")
+    if source:
+        try:
+            return SharedDictionary.open_file(source) if os.path.exists(source) else SharedDictionary.attach(source)
+        except (OSError, ValueError) as e:
+            print(f"WorDuel: could not open shared dictionary {source}: {e}", file=sys.stderr)
+    return load_valid_words()
+
+VALID_WORDS = load_dictionary()
+STARTUP.mark(f"dictionary load ({len(VALID_WORDS)} words)")
 
 class DuelLinkFlow:
     @staticmethod
     def create_initial_link(word_length, secretA):
+        import urllib.parse # Deferred: only needed once a link is made or joined
         payload = f"{word_length}:{secretA}"
         code = DuelLinkFlow._b64_encode(payload)
         return f"friendwordle://load?w={urllib.parse.quote(code)}"
 
     @staticmethod
     def decode_initial_link(link_text):
-        if "w=" in link_text:
-            parsed = urllib.parse.urlparse(link_text)
-            q = urllib.parse.parse_qs(parsed.query)
-            b64 = q["w"][0] if "w" in q else link_text[link_text.find("w=") + 2:]
-        else: b64 = link_text
-        decoded = DuelLinkFlow._b64_decode(b64)
+        decoded = DuelLinkFlow._b64_decode(DuelLinkFlow._link_code(link_text))
         length_s, secret = decoded.split(":", 1)
         return int(length_s), secret
 
     @staticmethod
     def create_return_link(word_length, secretB, attempts_taken, guessed_bool):
+        import urllib.parse
         g = "1" if guessed_bool else "0"
         payload = f"ret:{word_length}:{secretB}:{attempts_taken}:{g}"
         code = DuelLinkFlow._b64_encode(payload)
@@ -105,24 +728,132 @@ class DuelLinkFlow:
 
     @staticmethod
     def decode_return_link(link_text):
-        if "w=" in link_text:
-            parsed = urllib.parse.urlparse(link_text)
-            q = urllib.parse.parse_qs(parsed.query)
-            b64 = q["w"][0] if "w" in q else link_text[link_text.find("w=") + 2:]
-        else: b64 = link_text
-        decoded = DuelLinkFlow._b64_decode(b64)
+        decoded = DuelLinkFlow._b64_decode(DuelLinkFlow._link_code(link_text))
         parts = decoded.split(":", 4)
         return int(parts[1]), parts[2], int(parts[3]), parts[4] == "1"
 
+    @staticmethod
+    def decode_link(link_text):
+        """Either kind of link as a dict ("kind" is "initial" or "return"); ValueError if it is neither."""
+        try:
+            decoded = DuelLinkFlow._b64_decode(DuelLinkFlow._link_code(link_text.strip()))
+            # The kind lives in the payload, not in the visible part of the link
+            if decoded.startswith("ret:"):
+                _, length_s, secret, attempts, guessed = decoded.split(":", 4)
+                return {"kind": "return", "length": int(length_s), "secret": secret,
+                        "attempts": int(attempts), "guessed": guessed == "1"}
+            length_s, secret = decoded.split(":", 1)
+            return {"kind": "initial", "length": int(length_s), "secret": secret}
+        except (ValueError, UnicodeError) as e:
+            raise ValueError(f"not a duel link ({e})") from None
+
+    @staticmethod
+    def problem(link):
+        """Why a decoded link can't be played (None if it can). Needs no Tk, so it can run on a worker."""
+        secret = link["secret"]
+        if not secret.isalpha() or len(secret) != link["length"]: return "Link corrupted: Word length mismatch."
+        if VALID_WORDS and secret not in VALID_WORDS: return "Link contains an invalid secret word. Cannot proceed."
+        if link["kind"] == "return" and not 1 <= link["attempts"] <= MAX_ATTEMPTS + 1: return "Link corrupted: bad attempt count."
+        return None
+
+    @staticmethod
+    def _link_code(link_text):
+        if "w=" not in link_text: return link_text
+        import urllib.parse
+        q = urllib.parse.parse_qs(urllib.parse.urlparse(link_text).query)
+        return q["w"][0] if "w" in q else link_text[link_text.find("w=") + 2:]
+
     @staticmethod
     def _b64_encode(s: str) -> str:
+        import base64
         return base64.urlsafe_b64encode(s.encode("utf-8")).decode("ascii").rstrip("=")
 
     @staticmethod
     def _b64_decode(s: str) -> str:
+        import base64
         padding = "=" * (-len(s) % 4)
         return base64.urlsafe_b64decode((s + padding).encode("ascii")).decode("utf-8")
 
+# Inbox rows in display order (duels waiting on your move first) and their labels
+INBOX_STATES = {"finish": "Finish duel", "challenge": "New challenge", "invalid": "Invalid", "done": "Done"}
+
+class LinkInbox:
+    """Duel links gathered from pasted or copied text, decoded in bulk on the background thread.
+
+    Raw links already seen are never decoded twice, and links with the same decoded
+    payload share one entry.
+    """
+    LINK_RE = re.compile(r"friendwordle://(?:load|ret)\?w=[A-Za-z0-9_%-]+")
+
+    def __init__(self):
+        self.entries = {} # payload key -> entry dict
+        self._seen = set()
+        self._jobs = []
+        self._added = 0
+
+    @classmethod
+    def extract(cls, text):
+        return cls.LINK_RE.findall(text or "")
+
+    @staticmethod
+    def decode_batch(links):
+        """One entry per link, validated. Runs on the worker thread: no Tk in here."""
+        out = []
+        for link in links:
+            try:
+                entry = DuelLinkFlow.decode_link(link)
+                problem = DuelLinkFlow.problem(entry)
+            except ValueError:
+                entry, problem = {"kind": "invalid"}, "Invalid Link"
+            entry["link"] = link
+            entry["problem"] = problem
+            if problem:
+                entry["state"], entry["key"] = "invalid", ("invalid", link)
+            else:
+                entry["state"] = "finish" if entry["kind"] == "return" else "challenge"
+                entry["key"] = (entry["kind"], entry["length"], entry["secret"], entry.get("attempts"), entry.get("guessed"))
+            out.append(entry)
+        return out
+
+    def submit(self, links):
+        """Queues links not seen before for decoding; returns how many were new."""
+        fresh = [l for l in dict.fromkeys(links) if l not in self._seen]
+        if fresh:
+            self._seen.update(fresh)
+            self._jobs.append(get_background_executor().submit(self.decode_batch, fresh))
+        return len(fresh)
+
+    @property
+    def busy(self):
+        return bool(self._jobs)
+
+    def collect(self):
+        """Merges finished decode jobs into the inbox (UI thread); returns how many entries were added."""
+        added = 0
+        for job in [j for j in self._jobs if j.done()]:
+            self._jobs.remove(job)
+            try: batch = job.result()
+            except Exception: continue
+            for entry in batch:
+                if entry["key"] in self.entries: continue
+                self._added += 1
+                entry["order"] = self._added
+                self.entries[entry["key"]] = entry
+                added += 1
+        return added
+
+    def pending(self):
+        """Entries grouped by state (INBOX_STATES order), oldest first within each group."""
+        rank = {s: i for i, s in enumerate(INBOX_STATES)}
+        return sorted(self.entries.values(), key=lambda e: (rank[e["state"]], e["order"]))
+
+    def mark_done(self, entry, summary):
+        entry["state"] = "done"
+        entry["summary"] = summary
+
+    def remove(self, entry):
+        self.entries.pop(entry["key"], None)
+
 class WordleEngine:
     @staticmethod
     def check_guess(guess: str, secret: str):
@@ -140,6 +871,1086 @@ class WordleEngine:
                 counts[g] -= 1
         return result
 
+class TurnScheduler:
+    """Round-robin turn order for local duels that skips finished players.
+
+    Unfinished players form a circular linked list, so both finding the next
+    active player and dropping a finished one are O(1).
+    """
+    def __init__(self, player_ids):
+        self.order = list(player_ids)
+        n = len(self.order)
+        self._next = {pid: self.order[(i + 1) % n] for i, pid in enumerate(self.order)}
+        self._prev = {pid: self.order[i - 1] for i, pid in enumerate(self.order)}
+        self.active = self.order[0] if self.order else None
+
+    def remaining(self):
+        return len(self._next)
+
+    def advance(self):
+        """Moves the turn to the next unfinished player and returns it."""
+        if self.active in self._next: self.active = self._next[self.active]
+        return self.active
+
+    def finish(self, pid):
+        """Removes pid from the rotation. Returns the active player, or None once everyone is done."""
+        if pid not in self._next: return self.active
+        nxt, prv = self._next.pop(pid), self._prev.pop(pid)
+        if nxt == pid:
+            self.active = None
+            return None
+        self._next[prv] = nxt
+        self._prev[nxt] = prv
+        if self.active == pid: self.active = nxt
+        return self.active
+
+# ---------------------------------------------------------
+# BACKGROUND WORK
+# ---------------------------------------------------------
+_background_executor = None
+_rebuild_executor = None
+
+def get_background_executor():
+    """Single shared worker thread for short non-Tk work (bot thinking, avatar and reaction
+    baking, inbox decoding): jobs that a waiting player or turn depends on."""
+    global _background_executor
+    if _background_executor is None:
+        from concurrent.futures import ThreadPoolExecutor # Deferred: most sessions never need it
+        _background_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="worduel-bg")
+    return _background_executor
+
+def get_rebuild_executor():
+    """Worker thread for long rebuilds (leaderboard, letter index, neighbour graph: up to
+    seconds each), kept apart so a bot's move never queues behind one."""
+    global _rebuild_executor
+    if _rebuild_executor is None:
+        from concurrent.futures import ThreadPoolExecutor
+        _rebuild_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="worduel-rebuild")
+    return _rebuild_executor
+
+# ---------------------------------------------------------
+# BOARD CONSTRAINTS, LETTER INDEX & NEIGHBOUR GRAPH
+# ---------------------------------------------------------
+class BoardConstraints:
+    """What a board's feedback so far says about the secret.
+
+    greens: position -> letter; not_at: (position, letter) pairs ruled out;
+    min_count / max_count: letter -> how many times it must / may appear.
+    """
+    def __init__(self, word_length):
+        self.word_length = word_length
+        self.greens = {}
+        self.not_at = set()
+        self.min_count = {}
+        self.max_count = {}
+
+    def add(self, guess, colors):
+        hits = {}
+        for i, (ch, col) in enumerate(zip(guess, colors)):
+            if col == "green": self.greens[i] = ch
+            else: self.not_at.add((i, ch))
+            if col != "grey": hits[ch] = hits.get(ch, 0) + 1
+        for ch, n in hits.items():
+            if n > self.min_count.get(ch, 0): self.min_count[ch] = n
+        for ch, col in zip(guess, colors):
+            # A grey copy means the word has exactly as many as were coloured
+            if col == "grey": self.max_count[ch] = hits.get(ch, 0)
+
+    def violation(self, word):
+        """Hard mode check, O(word length): the first revealed hint word ignores, or None."""
+        for i, ch in self.greens.items():
+            if word[i] != ch: return f"Letter {i + 1} must be {ch.upper()}"
+        counts = {}
+        for ch in word: counts[ch] = counts.get(ch, 0) + 1
+        for ch, k in self.min_count.items():
+            if counts.get(ch, 0) < k:
+                return f"Guess must contain {ch.upper()}" if k == 1 else f"Guess must contain {k} {ch.upper()}s"
+        for ch, k in self.max_count.items():
+            if counts.get(ch, 0) > k:
+                return f"{ch.upper()} is not in the word" if k == 0 else f"Only {k} {ch.upper()} in the word"
+        return None
+
+    @classmethod
+    def from_history(cls, word_length, history):
+        c = cls(word_length)
+        for guess, colors in history: c.add(guess, colors)
+        return c
+
+class LetterIndex:
+    """Bitsets of word ids per (position, letter) and per (letter, minimum count).
+
+    Built once per word length; any BoardConstraints query is then a handful
+    of big-int ANDs. Ids are positions in the sorted word list.
+    """
+    _by_length = {}
+    _pending = {}
+
+    def __init__(self, words):
+        self.words = sorted(words)
+        n = len(self.words)
+        self.all = (1 << n) - 1
+        nbytes = (n + 7) // 8
+        pos_bits, count_bits = {}, {}
+        for wid, w in enumerate(self.words):
+            byte, bit = wid >> 3, 1 << (wid & 7)
+            counts = {}
+            for i, ch in enumerate(w):
+                ba = pos_bits.get((i, ch))
+                if ba is None: ba = pos_bits[(i, ch)] = bytearray(nbytes)
+                ba[byte] |= bit
+                counts[ch] = counts.get(ch, 0) + 1
+            for ch, c in counts.items():
+                for k in range(1, c + 1):
+                    ba = count_bits.get((ch, k))
+                    if ba is None: ba = count_bits[(ch, k)] = bytearray(nbytes)
+                    ba[byte] |= bit
+        self.pos = {k: int.from_bytes(v, "little") for k, v in pos_bits.items()}
+        self.at_least = {k: int.from_bytes(v, "little") for k, v in count_bits.items()}
+
+    @classmethod
+    def for_length(cls, length, words=None):
+        """The index for length, built on first use from VALID_WORDS (or words)."""
+        idx = cls._by_length.get(length)
+        if idx is None:
+            idx = cls._by_length[length] = cls(words_of_length(length, words))
+        return idx
+
+    @classmethod
+    def prefetch(cls, length):
+        """Starts building the index on the rebuild thread; ready() reports when it's done."""
+        if length in cls._by_length or length in cls._pending or not VALID_WORDS: return
+        cls._pending[length] = get_rebuild_executor().submit(cls.for_length, length)
+
+    @classmethod
+    def ready(cls, length):
+        """The index if it has been built, else None (never blocks the caller)."""
+        return cls._by_length.get(length)
+
+    def mask(self, constraints):
+        m = self.all
+        for i, ch in constraints.greens.items(): m &= self.pos.get((i, ch), 0)
+        for key in constraints.not_at: m &= ~self.pos.get(key, 0)
+        for ch, k in constraints.min_count.items(): m &= self.at_least.get((ch, k), 0)
+        for ch, k in constraints.max_count.items(): m &= ~self.at_least.get((ch, k + 1), 0)
+        return m & self.all
+
+    def count(self, constraints):
+        return self.mask(constraints).bit_count()
+
+    def candidates(self, constraints, limit=None):
+        m = self.mask(constraints)
+        out = []
+        data = m.to_bytes((len(self.words) + 7) // 8, "little")
+        for byte_i, b in enumerate(data):
+            while b:
+                low = b & -b
+                out.append(self.words[(byte_i << 3) + low.bit_length() - 1])
+                if limit is not None and len(out) >= limit: return out
+                b ^= low
+        return out
+
+class NeighbourGraph:
+    """Words of one length joined when they differ in exactly one position (light - might - night).
+
+    Built in O(N*L) by wildcard bucketing ("_ight" holds every such word; two different words
+    share at most one bucket) and stored CSR-style: word id i's neighbours are
+    targets[offsets[i]:offsets[i + 1]], with diff_pos giving the position each one differs in.
+    Ids are positions in the sorted word list.
+    """
+    _by_length = {}
+    _pending = {}
+
+    def __init__(self, words):
+        from array import array
+        self.words = sorted(words)
+        self.ids = {w: i for i, w in enumerate(self.words)}
+        n = len(self.words)
+        L = len(self.words[0]) if self.words else 0
+        groups = [] # (position, ids sharing a wildcard there), only buckets with 2+ words
+        for p in range(L):
+            buckets = {}
+            for wid, w in enumerate(self.words): buckets.setdefault(w[:p] + w[p + 1:], []).append(wid)
+            groups.extend((p, g) for g in buckets.values() if len(g) > 1)
+        degree = [0] * n
+        for _, g in groups:
+            for wid in g: degree[wid] += len(g) - 1
+        self.offsets = array("I", [0]) * (n + 1)
+        for i, d in enumerate(degree): self.offsets[i + 1] = self.offsets[i] + d
+        fill = self.offsets[:-1]
+        self.targets = array("I", [0]) * self.offsets[n]
+        self.diff_pos = array("B", [0]) * self.offsets[n]
+        for p, g in groups:
+            for a in g:
+                k = fill[a]
+                for b in g:
+                    if b != a:
+                        self.targets[k], self.diff_pos[k] = b, p
+                        k += 1
+                fill[a] = k
+
+    @classmethod
+    def for_length(cls, length, words=None):
+        """The graph for length, built on first use from VALID_WORDS (or words)."""
+        graph = cls._by_length.get(length)
+        if graph is None:
+            graph = cls._by_length[length] = cls(words_of_length(length, words))
+        return graph
+
+    @classmethod
+    def prefetch(cls, length):
+        """Starts building the graph on the rebuild thread; ready() reports when it's done."""
+        if length in cls._by_length or length in cls._pending or not VALID_WORDS: return
+        cls._pending[length] = get_rebuild_executor().submit(cls.for_length, length)
+
+    @classmethod
+    def ready(cls, length):
+        """The graph if it has been built, else None (never blocks the caller)."""
+        return cls._by_length.get(length)
+
+    def degree(self, word):
+        i = self.ids.get(word)
+        return 0 if i is None else self.offsets[i + 1] - self.offsets[i]
+
+    def neighbours(self, word, position=None):
+        """Words one letter away from word (only those differing at position, if given)."""
+        i = self.ids.get(word)
+        if i is None: return []
+        lo, hi = self.offsets[i], self.offsets[i + 1]
+        return [self.words[self.targets[k]] for k in range(lo, hi) if position is None or self.diff_pos[k] == position]
+
+    def trap(self, guess, colors, constraints):
+        """(pattern, words) when guess is green everywhere but one spot and several words still
+        fill that spot ("li_ht": might, night, sight...), else None."""
+        open_spots = [i for i, c in enumerate(colors) if c != "green"]
+        if len(open_spots) != 1: return None
+        p = open_spots[0]
+        fits = [w for w in self.neighbours(guess, p)
+                if (p, w[p]) not in constraints.not_at and constraints.violation(w) is None]
+        if len(fits) < TRAP_MIN_WORDS: return None
+        return guess[:p] + "_" + guess[p + 1:], fits
+
+def _word_list(words):
+    # Alphabetical: any order built from the answer pool would put the secret first
+    words = sorted(words)
+    more = len(words) - TRAP_SHOWN_WORDS
+    return ", ".join(w.upper() for w in words[:TRAP_SHOWN_WORDS]) + (f" +{more} more" if more > 0 else "")
+
+def trap_warning(pattern, words, attempts_left):
+    """Status line for a board stuck on a trap, from NeighbourGraph.trap(). Only the count:
+    naming the words mid-game would narrow the secret down for the player."""
+    short = f" with {attempts_left} guess{'es' if attempts_left != 1 else ''} left" if len(words) > attempts_left else ""
+    return f"Trap! {len(words)} words fit {pattern.upper()}{short}"
+
+def lookalike_note(word):
+    """Why word was hard, for the result card; None if it has few look-alikes or the graph isn't built yet."""
+    graph = NeighbourGraph.ready(len(word))
+    if graph is None or graph.degree(word) < TRAP_MIN_WORDS: return None
+    near = graph.neighbours(word)
+    return f"{word.upper()} has {len(near)} one-letter look-alikes: {_word_list(near)}"
+
+class WordSolver:
+    """Candidate-filtering solver: keeps every dictionary word still consistent with the feedback so far."""
+    def __init__(self, word_length, words=None, rng=None):
+        if words is None:
+            words = VALID_WORDS or [w for ws in WORDS_BY_LENGTH.values() for w in ws]
+        self.word_length = word_length
+        self.candidates = sorted(words_of_length(word_length, words))
+        self.rng = rng or random.Random()
+
+    def observe(self, guess, colors):
+        """Drops every candidate that would not have produced these colors for this guess."""
+        colors = list(colors)
+        self.candidates = [w for w in self.candidates if WordleEngine.check_guess(guess, w) == colors]
+
+    def best_guess(self, max_candidates=40, time_budget=None, strategy="expected"):
+        """Picks the candidate that best splits the others according to strategy.
+
+        "expected" minimises the expected group left, "entropy" maximises the
+        information gained, "minimax" minimises the worst-case group and
+        "random" just picks any consistent word. Only max_candidates words
+        (sampled) are weighed, and scoring stops once time_budget seconds have
+        passed, which is what makes weaker bots weaker.
+        """
+        cands = self.candidates
+        if not cands: return None
+        if strategy == "random" or len(cands) <= 2 or max_candidates <= 1: return self.rng.choice(cands)
+        pool = cands if len(cands) <= max_candidates else self.rng.sample(cands, max_candidates)
+        deadline = None if time_budget is None else time.perf_counter() + time_budget
+        best, best_score = pool[0], None
+        for g in pool:
+            buckets = {}
+            for w in pool:
+                key = tuple(WordleEngine.check_guess(g, w))
+                buckets[key] = buckets.get(key, 0) + 1
+            if strategy == "minimax": score = max(buckets.values())
+            elif strategy == "entropy": score = sum(c * math.log(c) for c in buckets.values()) # lower = more information
+            else: score = sum(c * c for c in buckets.values()) # ~ expected candidates left after guessing g
+            if best_score is None or score < best_score: best, best_score = g, score
+            if deadline is not None and time.perf_counter() > deadline: break
+        return best
+
+# ---------------------------------------------------------
+# DIFFICULTY RATINGS
+# ---------------------------------------------------------
+# difficulty.bin (written by difficulty.py) rates every answer in WORDS_BY_LENGTH: the
+# reference solver's expected guesses plus a penalty per one-letter neighbour ("light" has
+# might/night/sight/...). Layout: header, one entry per length, then uint16 centi-scores in
+# WORDS_BY_LENGTH order. Each entry carries a digest of its answer pool, so a length whose
+# answers changed since the table was built is simply not rated.
+DIFFICULTY_FILE = "difficulty.bin"
+DIFFICULTY_MAGIC = b"WDDT"
+DIFFICULTY_VERSION = 1
+_DT_HEADER = struct.Struct("<4sII") # magic, version, number of lengths
+_DT_ENTRY = struct.Struct("<II8s")  # word length, word count, answer pool digest
+NEIGHBOUR_WEIGHT = 0.05 # Expected guesses added per one-letter neighbour
+DIFFICULTY_TIERS = ("Any", "Easy", "Medium", "Hard")
+TIER_CENTERS = {"Easy": 1 / 6, "Medium": 0.5, "Hard": 5 / 6} # Where each tier aims, as a rank percentile
+TIER_SPREAD = 0.2 # Width of each tier's weighting around its center
+
+def answer_pool_digest(words):
+    import hashlib
+    return hashlib.sha256("\n".join(words).encode("utf-8")).digest()[:8]
+
+def difficulty_score(expected_guesses, neighbours):
+    return expected_guesses + NEIGHBOUR_WEIGHT * neighbours
+
+def pack_difficulty(scores_by_length, pools=None):
+    """Table bytes for {length: [score per answer, in pool order]}."""
+    pools = pools or WORDS_BY_LENGTH
+    out = bytearray(_DT_HEADER.pack(DIFFICULTY_MAGIC, DIFFICULTY_VERSION, len(scores_by_length)))
+    for L, scores in sorted(scores_by_length.items()):
+        out += _DT_ENTRY.pack(L, len(scores), answer_pool_digest(pools[L]))
+    for L, scores in sorted(scores_by_length.items()):
+        out += struct.pack(f"<{len(scores)}H", *(min(0xFFFF, round(s * 100)) for s in scores))
+    return bytes(out)
+
+def unpack_difficulty(data, pools=None):
+    """{length: [score]} for every length whose answer pool still matches; raises ValueError on a bad table."""
+    pools = pools or WORDS_BY_LENGTH
+    try:
+        magic, version, n = _DT_HEADER.unpack_from(data, 0)
+        if magic != DIFFICULTY_MAGIC or version != DIFFICULTY_VERSION: raise ValueError("not a difficulty table")
+        entries = [_DT_ENTRY.unpack_from(data, _DT_HEADER.size + i * _DT_ENTRY.size) for i in range(n)]
+        pos = _DT_HEADER.size + n * _DT_ENTRY.size
+        out = {}
+        for L, count, digest in entries:
+            scores = struct.unpack_from(f"<{count}H", data, pos)
+            pos += 2 * count
+            if L in pools and answer_pool_digest(pools[L]) == digest: out[L] = [s / 100 for s in scores]
+        return out
+    except struct.error as e:
+        raise ValueError(f"truncated difficulty table: {e}")
+
+class AliasSampler:
+    """Walker's alias method: O(n) to build, O(1) per weighted draw."""
+    def __init__(self, weights):
+        n = len(weights)
+        total = float(sum(weights))
+        scaled = [w * n / total for w in weights]
+        self.prob, self.alias = [1.0] * n, list(range(n))
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            s, l = small.pop(), large.pop()
+            self.prob[s], self.alias[s] = scaled[s], l
+            scaled[l] -= 1.0 - scaled[s]
+            (small if scaled[l] < 1.0 else large).append(l)
+        # Whatever is left is 1.0 up to rounding
+
+    def sample(self, rng=random):
+        i = int(rng.random() * len(self.prob))
+        return i if rng.random() < self.prob[i] else self.alias[i]
+
+class DifficultyPicker:
+    """Picks secrets by tier: each tier weights every rated answer by how close its difficulty
+    rank is to the tier's center, with one alias table per (length, tier) built on first use."""
+    def __init__(self, scores_by_length, pools=None):
+        self.pools = pools or WORDS_BY_LENGTH
+        self.scores = scores_by_length
+        self._samplers = {}
+
+    def rated(self, length):
+        return length in self.scores
+
+    def _sampler(self, length, tier):
+        key = (length, tier)
+        if key not in self._samplers:
+            scores = self.scores[length]
+            order = sorted(range(len(scores)), key=lambda i: scores[i])
+            pct = [0.0] * len(scores)
+            for r, i in enumerate(order): pct[i] = (r + 0.5) / len(scores)
+            center = TIER_CENTERS[tier]
+            self._samplers[key] = AliasSampler([math.exp(-((p - center) / TIER_SPREAD) ** 2) for p in pct])
+        return self._samplers[key]
+
+    def pick(self, length, tier="Any", rng=random):
+        pool = self.pools[length]
+        if tier not in TIER_CENTERS or not self.rated(length): return rng.choice(pool)
+        return pool[self._sampler(length, tier).sample(rng)]
+
+_difficulty_picker = None
+
+def get_difficulty_picker(path=DIFFICULTY_FILE):
+    """Shared DifficultyPicker; the table is read on first use. Unrated lengths fall back to random.choice."""
+    global _difficulty_picker
+    if _difficulty_picker is None:
+        scores = {}
+        try:
+            with open(path, "rb") as f: scores = unpack_difficulty(f.read())
+        except (OSError, ValueError) as e:
+            if not isinstance(e, FileNotFoundError): print(f"WorDuel: ignoring {path}: {e}", file=sys.stderr)
+        _difficulty_picker = DifficultyPicker(scores)
+    return _difficulty_picker
+
+# ---------------------------------------------------------
+# REPLAYS
+# ---------------------------------------------------------
+# A replay is REPLAY_MAGIC followed by events. Every event is a varint type, a varint
+# of milliseconds since the previous event, then its fields (varints, or a varint
+# length + UTF-8 bytes for strings).
+REPLAY_MAGIC = b"WDR1"
+REPLAY_DIR = cli_option("--record", "WORDUEL_RECORD_DIR")
+REPLAY_KINDS = ("single", "duel")
+EV_START, EV_GUESS, EV_TURN, EV_RESULT = 1, 2, 3, 4
+
+def _put_varint(buf, n):
+    while True:
+        b = n & 0x7F
+        n >>= 7
+        if not n:
+            buf.append(b)
+            return
+        buf.append(b | 0x80)
+
+def _get_varint(data, pos):
+    n = shift = 0
+    while True:
+        b = data[pos]
+        pos += 1
+        n |= (b & 0x7F) << shift
+        if not b & 0x80: return n, pos
+        shift += 7
+
+def _put_str(buf, s):
+    raw = s.encode("utf-8")
+    _put_varint(buf, len(raw))
+    buf += raw
+
+def _get_str(data, pos):
+    n, pos = _get_varint(data, pos)
+    if pos + n > len(data): raise IndexError("string runs past end of replay")
+    return bytes(data[pos:pos + n]).decode("utf-8"), pos + n
+
+class ReplayRecorder:
+    """Records one game or duel. Player numbers are 0-based seat indices."""
+    def __init__(self, kind, word_length, secrets, names=None, clock=time.monotonic):
+        self.kind = kind
+        self.buf = bytearray(REPLAY_MAGIC)
+        self._clock = clock
+        self._last = clock()
+        names = list(names or [f"Player {i + 1}" for i in range(len(secrets))])
+        self._event(EV_START)
+        _put_varint(self.buf, REPLAY_KINDS.index(kind))
+        _put_varint(self.buf, word_length)
+        _put_varint(self.buf, len(secrets))
+        for secret, name in zip(secrets, names):
+            _put_str(self.buf, secret)
+            _put_str(self.buf, name)
+
+    @classmethod
+    def start(cls, kind, word_length, secrets, names=None):
+        """A recorder if recording is on (--record DIR or WORDUEL_RECORD_DIR), else None."""
+        return cls(kind, word_length, secrets, names) if REPLAY_DIR else None
+
+    def _event(self, ev):
+        now = self._clock()
+        _put_varint(self.buf, ev)
+        _put_varint(self.buf, max(0, int((now - self._last) * 1000)))
+        self._last = now
+
+    def guess(self, player, word):
+        self._event(EV_GUESS)
+        _put_varint(self.buf, player)
+        _put_str(self.buf, word)
+
+    def turn(self, player):
+        self._event(EV_TURN)
+        _put_varint(self.buf, player)
+
+    def result(self, player, attempts, guessed):
+        self._event(EV_RESULT)
+        _put_varint(self.buf, player)
+        _put_varint(self.buf, attempts)
+        _put_varint(self.buf, 1 if guessed else 0)
+
+    def save(self, directory=None):
+        """Writes the replay into directory (default REPLAY_DIR) and returns its path."""
+        directory = directory or REPLAY_DIR
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"{time.strftime('%Y%m%d-%H%M%S')}-{self.kind}-{time.time_ns() % 10**9:09d}.wdr")
+        with open(path, "wb") as f: f.write(self.buf)
+        return path
+
+def decode_replay(data):
+    """Parses replay bytes into a dict; events are (t_ms since start, type, fields tuple)."""
+    if not data.startswith(REPLAY_MAGIC): raise ValueError("not a WorDuel replay")
+    pos, t, events, header = len(REPLAY_MAGIC), 0, [], None
+    try:
+        while pos < len(data):
+            ev, pos = _get_varint(data, pos)
+            dt, pos = _get_varint(data, pos)
+            t += dt
+            if ev == EV_START:
+                kind, pos = _get_varint(data, pos)
+                length, pos = _get_varint(data, pos)
+                n, pos = _get_varint(data, pos)
+                secrets, names = [], []
+                for _ in range(n):
+                    secret, pos = _get_str(data, pos)
+                    name, pos = _get_str(data, pos)
+                    secrets.append(secret)
+                    names.append(name)
+                header = {"kind": REPLAY_KINDS[kind], "word_length": length, "secrets": secrets, "names": names}
+            elif ev == EV_GUESS:
+                player, pos = _get_varint(data, pos)
+                word, pos = _get_str(data, pos)
+                events.append((t, ev, (player, word)))
+            elif ev == EV_TURN:
+                player, pos = _get_varint(data, pos)
+                events.append((t, ev, (player,)))
+            elif ev == EV_RESULT:
+                player, pos = _get_varint(data, pos)
+                attempts, pos = _get_varint(data, pos)
+                guessed, pos = _get_varint(data, pos)
+                events.append((t, ev, (player, attempts, guessed == 1)))
+            else: raise ValueError(f"unknown replay event {ev}")
+    except IndexError as e:
+        raise ValueError("truncated replay") from e
+    if header is None: raise ValueError("replay has no start event")
+    header["events"] = events
+    return header
+
+def replay_headless(replay):
+    """Feeds a decoded replay back through WordleEngine at full speed.
+
+    Returns {"results": {player: (attempts, guessed)}, "mismatches": [...]}; a
+    mismatch means a recorded result no longer matches what the engine says.
+    """
+    secrets = replay["secrets"]
+    attempts = [0] * len(secrets)
+    solved = [None] * len(secrets)
+    mismatches = []
+    for t, ev, fields in replay["events"]:
+        if ev == EV_GUESS:
+            player, word = fields
+            attempts[player] += 1
+            colors = WordleEngine.check_guess(word, secrets[player])
+            if solved[player] is None and all(c == "green" for c in colors): solved[player] = attempts[player]
+        elif ev == EV_RESULT:
+            player, rec_attempts, rec_guessed = fields
+            got = (solved[player], True) if solved[player] else (MAX_ATTEMPTS + 1, False)
+            if got != (rec_attempts, rec_guessed):
+                mismatches.append({"t_ms": t, "player": player, "recorded": (rec_attempts, rec_guessed), "engine": got})
+    results = {p: ((solved[p], True) if solved[p] else (MAX_ATTEMPTS + 1, False)) for p in range(len(secrets))}
+    return {"results": results, "mismatches": mismatches}
+
+# ---------------------------------------------------------
+# RATINGS & LEADERBOARD
+# ---------------------------------------------------------
+# Every finished duel (local or link) is appended to the history file, which is
+# HISTORY_MAGIC followed by one self-contained record per duel: players, unix time and
+# kind ("<BIB"), then per seat a length-prefixed UTF-8 name and one result byte. The
+# result byte is the attempts, plus 0x80 if the word was missed, so a lower byte is
+# always the better result. Ratings are Elo, updated pairwise: with n players each one
+# plays n - 1 virtual matches (better result wins, equal results draw) at K / (n - 1).
+# Bots are rated per level, and link duel opponents as "Friend" (links do not carry a
+# name). The history is the source of truth: ratings are rebuilt from it on first use.
+RATINGS_FILE = cli_option("--ratings", "WORDUEL_RATINGS") or "duel_history.wdh"
+HISTORY_MAGIC = b"WDH1"
+_DUEL_HEAD = struct.Struct("<BIB") # players, unix time, kind
+DUEL_KINDS = ("local", "link")
+MISSED = 0x80 # Result byte flag: the word was not guessed
+ELO_START = 1500
+ELO_K = 32
+LEADERBOARD_SIZE = 10 # Rows on the leaderboard screen
+
+class _RankNode:
+    __slots__ = ("key", "prio", "left", "right", "size")
+
+    def __init__(self, key, prio):
+        self.key, self.prio = key, prio
+        self.left = self.right = None
+        self.size = 1
+
+    def fix(self):
+        self.size = 1 + (self.left.size if self.left else 0) + (self.right.size if self.right else 0)
+
+class RankTree:
+    """Order-statistic treap: insert, remove, rank and select in O(log n) expected,
+    top-K in O(log n + K). Keys must be unique and comparable."""
+    def __init__(self, keys=(), rng=None):
+        self.rng = rng or random.Random()
+        self.root = self._build(sorted(keys))
+
+    def __len__(self):
+        return self.root.size if self.root else 0
+
+    def _build(self, keys):
+        # O(n) Cartesian tree over sorted keys: the stack holds the right spine
+        stack = []
+        for k in keys:
+            node, last = _RankNode(k, self.rng.random()), None
+            while stack and stack[-1].prio < node.prio: last = stack.pop()
+            node.left = last
+            if stack: stack[-1].right = node
+            stack.append(node)
+        if not stack: return None
+        root = stack[0]
+        order, todo = [], [root] # Sizes bottom-up
+        while todo:
+            n = todo.pop()
+            order.append(n)
+            if n.left: todo.append(n.left)
+            if n.right: todo.append(n.right)
+        for n in reversed(order): n.fix()
+        return root
+
+    @staticmethod
+    def _split(n, key, inclusive=False):
+        """(keys before key, the rest); key itself goes left if inclusive."""
+        if n is None: return None, None
+        if n.key < key or (inclusive and n.key == key):
+            n.right, right = RankTree._split(n.right, key, inclusive)
+            n.fix()
+            return n, right
+        left, n.left = RankTree._split(n.left, key, inclusive)
+        n.fix()
+        return left, n
+
+    @staticmethod
+    def _merge(a, b):
+        if a is None or b is None: return a or b
+        if a.prio > b.prio:
+            a.right = RankTree._merge(a.right, b)
+            a.fix()
+            return a
+        b.left = RankTree._merge(a, b.left)
+        b.fix()
+        return b
+
+    def insert(self, key):
+        left, right = self._split(self.root, key)
+        self.root = self._merge(self._merge(left, _RankNode(key, self.rng.random())), right)
+
+    def remove(self, key):
+        left, right = self._split(self.root, key)
+        _, right = self._split(right, key, inclusive=True)
+        self.root = self._merge(left, right)
+
+    def rank(self, key):
+        """How many keys sort before key."""
+        n, r = self.root, 0
+        while n:
+            if key <= n.key: n = n.left
+            else:
+                r += 1 + (n.left.size if n.left else 0)
+                n = n.right
+        return r
+
+    def select(self, i):
+        """The key at 0-based position i."""
+        for key in self.slice(i, i + 1): return key
+        raise IndexError(i)
+
+    def slice(self, start, stop):
+        """Keys at positions start..stop-1, in order."""
+        stack, n, i = [], self.root, start
+        while n: # Path to position start, keeping only the nodes still ahead of it
+            ls = n.left.size if n.left else 0
+            if i < ls:
+                stack.append(n)
+                n = n.left
+            elif i == ls:
+                stack.append(n)
+                break
+            else:
+                i -= ls + 1
+                n = n.right
+        for _ in range(max(0, stop - start)):
+            if not stack: return
+            n = stack.pop()
+            yield n.key
+            n = n.right
+            while n:
+                stack.append(n)
+                n = n.left
+
+def _history_name(name):
+    # Names are stored with a one-byte length
+    return name.encode("utf-8")[:255].decode("utf-8", "ignore")
+
+def result_byte(attempts, guessed):
+    return attempts if guessed else MISSED | attempts
+
+def elo_deltas(ratings, results, k=ELO_K):
+    """Rating change per name for one duel; results is [(name, result_byte)]."""
+    score = {}
+    for name, r in results: score.setdefault(name, r) # A name seated twice plays once
+    names = list(score)
+    rs = [ratings.get(name, ELO_START) for name in names]
+    sc = [score[name] for name in names]
+    ds = [0.0] * len(names)
+    for i in range(len(names)):
+        for j in range(i + 1, len(names)):
+            # Each pair once: what i gains over expectation, j loses
+            d = (1.0 if sc[i] < sc[j] else 0.5 if sc[i] == sc[j] else 0.0) - 1 / (1 + 10 ** ((rs[j] - rs[i]) / 400))
+            ds[i] += d
+            ds[j] -= d
+    per_match = k / (len(names) - 1) if len(names) > 1 else 0.0
+    return {name: per_match * d for name, d in zip(names, ds)}
+
+def duel_winner(results):
+    """The one name with the best result, or None for a tie or when nobody guessed."""
+    best = min(r for _, r in results)
+    won = {name for name, r in results if r == best}
+    return won.pop() if not best & MISSED and len(won) == 1 else None
+
+def pack_duel(results, kind="local", when=None):
+    """History record for [(name, result_byte)]."""
+    out = bytearray(_DUEL_HEAD.pack(len(results), int(time.time() if when is None else when), DUEL_KINDS.index(kind)))
+    for name, r in results:
+        nb = name.encode("utf-8")
+        out.append(len(nb))
+        out += nb
+        out.append(r)
+    return bytes(out)
+
+def replay_history(data, ratings=None):
+    """Runs Elo over a whole history: ({name: rating}, {name: duels}, {name: wins}, end).
+    Names stay bytes until the end and two-player duels skip elo_deltas: at a million
+    duels this loop is the whole cost of a recompute. A torn last record (an interrupted
+    write) is skipped; end is the offset just past the last complete record."""
+    ratings, games, wins = {} if ratings is None else ratings, {}, {}
+    if len(data) < len(HISTORY_MAGIC) and HISTORY_MAGIC.startswith(data): return ratings, games, wins, 0
+    if not data.startswith(HISTORY_MAGIC): raise ValueError("not a duel history")
+    get, pos, end, head = ratings.get, len(HISTORY_MAGIC), len(data), _DUEL_HEAD.size
+    while pos < end:
+        try: # Indexing past the end means the last record is torn
+            n, p = data[pos], pos + head
+            if n == 2:
+                q = p + 1 + data[p]
+                a, sa = data[p + 1:q], data[q]
+                p = q + 2 + data[q + 1]
+                b, sb = data[q + 2:p], data[p]
+                pos = p + 1
+            else:
+                seats = []
+                for _ in range(n):
+                    q = p + 1 + data[p]
+                    seats.append((data[p + 1:q], data[q]))
+                    p = q + 1
+                pos = p
+        except IndexError: break
+        if n == 2 and a != b:
+            ra, rb = get(a, ELO_START), get(b, ELO_START)
+            d = ELO_K * ((1.0 if sa < sb else 0.5 if sa == sb else 0.0) - 1 / (1 + 10 ** ((rb - ra) / 400)))
+            ratings[a], ratings[b] = ra + d, rb - d
+            games[a], games[b] = games.get(a, 0) + 1, games.get(b, 0) + 1
+            if sa != sb and min(sa, sb) < MISSED:
+                w = a if sa < sb else b
+                wins[w] = wins.get(w, 0) + 1
+            continue
+        if n == 2: seats = [(a, sa), (b, sb)]
+        for name, d in elo_deltas(ratings, seats).items():
+            ratings[name] = get(name, ELO_START) + d
+            games[name] = games.get(name, 0) + 1
+        w = duel_winner(seats) if seats else None
+        if w is not None: wins[w] = wins.get(w, 0) + 1
+    return ratings, games, wins, pos
+
+class Leaderboard:
+    """Elo ratings plus a RankTree of (-rating, name), so rank and top-K never sort."""
+    def __init__(self, path=None):
+        self.path = path
+        self.ratings, self.games, self.wins = {}, {}, {}
+        self.tree = RankTree()
+        self._torn = None # (end of the last complete record, file size) if the history ends mid-record
+
+    @classmethod
+    def recompute(cls, path, data=None):
+        """Replays the whole history (path, or its bytes) and bulk-builds the tree."""
+        board = cls(path)
+        if data is None:
+            try:
+                with open(path, "rb") as f: data = f.read()
+            except FileNotFoundError: data = b""
+        with METRICS.timer("ratings_recompute_ms"):
+            decode = lambda d: {k.decode("utf-8", "replace"): v for k, v in d.items()}
+            *stats, end = replay_history(data)
+            board.ratings, board.games, board.wins = map(decode, stats)
+            if end < len(data): board._torn = (end, len(data))
+            board.tree = RankTree((-r, name) for name, r in board.ratings.items())
+        return board
+
+    def record(self, results, kind="local"):
+        """Applies one duel, [(name, attempts, guessed)], incrementally (O(players^2 +
+        players log n)), appends it to the history and returns {name: rating change}, keyed
+        by the names as stored (cut to 255 bytes by _history_name)."""
+        results = [(_history_name(name), result_byte(attempts, guessed)) for name, attempts, guessed in results]
+        deltas = elo_deltas(self.ratings, results)
+        for name, d in deltas.items():
+            old = self.ratings.get(name)
+            if old is not None: self.tree.remove((-old, name))
+            self.ratings[name] = (ELO_START if old is None else old) + d
+            self.tree.insert((-self.ratings[name], name))
+            self.games[name] = self.games.get(name, 0) + 1
+        winner = duel_winner(results)
+        if winner is not None: self.wins[winner] = self.wins.get(winner, 0) + 1
+        if self.path:
+            try:
+                with open(self.path, "ab") as f:
+                    if self._torn is not None:
+                        # Cut the torn record off first, or this one would be read as its tail.
+                        # Only if nobody has appended since we read the file.
+                        end, size = self._torn
+                        self._torn = None
+                        if f.tell() == size:
+                            f.truncate(end)
+                            f.seek(end)
+                    # One write per duel, so games sharing the file never interleave records
+                    f.write((HISTORY_MAGIC if f.tell() == 0 else b"") + pack_duel(results, kind))
+            except OSError as e:
+                print(f"WorDuel: could not save duel result to {self.path}: {e}", file=sys.stderr)
+        return deltas
+
+    def rank(self, name):
+        """1-based leaderboard position, or None for an unrated name."""
+        r = self.ratings.get(name)
+        return None if r is None else self.tree.rank((-r, name)) + 1
+
+    def top(self, k=LEADERBOARD_SIZE, start=0):
+        """[(place, name, rating, games, wins)] for places start+1 .. start+k."""
+        return [(start + i + 1, name, -neg, self.games.get(name, 0), self.wins.get(name, 0))
+                for i, (neg, name) in enumerate(self.tree.slice(start, start + k))]
+
+    def around(self, name, k=LEADERBOARD_SIZE):
+        """k rows centered on name (the top k if name is unrated)."""
+        r = self.rank(name)
+        start = 0 if r is None else max(0, min(r - 1 - k // 2, len(self.tree) - k))
+        return self.top(k, start)
+
+_leaderboard = None
+_leaderboard_pending = None
+
+def _load_leaderboard():
+    try: return Leaderboard.recompute(RATINGS_FILE)
+    except (OSError, ValueError) as e:
+        print(f"WorDuel: ignoring {RATINGS_FILE}: {e}", file=sys.stderr)
+        return Leaderboard() # Keeps ratings for this session without touching the file
+
+def prefetch_leaderboard():
+    """Starts rebuilding the ratings from RATINGS_FILE on the rebuild thread (seconds for a big history)."""
+    global _leaderboard_pending
+    if _leaderboard is None and _leaderboard_pending is None:
+        _leaderboard_pending = get_rebuild_executor().submit(_load_leaderboard)
+
+def get_leaderboard():
+    """The shared Leaderboard once it has been rebuilt, else None (never blocks the caller)."""
+    global _leaderboard
+    if _leaderboard is None:
+        prefetch_leaderboard()
+        if _leaderboard_pending.done(): _leaderboard = _leaderboard_pending.result()
+    return _leaderboard
+
+# ---------------------------------------------------------
+# DUEL BROADCAST (SPECTATORS)
+# ---------------------------------------------------------
+# A running local duel can be watched from other processes on this machine: connect to
+# 127.0.0.1:PORT and read one JSON object per line. The first line is a "snapshot" of the
+# whole duel; after that come "start", "guess", "finish" and "over" events. A spectator
+# that falls behind gets a fresh "snapshot" in place of the events it missed.
+BROADCAST_PORT = cli_option("--broadcast", "WORDUEL_BROADCAST") # Off unless set
+BROADCAST_QUEUE_LIMIT = 64  # Messages queued per spectator before its backlog is coalesced
+BROADCAST_STALL_S = 10      # A spectator that accepts no bytes for this long is dropped
+BROADCAST_MAX_CLIENTS = 512
+
+def _encode_event(event):
+    import json
+    return (json.dumps(event, separators=(",", ":")) + "\n").encode("utf-8")
+
+class _Spectator:
+    __slots__ = ("sock", "queue", "out", "stalled_since")
+    def __init__(self, sock, first):
+        from collections import deque
+        self.sock = sock
+        self.queue = deque([first]) # Encoded messages not yet handed to the socket
+        self.out = b""              # Bytes taken from the queue but not yet sent
+        self.stalled_since = None
+
+class DuelBroadcaster:
+    """Fans the local duel out to read-only spectators as JSON lines over 127.0.0.1.
+
+    publish() runs on the Tk thread: it folds the event into the duel state, encodes it
+    once and appends the bytes to every spectator's queue. All socket work happens on one
+    network thread. Queues hold at most BROADCAST_QUEUE_LIMIT messages; past that the
+    backlog is replaced by a single snapshot. Spectators that stop reading are dropped.
+    """
+    def __init__(self, port=0, host="127.0.0.1"):
+        import selectors, socket, threading
+        self.state = None
+        self.clients = {} # socket -> _Spectator
+        self.stats = {"published": 0, "coalesced": 0, "dropped": 0, "spectators": 0}
+        self._lock = threading.Lock()
+        self._closed = False
+        self._sel = selectors.DefaultSelector()
+        self._server = socket.create_server((host, port))
+        self._server.setblocking(False)
+        self.port = self._server.getsockname()[1]
+        self._wake_r, self._wake_w = socket.socketpair()
+        self._wake_r.setblocking(False)
+        self._wake_w.setblocking(False)
+        self._sel.register(self._server, selectors.EVENT_READ)
+        self._sel.register(self._wake_r, selectors.EVENT_READ)
+        self._thread = threading.Thread(target=self._run, name="worduel-broadcast", daemon=True)
+        self._thread.start()
+
+    # Tk thread
+    def publish(self, kind, **fields):
+        with METRICS.timer("broadcast_publish_ms"):
+            msg = _encode_event({"type": kind, **fields})
+            snap = None
+            with self._lock:
+                self._apply(kind, fields)
+                for c in self.clients.values():
+                    if len(c.queue) < BROADCAST_QUEUE_LIMIT:
+                        c.queue.append(msg)
+                        continue
+                    # Too far behind: the snapshot already includes this event
+                    if snap is None: snap = self._snapshot()
+                    c.queue.clear()
+                    c.queue.append(snap)
+                    self.stats["coalesced"] += 1
+                    METRICS.inc("broadcast_coalesced")
+                self.stats["published"] += 1
+            self._wake()
+
+    def _apply(self, kind, f):
+        if kind == "start":
+            self.state = {"names": f["names"], "length": f["length"], "boards": [[] for _ in f["names"]],
+                          "results": [None] * len(f["names"]), "active": f.get("active"), "over": False, "secrets": None}
+            return
+        s = self.state
+        if s is None: return
+        if kind == "guess": s["boards"][f["player"]].append([f["word"], f["colors"]])
+        elif kind == "finish": s["results"][f["player"]] = [f["attempts"], f["guessed"]]
+        elif kind == "over": s.update(over=True, secrets=f["secrets"], ranking=f["ranking"])
+        if "active" in f: s["active"] = f["active"]
+
+    def _snapshot(self):
+        return _encode_event({"type": "snapshot", "duel": self.state})
+
+    def _wake(self):
+        try: self._wake_w.send(b"\0")
+        except (BlockingIOError, OSError): pass # Already awake, or closing
+
+    def close(self):
+        self._closed = True
+        self._wake()
+        self._thread.join(timeout=2)
+
+    # Network thread
+    def _run(self):
+        import selectors
+        try:
+            while not self._closed:
+                for key, mask in self._sel.select(timeout=1.0):
+                    if key.fileobj is self._server: self._accept()
+                    elif key.fileobj is self._wake_r:
+                        try:
+                            while self._wake_r.recv(4096): pass
+                        except BlockingIOError: pass
+                    elif mask & selectors.EVENT_READ: self._readable(key.fileobj)
+                now = time.monotonic()
+                for sock in list(self.clients): self._flush(sock, now)
+        finally:
+            for sock in list(self.clients): self._drop(sock, count=False)
+            self._sel.close()
+            for s in (self._server, self._wake_r, self._wake_w): s.close()
+
+    def _accept(self):
+        import selectors
+        while True:
+            try: sock, _ = self._server.accept()
+            except (BlockingIOError, OSError): return
+            if len(self.clients) >= BROADCAST_MAX_CLIENTS:
+                sock.close()
+                continue
+            sock.setblocking(False)
+            with self._lock:
+                self.clients[sock] = _Spectator(sock, self._snapshot())
+                self.stats["spectators"] = len(self.clients)
+            self._sel.register(sock, selectors.EVENT_READ)
+
+    def _readable(self, sock):
+        # Spectators have nothing to say; reading only notices when they hang up
+        try: data = sock.recv(4096)
+        except BlockingIOError: return
+        except OSError: data = b""
+        if not data: self._drop(sock, count=False)
+
+    def _flush(self, sock, now):
+        import selectors
+        c = self.clients.get(sock)
+        if c is None: return
+        sent_any = False
+        while True:
+            if not c.out:
+                with self._lock:
+                    if not c.queue: break
+                    c.out = b"".join(c.queue)
+                    c.queue.clear()
+            try: n = sock.send(c.out)
+            except BlockingIOError: break
+            except OSError:
+                self._drop(sock, count=False)
+                return
+            c.out = c.out[n:]
+            sent_any = sent_any or n > 0
+        if not c.out:
+            c.stalled_since = None
+            self._sel.modify(sock, selectors.EVENT_READ)
+            return
+        if sent_any or c.stalled_since is None: c.stalled_since = now
+        elif now - c.stalled_since > BROADCAST_STALL_S:
+            self._drop(sock)
+            return
+        self._sel.modify(sock, selectors.EVENT_READ | selectors.EVENT_WRITE)
+
+    def _drop(self, sock, count=True):
+        with self._lock:
+            self.clients.pop(sock, None)
+            self.stats["spectators"] = len(self.clients)
+            if count:
+                self.stats["dropped"] += 1
+                METRICS.inc("broadcast_dropped")
+        try: self._sel.unregister(sock)
+        except (KeyError, ValueError): pass
+        sock.close()
+
+_broadcaster = None
+
+def get_broadcaster():
+    """The process-wide broadcaster if --broadcast PORT is set (started on first use), else None."""
+    global _broadcaster, BROADCAST_PORT
+    if _broadcaster is None and BROADCAST_PORT:
+        try:
+            _broadcaster = DuelBroadcaster(int(BROADCAST_PORT))
+            print(f"Spectators can watch duels on 127.0.0.1:{_broadcaster.port}")
+        except (OSError, ValueError) as e:
+            print(f"WorDuel: broadcast disabled: {e}", file=sys.stderr)
+            BROADCAST_PORT = None
+    return _broadcaster
+
 # ---------------------------------------------------------
 # ASSET & AVATAR DRAWING SYSTEM
 # ---------------------------------------------------------
@@ -150,7 +1961,8 @@ def find_layer_files():
     """Returns dictionaries of available assets"""
     candidates = []
     places = [os.getcwd()]
-    if os.path.isdir(ASSETS_DIR): places.append(os.path.join(os.getcwd(), ASSETS_DIR))
+    built = os.path.join(os.getcwd(), ASSETS_DIR, str(DISPLAY_SIZE))
+    if os.path.isdir(built): places.append(built)
     for p in places:
         try:
             for fn in os.listdir(p):
@@ -165,6 +1977,12 @@ def find_layer_files():
         elif lfn.startswith("outfit_"): outfits[fn[7:].rsplit(".", 1)[0].lower()] = full
     return bases, exprs, outfits
 
+def layer_at(path, size):
+    """The copy of a layer that optimize_assets.py wrote for this size (assets/<size>/), else path."""
+    if not path: return path
+    copy = os.path.join(os.getcwd(), ASSETS_DIR, str(size), os.path.basename(path))
+    return copy if os.path.exists(copy) else path
+
 def load_and_prepare_image(path, target_size=DISPLAY_SIZE):
     if not PIL_AVAILABLE or not path: return None
     try:
@@ -189,22 +2007,74 @@ def compose_layers(base_im, outfit_im, expr_im):
     if expr_im: out = Image.alpha_composite(out, expr_im)
     return out
 
+SHAKE_FRAME_MS = 100
+
+def track_frame(fn, interval_ms=SHAKE_FRAME_MS):
+    """Wraps an animation step scheduled with after(interval_ms) to count late (dropped) frames."""
+    if not METRICS.enabled: return fn
+    due = time.perf_counter() + interval_ms / 1000
+    def run():
+        late_ms = (time.perf_counter() - due) * 1000
+        METRICS.observe("frame_lateness_ms", max(0.0, late_ms))
+        if late_ms > interval_ms: METRICS.inc("frames_dropped")
+        fn()
+    return run
+
+AVATAR_CACHE_SIZE = 64
+_avatar_cache = OrderedDict()
+_avatar_jobs = {} # (layer paths) -> Future composing them on the background executor (prefetch_avatar)
+
+def get_composed_avatar(base_path, outfit_path, expr_path):
+    """Composed DISPLAY_SIZE avatar for these layer files, kept in a small LRU cache."""
+    key = (base_path, outfit_path, expr_path)
+    comp = _avatar_cache.get(key)
+    if comp is not None:
+        _avatar_cache.move_to_end(key)
+        METRICS.inc("avatar_cache_hits")
+        return comp
+    METRICS.inc("avatar_cache_misses")
+    job = _avatar_jobs.pop(key, None)
+    comp = job.result() if job is not None else compose_avatar(key)
+    if comp is not None:
+        _avatar_cache[key] = comp
+        if len(_avatar_cache) > AVATAR_CACHE_SIZE: _avatar_cache.popitem(last=False)
+    return comp
+
+def compose_avatar(key):
+    """Composed DISPLAY_SIZE avatar for (base, outfit, expression) paths. Pure PIL, safe on a worker thread."""
+    return compose_layers(*(load_and_prepare_image(layer_at(p, DISPLAY_SIZE), target_size=DISPLAY_SIZE) for p in key))
+
+def avatar_key(profile):
+    """(base, outfit, expression) layer paths for a profile; any of them may be None."""
+    bases, exprs, outfits = find_layer_files()
+    return (bases.get((profile.get("color") or "").lower()), outfits.get((profile.get("outfit") or "").lower()),
+            exprs.get((profile.get("expression") or "").lower()))
+
+def prefetch_avatar(profile):
+    """Starts composing a profile's avatar on the background executor, so drawing it later
+    (get_composed_avatar) takes the finished image instead of decoding full-size layers."""
+    key = avatar_key(profile)
+    if PIL_AVAILABLE and any(key) and key not in _avatar_cache and key not in _avatar_jobs:
+        _avatar_jobs[key] = get_background_executor().submit(compose_avatar, key)
+
 def draw_profile_avatar(canvas, profile, w, h):
     """Global helper to draw a profile's avatar onto a tkinter Canvas."""
-    bases, exprs, outfits = find_layer_files()
-    base_key = (profile.get("color") or "").lower()
-    expr_key = (profile.get("expression") or "").lower()
-    outfit_key = (profile.get("outfit") or "").lower()
+    with METRICS.timer("avatar_draw_ms"):
+        _draw_profile_avatar(canvas, profile, w, h)
 
-    base_path = bases.get(base_key)
-    expr_path = exprs.get(expr_key)
-    outfit_path = outfits.get(outfit_key)
+def _draw_profile_avatar(canvas, profile, w, h):
+    base_path, outfit_path, expr_path = avatar_key(profile)
 
     if PIL_AVAILABLE and (base_path or expr_path or outfit_path):
-        base_im = load_and_prepare_image(base_path, target_size=DISPLAY_SIZE)
-        expr_im = load_and_prepare_image(expr_path, target_size=DISPLAY_SIZE)
-        outfit_im = load_and_prepare_image(outfit_path, target_size=DISPLAY_SIZE)
-        composed = compose_layers(base_im, outfit_im, expr_im)
+        job = _avatar_jobs.get((base_path, outfit_path, expr_path))
+        if job is not None and not job.done():
+            # Still being composed by prefetch_avatar: the placeholder now, the art once it's ready
+            # (unless a reaction has replaced the placeholder by then)
+            _draw_placeholder_avatar(canvas, w, h, tags=("avatar_pending",))
+            canvas.after(BOT_POLL_MS, lambda: canvas.winfo_exists() and canvas.find_withtag("avatar_pending")
+                         and _draw_profile_avatar(canvas, profile, w, h))
+            return
+        composed = get_composed_avatar(base_path, outfit_path, expr_path)
         if composed:
             comp_small = composed.resize((w, h), resample=Image.NEAREST)
             canvas.image = ImageTk.PhotoImage(comp_small) # Keep ref
@@ -212,90 +2082,264 @@ def draw_profile_avatar(canvas, profile, w, h):
             canvas.create_image(w//2, h//2, image=canvas.image)
             return
 
+    _draw_placeholder_avatar(canvas, w, h)
+
+def _draw_placeholder_avatar(canvas, w, h, tags=()):
     # Fallback "Cute" Placeholder
     canvas.delete("all")
-    canvas.create_oval(w*0.1, h*0.1, w*0.9, h*0.9, fill="#ffd27f", outline=THEME["text_main"], width=2)
+    canvas.create_oval(w*0.1, h*0.1, w*0.9, h*0.9, fill="#ffd27f", outline=THEME["text_main"], width=2, tags=tags)
     # Eyes
-    canvas.create_oval(w*0.3, h*0.4, w*0.4, h*0.5, fill=THEME["text_main"])
-    canvas.create_oval(w*0.6, h*0.4, w*0.7, h*0.5, fill=THEME["text_main"])
+    canvas.create_oval(w*0.3, h*0.4, w*0.4, h*0.5, fill=THEME["text_main"], tags=tags)
+    canvas.create_oval(w*0.6, h*0.4, w*0.7, h*0.5, fill=THEME["text_main"], tags=tags)
     # Smile
-    canvas.create_arc(w*0.3, h*0.5, w*0.7, h*0.8, start=0, extent=-180, style="arc", outline=THEME["text_main"], width=2)
+    canvas.create_arc(w*0.3, h*0.5, w*0.7, h*0.8, start=0, extent=-180, style="arc", outline=THEME["text_main"], width=2, tags=tags)
+
+# ---------------------------------------------------------
+# AVATAR REACTIONS
+# ---------------------------------------------------------
+REACTION_FRAME_MS = 50 # 20 fps
+REACTION_FRAMES = 12   # Motion frames per reaction; a rest frame (the normal avatar) is appended
+REACTION_CACHE_SIZE = 24
+PANEL_AVATAR_SIZE = 56 # Avatar next to each duel panel's title
+RESULT_AVATAR_SIZE = 140 # Avatar on the single-game result card
+LAYER_SIZES = (DISPLAY_SIZE, RESULT_AVATAR_SIZE, PANEL_AVATAR_SIZE) # Every size layers are loaded at
+# reaction -> (expressions to try, effect outfit layers to try, motion). Layers that are
+# missing are skipped, so the profile's own expression is used when none of them exist.
+REACTIONS = {
+    "celebrate": (("grin", "smile2", "sunglasses"), ("sparkle", "hearts"), "bounce"),
+    "sweat": (("oh", "bruh", "sad"), ("sweat",), "shake"),
+}
+
+def reaction_for(colors=None, won=None):
+    """Which reaction a guess (hint colors) or a finished game (won) deserves, or None."""
+    if won is not None: return "celebrate" if won else "sweat"
+    if "green" in colors: return "celebrate"
+    if all(c == "grey" for c in colors): return "sweat"
+    return None
+
+def reaction_layers(profile, reaction, layers=None):
+    """(base, outfit, reaction expression, effect, own expression) paths for a profile, or None without any art."""
+    bases, exprs, outfits = layers or find_layer_files()
+    base = bases.get((profile.get("color") or "").lower())
+    outfit = outfits.get((profile.get("outfit") or "").lower())
+    own_expr = exprs.get((profile.get("expression") or "").lower())
+    if not (base or outfit or own_expr): return None
+    want_exprs, want_effects, _ = REACTIONS[reaction]
+    expr = next((exprs[k] for k in want_exprs if k in exprs), own_expr)
+    effect = next((outfits[k] for k in want_effects if k in outfits and outfits[k] != outfit), None)
+    return base, outfit, expr, effect, own_expr
+
+def _shifted(im, dx, dy):
+    out = Image.new("RGBA", im.size, (0, 0, 0, 0))
+    out.paste(im, (dx, dy))
+    return out
+
+def bake_reaction_frames(paths, reaction, size):
+    """PIL frames for one reaction: the avatar moves (bounce/shake) under an animated effect layer.
+
+    Pure PIL, safe on a worker thread. The last frame is the profile's normal avatar.
+    """
+    base_p, outfit_p, expr_p, effect_p, own_expr_p = paths
+    base, outfit, expr, effect, own_expr = (load_and_prepare_image(layer_at(p, size), target_size=size)
+                                            for p in (base_p, outfit_p, expr_p, effect_p, own_expr_p))
+    body = compose_layers(base, outfit, expr)
+    motion = REACTIONS[reaction][2]
+    amp = max(2, size // 16)
+    frames = []
+    for i in range(REACTION_FRAMES):
+        t = i / REACTION_FRAMES
+        if motion == "bounce":
+            # Two hops; the effect pulses with them
+            hop = abs(math.sin(2 * math.pi * t))
+            frame = _shifted(body, 0, -round(amp * hop))
+            if effect is not None:
+                fx = effect.copy()
+                fx.putalpha(effect.getchannel("A").point(lambda a, k=0.35 + 0.65 * hop: int(a * k)))
+                frame = Image.alpha_composite(frame, fx)
+        else:
+            # Decaying side-to-side shake; the effect slides down (a drop running off)
+            frame = _shifted(body, round(amp * (1 - t) * math.sin(4 * math.pi * t)), 0)
+            if effect is not None: frame = Image.alpha_composite(frame, _shifted(effect, 0, round(amp * 1.5 * t)))
+        frames.append(frame)
+    frames.append(compose_layers(base, outfit, own_expr))
+    return frames
+
+_reaction_cache = OrderedDict() # (layer paths, reaction, size) -> [PhotoImage]
+
+class AvatarReactor:
+    """Plays a profile's reactions on a canvas at REACTION_FRAME_MS per frame.
+
+    Frames are baked once per profile and size (PIL work on the background executor,
+    PhotoImage conversion here) and shared through _reaction_cache. A tick only swaps
+    the image of one canvas item, so playback allocates nothing and never delays input.
+    """
+    def __init__(self, canvas, profile, size):
+        self.canvas, self.size = canvas, size
+        self.frames = None
+        self.index = 0
+        self._item = None
+        self._job = None
+        self._wanted = None
+        self._step = self._tick # Bound once, reused by every after()
+        self.keys = {}
+        if not PIL_AVAILABLE: return
+        layers = find_layer_files()
+        for reaction in REACTIONS:
+            paths = reaction_layers(profile, reaction, layers)
+            if paths is not None: self.keys[reaction] = (paths, reaction, size)
+        self._bake_missing()
+
+    def _bake_missing(self):
+        futures = {key: get_background_executor().submit(bake_reaction_frames, *key)
+                   for key in self.keys.values() if key not in _reaction_cache}
+        if futures: self.canvas.after(BOT_POLL_MS, lambda: self._collect(futures))
+
+    def _collect(self, futures):
+        try:
+            if not self.canvas.winfo_exists(): return
+        except tk.TclError: return
+        if not all(f.done() for f in futures.values()):
+            self.canvas.after(BOT_POLL_MS, lambda: self._collect(futures))
+            return
+        with METRICS.timer("reaction_photo_ms"):
+            for key, fut in futures.items():
+                try: frames = fut.result()
+                except Exception: continue
+                if key in _reaction_cache: continue
+                _reaction_cache[key] = [ImageTk.PhotoImage(im) for im in frames]
+                if len(_reaction_cache) > REACTION_CACHE_SIZE: _reaction_cache.popitem(last=False)
+        if self._wanted: self.play(self._wanted)
+
+    def play(self, reaction):
+        """Starts (or restarts) a reaction; a no-op without art, deferred until its frames are baked."""
+        key = self.keys.get(reaction)
+        if key is None: return
+        frames = _reaction_cache.get(key)
+        if frames is None:
+            self._wanted = reaction
+            return
+        _reaction_cache.move_to_end(key) # LRU: a profile that keeps reacting stays baked
+        self._wanted = None
+        METRICS.inc("reactions_played")
+        if self._job is not None: self.canvas.after_cancel(self._job)
+        if self._item is None:
+            self.canvas.delete("all") # Replace the static avatar with our own image item
+            self._item = self.canvas.create_image(self.size // 2, self.size // 2, image=frames[0])
+        self.frames, self.index = frames, 0
+        self._tick()
+
+    def _tick(self):
+        try: self.canvas.itemconfigure(self._item, image=self.frames[self.index])
+        except tk.TclError:
+            self._job = None
+            return
+        self.index += 1
+        if self.index < len(self.frames): self._job = self.canvas.after(REACTION_FRAME_MS, track_frame(self._step, REACTION_FRAME_MS))
+        else: self._job = None
 
 # ---------------------------------------------------------
 # CUSTOM RESULT OVERLAY (Replaces MessageBox)
 # ---------------------------------------------------------
 class GameResultOverlay(tk.Frame):
-    def __init__(self, parent, is_win, secret_word, profile, on_close_callback):
-        super().__init__(parent, bg="white", bd=0)
+    def __init__(self, parent, is_win, secret_word, profile, on_close_callback, on_play_again=None, note=None):
+        super().__init__(parent, bd=0)
+        THEMES.style(self, "overlay")
         self.place(relx=0, rely=0, relwidth=1, relheight=1)
         
         # Center Container (The Card)
-        card = tk.Frame(self, bg=THEME["bg"], padx=40, pady=40)
+        card = THEMES.style(tk.Frame(self, padx=40, pady=40), "surface")
         card.place(relx=0.5, rely=0.5, anchor="center")
         
         # Title
         title_text = "YOU WON!" if is_win else "YOU LOST"
-        title_color = "#76c893" if is_win else "#ff8fab"
         
-        tk.Label(card, text=title_text, font=("Helvetica", 24, "bold"), 
-                 bg=THEME["bg"], fg=title_color).pack(pady=(0, 10))
+        THEMES.style(tk.Label(card, text=title_text, font=("Helvetica", 24, "bold")),
+                     "label.win" if is_win else "label.lose").pack(pady=(0, 10))
 
         # Avatar Display (Always show avatar for the current player)
-        av_frame = tk.Frame(card, bg=THEME["bg"])
+        av_frame = THEMES.style(tk.Frame(card), "surface")
         av_frame.pack(pady=10)
-        canv = tk.Canvas(av_frame, width=140, height=140, bg=THEME["bg"], highlightthickness=0)
+        canv = THEMES.style(tk.Canvas(av_frame, width=RESULT_AVATAR_SIZE, height=RESULT_AVATAR_SIZE, highlightthickness=0), "surface")
         canv.pack()
-        draw_profile_avatar(canv, profile, 140, 140)
+        draw_profile_avatar(canv, profile, RESULT_AVATAR_SIZE, RESULT_AVATAR_SIZE)
+        self.reactor = AvatarReactor(canv, profile, RESULT_AVATAR_SIZE)
+        self.reactor.play(reaction_for(won=is_win))
         
-        tk.Label(card, text=f"Great job, {profile.get('username','Player')}!", 
-                 bg=THEME["bg"], fg=THEME["muted"], font=("Helvetica", 10)).pack(pady=(5,0))
+        THEMES.style(tk.Label(card, text=f"Great job, {profile.get('username','Player')}!", 
+                              font=("Helvetica", 10)), "label.muted").pack(pady=(5,0))
 
         # Secret Word Reveal
-        tk.Label(card, text=f"The word was:", bg=THEME["bg"], fg=THEME["muted"]).pack(pady=(15, 5))
-        tk.Label(card, text=secret_word.upper(), font=("Helvetica", 18, "bold"), 
-                 bg=THEME["white"], fg=THEME["text_main"], width=15, relief="flat", padx=10, pady=5).pack()
+        THEMES.style(tk.Label(card, text=f"The word was:"), "label.muted").pack(pady=(15, 5))
+        THEMES.style(tk.Label(card, text=secret_word.upper(), font=("Helvetica", 18, "bold"), 
+                              width=15, relief="flat", padx=10, pady=5), "card.value").pack()
+        if note:
+            THEMES.style(tk.Label(card, text=note, font=("Helvetica", 9), wraplength=260), "label.muted").pack(pady=(8, 0))
 
         # Close Button
-        btn = tk.Button(card, text="Continue", font=("Helvetica", 12, "bold"),
-                        bg=THEME["primary"], fg="white", relief="flat",
-                        activebackground=THEME["primary_hover"], activeforeground="white",
-                        width=12, command=on_close_callback)
+        btn = THEMES.style(tk.Button(card, text="Continue", font=("Helvetica", 12, "bold"), relief="flat",
+                                     width=12, command=on_close_callback), "button.primary")
         btn.pack(pady=(25, 0))
+        if on_play_again:
+            THEMES.style(tk.Button(card, text="Play Again", font=("Helvetica", 11), relief="flat", bd=0,
+                                   command=on_play_again), "button.link").pack(pady=(10, 0))
 
 # ---------------------------------------------------------
 # SINGLE GAME WINDOW
 # ---------------------------------------------------------
 class SingleGameWindow:
-    def __init__(self, master, secret_word, word_length, player_profile, title="WorDuel", on_finish=None):
+    # Finished pooled windows, hidden and waiting for the next game: word length -> [windows]
+    _pool = {}
+
+    @classmethod
+    def acquire(cls, master, secret_word, word_length, player_profile, **options):
+        """A window for a new game: an idle pooled one of this length reset in place, else a new one.
+
+        Windows handed out here go back to the pool when their game finishes.
+        """
+        t0 = time.perf_counter()
+        idle = cls._pool.get(word_length, [])
+        while idle:
+            game = idle.pop()
+            if game.master is master and game.win.winfo_exists():
+                game.reset(secret_word, player_profile, **options)
+                METRICS.inc("game_window_reused")
+                METRICS.observe("game_window_reuse_ms", (time.perf_counter() - t0) * 1000)
+                return game
+            if game.win.winfo_exists(): game.win.destroy() # Pooled under another root; don't leave it hidden forever
+        game = cls(master, secret_word, word_length, player_profile, pooled=True, **options)
+        METRICS.inc("game_window_built")
+        METRICS.observe("game_window_build_ms", (time.perf_counter() - t0) * 1000)
+        return game
+
+    def __init__(self, master, secret_word, word_length, player_profile, title="WorDuel", on_finish=None, record=True, hard_mode=False,
+                 on_play_again=None, pooled=False):
         self.master = master
-        self.secret = secret_word.lower()
         self.word_length = word_length
-        self.profile = player_profile
+        self.pooled = pooled
         self.attempt = 0
-        self.attempts_used = None
-        self.on_finish = on_finish
-        self.guessed = False
         self.key_buttons = {}
+        self.key_state = {} # letter -> strongest hint so far (HINT_STATES)
+        self.overlay = None
+        LetterIndex.prefetch(word_length) # For the "possible words" counter
+        NeighbourGraph.prefetch(word_length) # For trap warnings
 
         self.win = tk.Toplevel(master)
-        self.win.title(title)
         self.win.protocol("WM_DELETE_WINDOW", self._on_force_close)
-        self.win.configure(bg=THEME["bg"])
+        THEMES.style(self.win, "surface")
         self.win.geometry("900x700")
         self.win.minsize(700, 600)
 
         # Main Layout
-        container = tk.Frame(self.win, bg=THEME["bg"], padx=20, pady=20)
+        container = THEMES.style(tk.Frame(self.win, padx=20, pady=20), "surface")
         container.pack(fill="both", expand=True)
 
         # START CHANGE 2: Apply Duel Name style to Single Player
-        username = self.profile.get("username", "Player")
-        tk.Label(container, text=f"{username}'s Game", bg=THEME["bg"], fg=THEME["text_main"],
-                 font=("Helvetica", 14, "bold")).pack(pady=(5, 10))
+        self.name_lbl = THEMES.style(tk.Label(container, font=("Helvetica", 14, "bold")), "label")
+        self.name_lbl.pack(pady=(5, 10))
         # END CHANGE 2
 
         # Grid
-        self.grid_frame = tk.Frame(container, bg=THEME["bg"])
+        self.grid_frame = THEMES.style(tk.Frame(container), "surface")
         self.grid_frame.pack(pady=10)
 
         self.cells = []
@@ -303,62 +2347,90 @@ class SingleGameWindow:
             row = []
             for c in range(word_length):
                 # Flatter, cleaner tiles
-                lbl = tk.Label(self.grid_frame, text="", width=4, height=2,
-                               bg="white", fg=THEME["tile_text"],
-                               relief="flat", font=("Helvetica", 14, "bold"))
+                lbl = THEMES.style(tk.Label(self.grid_frame, text="", width=4, height=2,
+                                            relief="flat", font=("Helvetica", 14, "bold")), "tile.empty")
                 # Use a frame to simulate a border if needed, or just padding
                 lbl.grid(row=r, column=c, padx=3, pady=3)
                 row.append(lbl)
             self.cells.append(row)
 
         # Entry Area
-        entry_frame = tk.Frame(container, bg=THEME["bg"])
+        entry_frame = THEMES.style(tk.Frame(container), "surface")
         entry_frame.pack(pady=20)
         
         self.guess_var = tk.StringVar()
-        self.guess_entry = tk.Entry(entry_frame, textvariable=self.guess_var, 
-                                    width=15, font=("Helvetica", 16), 
-                                    relief="flat", bg="white", fg=THEME["text_main"],
-                                    justify="center")
+        self.guess_entry = THEMES.style(tk.Entry(entry_frame, textvariable=self.guess_var, 
+                                                 width=15, font=("Helvetica", 16), 
+                                                 relief="flat", justify="center"), "entry")
         self.guess_entry.pack(side="left", ipady=5, padx=10)
         self.guess_entry.bind("<Return>", lambda e: self.submit_guess())
         
-        self.submit_btn = tk.Button(entry_frame, text="GUESS", command=self.submit_guess, 
-                                    bg=THEME["primary"], fg="white", font=("Helvetica", 11, "bold"),
-                                    relief="flat", activebackground=THEME["primary_hover"], width=10)
+        self.submit_btn = THEMES.style(tk.Button(entry_frame, text="GUESS", command=self.submit_guess, 
+                                                 font=("Helvetica", 11, "bold"), relief="flat", width=10), "button.primary")
         self.submit_btn.pack(side="left", padx=10, ipady=5)
 
         # Keyboard
         self._build_keyboard(container)
         
-        self.status_lbl = tk.Label(container, text=f"Attempts left: {MAX_ATTEMPTS}", 
-                                   bg=THEME["bg"], fg=THEME["muted"], font=("Helvetica", 10))
+        self.status_lbl = THEMES.style(tk.Label(container, text=f"Attempts left: {MAX_ATTEMPTS}", 
+                                                font=("Helvetica", 10)), "label.muted")
         self.status_lbl.pack(side="bottom", pady=10)
 
+        self.reset(secret_word, player_profile, title, on_finish, record, hard_mode, on_play_again)
+
+    def reset(self, secret_word, player_profile, title="WorDuel", on_finish=None, record=True, hard_mode=False, on_play_again=None):
+        """Starts a new game in this window, clearing the used tiles, keys and result overlay in place."""
+        for row in self.cells[:self.attempt + 1]:
+            for lbl in row: THEMES.style(lbl, "tile.empty", text="")
+        for ch in self.key_state: THEMES.style(self.key_buttons[ch], "key.empty")
+        if self.overlay is not None:
+            self.overlay.destroy()
+            self.overlay = None
+
+        self.hard_mode = hard_mode
+        self.secret = secret_word.lower()
+        self.profile = player_profile
+        self.attempt = 0
+        self.attempts_used = None
+        self.on_finish = on_finish
+        self.on_play_again = on_play_again
+        self.guessed = False
+        self.key_state = {}
+        self.recorder = ReplayRecorder.start("single", self.word_length, [self.secret], [player_profile.get("username", "Player")]) if record else None
+        self.constraints = BoardConstraints(self.word_length)
+        self.trap = None
+
+        self.win.title(title)
+        self.name_lbl.config(text=f"{player_profile.get('username', 'Player')}'s Game")
+        self.guess_var.set("")
+        self.status_lbl.config(text=f"Attempts left: {MAX_ATTEMPTS}")
         self.enable(True)
+        self.win.deiconify()
         self.win.lift()
         self.guess_entry.focus_set()
+        # Think time runs from when the board is ready until the next submit (not tracked for replays)
+        self._turn_started = time.perf_counter() if record else None
+
+    def _mark_turn_start(self):
+        self._turn_started = time.perf_counter()
 
     def _build_keyboard(self, parent):
-        kb_frame = tk.Frame(parent, bg=THEME["bg"])
+        kb_frame = THEMES.style(tk.Frame(parent), "surface")
         kb_frame.pack(pady=10)
         rows = ["QWERTYUIOP", "ASDFGHJKL", "ZXCVBNM"]
         for r in rows:
-            rframe = tk.Frame(kb_frame, bg=THEME["bg"])
+            rframe = THEMES.style(tk.Frame(kb_frame), "surface")
             rframe.pack(pady=2)
             for ch in r:
-                btn = tk.Button(rframe, text=ch, width=4, height=1, 
-                                bg="white", fg=THEME["text_main"], relief="flat",
-                                activebackground=THEME["grey"], # Improved hover
-                                command=lambda c=ch: self._on_key_click(c))
+                btn = THEMES.style(tk.Button(rframe, text=ch, width=4, height=1, relief="flat",
+                                             command=lambda c=ch: self._on_key_click(c)), "key.empty")
                 btn.pack(side="left", padx=2)
                 self.key_buttons[ch.lower()] = btn
         
         # Tools row
-        tools = tk.Frame(kb_frame, bg=THEME["bg"])
+        tools = THEMES.style(tk.Frame(kb_frame), "surface")
         tools.pack(pady=4)
-        # Added activebackground for backspace
-        tk.Button(tools, text="⌫", command=self._on_backspace, bg=THEME["secondary"], relief="flat", activebackground=THEME["grey"], width=6).pack(side="left", padx=5)
+        THEMES.style(tk.Button(tools, text="⌫", command=self._on_backspace, relief="flat", width=6), "button.tool").pack(side="left", padx=5)
 
     def _on_key_click(self, ch):
         cur = self.guess_var.get()
@@ -372,43 +2444,51 @@ class SingleGameWindow:
         self.guess_entry.icursor(tk.END)
 
     def _shake_row(self, row_widgets):
-        # Visual feedback for error
-        base_bg = row_widgets[0].cget("bg")
-        # Ensure base_bg is set to a solid color for the flash cycle, usually 'white'
-        if base_bg not in [THEME["success"], THEME["warning"], THEME["grey"]]:
-            base_bg = 'white'
-        
-        def color_flash(c, count):
-            if count > 4: 
-                for w in row_widgets: w.config(bg=base_bg)
-                return
-            col = THEME["error"] if count % 2 == 0 else base_bg
-            for w in row_widgets: w.config(bg=col)
-            self.win.after(100, lambda: color_flash(c, count+1))
-        color_flash(base_bg, 0)
+        # Visual feedback for error: the row being typed is still empty, so it flashes back to that
+        def color_flash(count):
+            style = "tile.error" if count % 2 == 0 and count <= 4 else "tile.empty"
+            for w in row_widgets: THEMES.style(w, style)
+            if count <= 4: self.win.after(SHAKE_FRAME_MS, track_frame(lambda: color_flash(count+1)))
+        color_flash(0)
 
     def submit_guess(self):
+        t0 = time.perf_counter()
         guess = self.guess_var.get().strip().lower()
         if len(guess) != self.word_length or not guess.isalpha():
             if self.attempt < MAX_ATTEMPTS: self._shake_row(self.cells[self.attempt])
             return
+        METRICS.inc("dictionary_lookups")
         if VALID_WORDS and guess not in VALID_WORDS:
+            METRICS.inc("guesses_rejected")
+            if self.attempt < MAX_ATTEMPTS: self._shake_row(self.cells[self.attempt])
+            return
+        # Hard mode: every revealed hint must be used
+        problem = self.constraints.violation(guess) if self.hard_mode else None
+        if problem:
+            METRICS.inc("guesses_rejected")
+            self._flash_status(problem)
             if self.attempt < MAX_ATTEMPTS: self._shake_row(self.cells[self.attempt])
             return
+        METRICS.observe("guess_validation_ms", (time.perf_counter() - t0) * 1000)
 
-        colors = WordleEngine.check_guess(guess, self.secret)
+        with METRICS.timer("check_guess_ms"):
+            colors = WordleEngine.check_guess(guess, self.secret)
         row_labels = self.cells[self.attempt]
         
-        for i, ch in enumerate(guess):
-            lbl = row_labels[i]
-            lbl.config(text=ch.upper())
-            if colors[i] == "green": lbl.config(bg=THEME["success"], fg=THEME["tile_text"])
-            elif colors[i] == "yellow": lbl.config(bg=THEME["warning"], fg=THEME["tile_text"])
-            else: lbl.config(bg=THEME["grey"], fg="#999")
-            
-        self._update_keyboard(colors, guess)
+        with METRICS.timer("tile_render_ms"):
+            for i, ch in enumerate(guess):
+                THEMES.style(row_labels[i], "tile." + colors[i], text=ch.upper())
+
+            self._update_keyboard(colors, guess)
+        if self._turn_started is not None:
+            TELEMETRY.record_guess(self.win, self.profile.get("username", "Player"), self.word_length,
+                                   (t0 - self._turn_started) * 1000, t0, self._mark_turn_start)
+        if self.recorder: self.recorder.guess(0, guess)
         self.attempt += 1
-        self.status_lbl.config(text=f"Attempts left: {MAX_ATTEMPTS - self.attempt}")
+        self.constraints.add(guess, colors)
+        graph = NeighbourGraph.ready(self.word_length)
+        self.trap = graph.trap(guess, colors, self.constraints) if graph and guess != self.secret else None
+        self.status_lbl.config(text=self._status_text())
         self.guess_var.set("")
 
         if guess == self.secret:
@@ -420,28 +2500,40 @@ class SingleGameWindow:
             self.attempts_used = MAX_ATTEMPTS + 1
             self.show_result(False)
 
+    def _flash_status(self, message, ms=2000):
+        self.status_lbl.config(text=message)
+        self.win.after(ms, lambda: self.status_lbl.winfo_exists() and self.status_lbl.cget("text") == message
+                       and self.status_lbl.config(text=self._status_text()))
+
+    def _status_text(self):
+        text = f"Attempts left: {MAX_ATTEMPTS - self.attempt}"
+        index = LetterIndex.ready(self.word_length)
+        if index is not None and self.attempt:
+            n = index.count(self.constraints)
+            text += f"   ·   {n} possible word{'s' if n != 1 else ''} left"
+        if self.trap: text += "\n" + trap_warning(*self.trap, MAX_ATTEMPTS - self.attempt)
+        return text
+
     def show_result(self, is_win):
         self.enable(False)
         # Call the cute overlay instead of closing
-        GameResultOverlay(self.win, is_win, self.secret, self.profile, self.finish)
+        self.overlay = GameResultOverlay(self.win, is_win, self.secret, self.profile, self.finish,
+                                         self._play_again if self.on_play_again else None,
+                                         note=lookalike_note(self.secret))
+
+    def _play_again(self):
+        # finish() parks this window in the pool, so the next game picks it straight back up
+        start_next = self.on_play_again
+        self.finish()
+        start_next()
 
     def _update_keyboard(self, colors, guess):
-        rank_map = {"green": 3, "yellow": 2, "grey": 1}
         for c, col in zip(guess, colors):
             btn = self.key_buttons.get(c)
             if not btn: continue
-            
-            cur_bg = btn.cget("bg")
-            cur_rank = 0
-            if cur_bg == THEME["success"]: cur_rank = 3
-            elif cur_bg == THEME["warning"]: cur_rank = 2
-            elif cur_bg == THEME["grey"]: cur_rank = 1
-            
-            new_rank = rank_map.get(col, 0)
-            if new_rank > cur_rank:
-                if col == "green": btn.config(bg=THEME["success"])
-                elif col == "yellow": btn.config(bg=THEME["warning"])
-                else: btn.config(bg=THEME["grey"])
+            if HINT_RANK[col] > HINT_RANK[self.key_state.get(c, "empty")]:
+                self.key_state[c] = col
+                THEMES.style(btn, "key." + col)
 
     def enable(self, flag: bool):
         state = "normal" if flag else "disabled"
@@ -454,9 +2546,24 @@ class SingleGameWindow:
         if self.attempts_used is None:
             self.attempts_used = MAX_ATTEMPTS + 1
             self.guessed = False
+        if self.recorder:
+            self.recorder.result(0, self.attempts_used, self.guessed)
+            self.recorder.save()
+            self.recorder = None
         if self.on_finish:
             self.on_finish(self.attempts_used, self.guessed)
-        self.win.destroy()
+        self.release()
+
+    def release(self):
+        """Hides the window for the next game of this length, or destroys it if it isn't pooled."""
+        idle = SingleGameWindow._pool.setdefault(self.word_length, [])
+        if self.pooled and self.win.winfo_exists() and len(idle) < GAME_WINDOW_POOL_SIZE:
+            self.on_finish = self.on_play_again = None
+            self.enable(False)
+            self.win.withdraw()
+            idle.append(self)
+        else:
+            self.win.destroy()
 
     def _on_force_close(self):
         self.finish()
@@ -466,9 +2573,16 @@ class SingleGameWindow:
 # ---------------------------------------------------------
 class PlayerPanel(tk.Frame):
     # CHANGED: Added 'profile' argument
-    def __init__(self, parent, player_id, title, word_length, secret_word, on_finish, on_guess, profile):
-        super().__init__(parent, bg=THEME["bg"])
+    def __init__(self, parent, player_id, title, word_length, secret_word, on_finish, on_guess, profile, hard_mode=False,
+                 reveal=True):
+        super().__init__(parent)
+        THEMES.style(self, "surface")
         self.player_id = player_id
+        self.hard_mode = hard_mode
+        self.reveal = reveal # Pop the secret in a dialog on a loss (off for replay playback)
+        self.constraints = BoardConstraints(word_length)
+        self.trap = None
+        NeighbourGraph.prefetch(word_length)
         self.title = title
         self.profile = profile # <<< ADDED: Store the profile
         self.word_length = word_length
@@ -478,54 +2592,59 @@ class PlayerPanel(tk.Frame):
         self.attempt = 0
         self.attempts_used = None
         self.guessed = False
+        self.last_guess = None
+        self._turn_started = None # Set when the panel is enabled for a human's turn
         self.key_buttons = {}
-
-        tk.Label(self, text=title, font=("Helvetica", 14, "bold"), bg=THEME["bg"], fg=THEME["text_main"]).pack(pady=(5, 5))
+        self.key_state = {} # letter -> strongest hint so far (HINT_STATES)
+
+        head = THEMES.style(tk.Frame(self), "surface")
+        head.pack(pady=(5, 5))
+        avatar = THEMES.style(tk.Canvas(head, width=PANEL_AVATAR_SIZE, height=PANEL_AVATAR_SIZE, highlightthickness=0), "surface")
+        avatar.pack(side="left", padx=(0, 6))
+        draw_profile_avatar(avatar, profile, PANEL_AVATAR_SIZE, PANEL_AVATAR_SIZE)
+        self.reactor = AvatarReactor(avatar, profile, PANEL_AVATAR_SIZE)
+        THEMES.style(tk.Label(head, text=title, font=("Helvetica", 14, "bold")), "label").pack(side="left")
         
         # Grid
-        grid = tk.Frame(self, bg=THEME["bg"])
+        grid = THEMES.style(tk.Frame(self), "surface")
         grid.pack()
         self.cells = []
         for r in range(MAX_ATTEMPTS):
             row = []
             for c in range(word_length):
-                lbl = tk.Label(grid, text="", width=3, height=1, bg="white", 
-                               relief="flat", font=("Helvetica", 12, "bold"))
+                lbl = THEMES.style(tk.Label(grid, text="", width=3, height=1,
+                                            relief="flat", font=("Helvetica", 12, "bold")), "tile.empty")
                 lbl.grid(row=r, column=c, padx=2, pady=2)
                 row.append(lbl)
             self.cells.append(row)
 
         # Input
-        inp = tk.Frame(self, bg=THEME["bg"])
+        inp = THEMES.style(tk.Frame(self), "surface")
         inp.pack(pady=8)
         self.guess_var = tk.StringVar()
-        self.guess_entry = tk.Entry(inp, textvariable=self.guess_var, width=12, relief="flat", font=("Helvetica", 12))
+        self.guess_entry = THEMES.style(tk.Entry(inp, textvariable=self.guess_var, width=12, relief="flat", font=("Helvetica", 12)), "entry")
         self.guess_entry.pack(side="left", padx=5, ipady=3)
         self.guess_entry.bind("<Return>", lambda e: self.submit_guess())
         
-        # Added activebackground for GO button
-        self.submit_btn = tk.Button(inp, text="GO", command=self.submit_guess, 
-                                    bg=THEME["primary"], fg="white", relief="flat", activebackground=THEME["primary_hover"], width=4)
+        self.submit_btn = THEMES.style(tk.Button(inp, text="GO", command=self.submit_guess, relief="flat", width=4), "button.primary")
         self.submit_btn.pack(side="left")
 
         # Tiny Keyboard
-        kb_frame = tk.Frame(self, bg=THEME["bg"])
+        kb_frame = THEMES.style(tk.Frame(self), "surface")
         kb_frame.pack(pady=5)
         rows = ["QWERTYUIOP", "ASDFGHJKL", "ZXCVBNM"]
         for r in rows:
-            rf = tk.Frame(kb_frame, bg=THEME["bg"])
+            rf = THEMES.style(tk.Frame(kb_frame), "surface")
             rf.pack(pady=1)
             for ch in r:
-                # Added activebackground for keyboard keys
-                b = tk.Button(rf, text=ch, width=2, relief="flat", font=("Arial", 7), activebackground=THEME["grey"],
-                              command=lambda c=ch: self._on_key(c))
+                b = THEMES.style(tk.Button(rf, text=ch, width=2, relief="flat", font=("Arial", 7),
+                                           command=lambda c=ch: self._on_key(c)), "key.empty")
                 b.pack(side="left", padx=1)
                 self.key_buttons[ch.lower()] = b
         
-        # Added activebackground for backspace
-        tk.Button(kb_frame, text="⌫", command=self._backspace, bg=THEME["secondary"], relief="flat", activebackground=THEME["grey"], font=("Arial", 8)).pack(pady=2)
+        THEMES.style(tk.Button(kb_frame, text="⌫", command=self._backspace, relief="flat", font=("Arial", 8)), "button.tool").pack(pady=2)
 
-        self.status_lbl = tk.Label(self, text=f"Left: {MAX_ATTEMPTS}", bg=THEME["bg"], fg=THEME["muted"], font=("Arial", 9))
+        self.status_lbl = THEMES.style(tk.Label(self, text=f"Left: {MAX_ATTEMPTS}", font=("Arial", 9)), "label.muted")
         self.status_lbl.pack(pady=2)
 
     def _on_key(self, ch):
@@ -541,27 +2660,20 @@ class PlayerPanel(tk.Frame):
     
     # NEW: Added shake logic for invalid guesses
     def _shake_row(self, row_widgets):
-        # Visual feedback for error
-        base_bg = row_widgets[0].cget("bg")
-        # Ensure base_bg is set to a solid color for the flash cycle
-        if base_bg not in [THEME["success"], THEME["warning"], THEME["grey"]]:
-            base_bg = 'white'
-        
+        # Visual feedback for error: the row being typed is still empty, so it flashes back to that
         # We need the top-level window (usually the MainApp's root or the duel setup Toplevel) 
         # to call .after for time-based animation.
         top_level = self.master.winfo_toplevel()
         
-        def color_flash(c, count):
-            if count > 4: 
-                for w in row_widgets: w.config(bg=base_bg)
-                return
-            col = THEME["error"] if count % 2 == 0 else base_bg
-            for w in row_widgets: w.config(bg=col)
-            top_level.after(100, lambda: color_flash(c, count+1))
+        def color_flash(count):
+            style = "tile.error" if count % 2 == 0 and count <= 4 else "tile.empty"
+            for w in row_widgets: THEMES.style(w, style)
+            if count <= 4: top_level.after(SHAKE_FRAME_MS, track_frame(lambda: color_flash(count+1)))
         
-        color_flash(base_bg, 0)
+        color_flash(0)
 
     def submit_guess(self):
+        t0 = time.perf_counter()
         guess = self.guess_var.get().strip().lower()
         
         # 1. Validation Check: Length/Alpha
@@ -570,22 +2682,41 @@ class PlayerPanel(tk.Frame):
             return
             
         # 2. Validation Check: Valid Word (Added this check and shake)
+        METRICS.inc("dictionary_lookups")
         if VALID_WORDS and guess not in VALID_WORDS: 
+            METRICS.inc("guesses_rejected")
             if self.attempt < MAX_ATTEMPTS: self._shake_row(self.cells[self.attempt])
             return
+
+        # 3. Hard mode: every revealed hint must be used
+        problem = self.constraints.violation(guess) if self.hard_mode else None
+        if problem:
+            METRICS.inc("guesses_rejected")
+            self._flash_status(problem)
+            if self.attempt < MAX_ATTEMPTS: self._shake_row(self.cells[self.attempt])
+            return
+        METRICS.observe("guess_validation_ms", (time.perf_counter() - t0) * 1000)
         
-        colors = WordleEngine.check_guess(guess, self.secret)
+        with METRICS.timer("check_guess_ms"):
+            colors = WordleEngine.check_guess(guess, self.secret)
         row_labels = self.cells[self.attempt]
-        for i, ch in enumerate(guess):
-            row_labels[i].config(text=ch.upper())
-            if colors[i] == "green": row_labels[i].config(bg=THEME["success"])
-            elif colors[i] == "yellow": row_labels[i].config(bg=THEME["warning"])
-            else: row_labels[i].config(bg=THEME["grey"])
-        
-        self._update_keyboard(colors, guess)
+        with METRICS.timer("tile_render_ms"):
+            for i, ch in enumerate(guess):
+                THEMES.style(row_labels[i], "tile." + colors[i], text=ch.upper())
+
+            self._update_keyboard(colors, guess)
+        reaction = reaction_for(colors)
+        if reaction: self.reactor.play(reaction)
+        if self._turn_started is not None:
+            TELEMETRY.record_guess(self, self.title, self.word_length, (t0 - self._turn_started) * 1000, t0)
+            self._turn_started = None
+        self.constraints.add(guess, colors)
         self.attempt += 1
-        self.status_lbl.config(text=f"Left: {MAX_ATTEMPTS - self.attempt}")
+        graph = NeighbourGraph.ready(self.word_length)
+        self.trap = graph.trap(guess, colors, self.constraints) if graph and guess != self.secret else None
+        self.status_lbl.config(text=self._status_text())
         self.guess_var.set("")
+        self.last_guess = guess
         
         if self.on_guess: self.on_guess(self.player_id)
         
@@ -598,36 +2729,38 @@ class PlayerPanel(tk.Frame):
             self.attempts_used = MAX_ATTEMPTS + 1
             self.finish()
 
+    def _flash_status(self, message, ms=2000):
+        self.status_lbl.config(text=message)
+        self.after(ms, lambda: self.status_lbl.winfo_exists() and self.status_lbl.cget("text") == message
+                   and self.status_lbl.config(text=self._status_text()))
+
+    def _status_text(self):
+        text = f"Left: {MAX_ATTEMPTS - self.attempt}"
+        if self.trap: text += f"   ·   trap: {len(self.trap[1])} fit {self.trap[0].upper()}"
+        return text
+
     def _update_keyboard(self, colors, guess):
-        rank_map = {"green": 3, "yellow": 2, "grey": 1}
         for c, col in zip(guess, colors):
             btn = self.key_buttons.get(c)
             if not btn: continue
-            cur_bg = btn.cget("bg")
-            cur_rank = 0
-            if cur_bg == THEME["success"]: cur_rank = 3
-            elif cur_bg == THEME["warning"]: cur_rank = 2
-            elif cur_bg == THEME["grey"]: cur_rank = 1
-            
-            new_rank = rank_map.get(col, 0)
-            if new_rank > cur_rank:
-                if col == "green": btn.config(bg=THEME["success"])
-                elif col == "yellow": btn.config(bg=THEME["warning"])
-                else: btn.config(bg=THEME["grey"])
+            if HINT_RANK[col] > HINT_RANK[self.key_state.get(c, "empty")]:
+                self.key_state[c] = col
+                THEMES.style(btn, "key." + col)
 
     def enable(self, flag: bool):
         state = "normal" if flag else "disabled"
         self.guess_entry.config(state=state)
         self.submit_btn.config(state=state)
         for b in self.key_buttons.values(): b.config(state=state)
+        if flag and not self.profile.get("bot"): self._turn_started = time.perf_counter()
 
     def finish(self):
         if self.attempts_used is None:
             self.attempts_used = MAX_ATTEMPTS + 1
             self.guessed = False
             
-        # Reveal the word if the player lost the duel round
-        if not self.guessed:
+        # Reveal the word if the player lost the duel round (a bot has nobody to tell)
+        if not self.guessed and self.reveal and not self.profile.get("bot"):
             messagebox.showinfo(
                 f"{self.title}: Game Over", 
                 f"You ran out of guesses!\nThe secret word was: {self.secret.upper()}"
@@ -636,6 +2769,199 @@ class PlayerPanel(tk.Frame):
         if self.on_finish:
             self.on_finish(self.player_id, self.attempts_used, self.guessed)
 
+# ---------------------------------------------------------
+# DUEL BOT
+# ---------------------------------------------------------
+class BotPlayer:
+    """Plays a PlayerPanel: the solver runs on a worker thread and the move is posted back with after()."""
+    def __init__(self, panel, level="Medium"):
+        self.panel = panel
+        self.level = level if level in BOT_LEVELS else "Medium"
+        self.max_candidates, self.time_budget = BOT_LEVELS[self.level]
+        self.word_length = panel.word_length
+        self.solver = None # Built on the worker thread on the first turn
+        self.feedback = None
+        self._future = None
+
+    def take_turn(self):
+        if self._future is not None or self.panel.attempts_used is not None: return
+        # Runs on the background thread so the Tk loop never runs the solver
+        self._future = get_background_executor().submit(self._think, self.feedback)
+        self.panel.after(BOT_MIN_THINK_MS, self._poll)
+
+    def _think(self, feedback):
+        # Worker thread: no Tk calls in here
+        if self.solver is None: self.solver = WordSolver(self.word_length)
+        if feedback: self.solver.observe(*feedback)
+        return self.solver.best_guess(self.max_candidates, self.time_budget)
+
+    def _poll(self):
+        try:
+            if not self.panel.winfo_exists(): return
+        except tk.TclError: return
+        if not self._future.done():
+            self.panel.after(BOT_POLL_MS, self._poll)
+            return
+        fut, self._future = self._future, None
+        try: guess = fut.result()
+        except Exception: guess = None
+        if not guess:
+            # Nothing left to try: forfeit the round
+            self.panel.finish()
+            return
+        self.feedback = (guess, WordleEngine.check_guess(guess, self.panel.secret))
+        self.panel.guess_var.set(guess)
+        self.panel.submit_guess()
+
+# ---------------------------------------------------------
+# REPLAY PLAYBACK (UI)
+# ---------------------------------------------------------
+class ReplayViewer:
+    """Plays a decoded replay through the real game widgets, in real time (or scaled by speed)."""
+    def __init__(self, master, replay, speed=1.0, on_close=None):
+        self.replay = replay
+        names, secrets, length = replay["names"], replay["secrets"], replay["word_length"]
+        if replay["kind"] == "single":
+            game = SingleGameWindow(master, secrets[0], length, {"username": names[0]}, title="WorDuel Replay", record=False,
+                                    on_finish=on_close and (lambda attempts, guessed: on_close()))
+            self.win = game.win
+            self.boards = [game]
+        else:
+            self.win = tk.Toplevel(master)
+            self.win.title("WorDuel Replay")
+            THEMES.style(self.win, "surface")
+            self.boards = []
+            cols = min(len(secrets), DUEL_PANELS_PER_ROW)
+            for i, (secret, name) in enumerate(zip(secrets, names)):
+                panel = PlayerPanel(self.win, f"P{i + 1}", name, length, secret, None, None, {"username": name}, reveal=False)
+                panel.grid(row=i // cols, column=i % cols, padx=10, pady=10, sticky="n")
+                panel.enable(False)
+                self.boards.append(panel)
+        for t, ev, fields in replay["events"]:
+            if ev == EV_GUESS: self.win.after(int(t / speed), lambda f=fields: self._play_guess(*f))
+
+    def _play_guess(self, player, word):
+        if not self.win.winfo_exists(): return
+        board = self.boards[player]
+        board.guess_var.set(word)
+        board.submit_guess()
+
+# ---------------------------------------------------------
+# SPECTATOR VIEW (UI)
+# ---------------------------------------------------------
+class SpectatorWindow:
+    """Read-only boards for a duel broadcast by another process (see DuelBroadcaster).
+
+    A reader thread parses the JSON lines into a queue; the Tk side drains it every
+    BOT_POLL_MS and only touches the tiles that changed.
+    """
+    def __init__(self, master, port, host="127.0.0.1"):
+        import queue, socket, threading
+        self.events = queue.SimpleQueue()
+        self.sock = socket.create_connection((host, port), timeout=5)
+        self.sock.settimeout(None)
+        self.win = tk.Toplevel(master)
+        self.win.title(f"WorDuel Spectator ({host}:{port})")
+        THEMES.style(self.win, "surface")
+        self.status = THEMES.style(tk.Label(self.win, text="Waiting for a duel…", font=("Helvetica", 12)), "label.muted")
+        self.status.pack(pady=10)
+        self.body = THEMES.style(tk.Frame(self.win), "surface")
+        self.body.pack(padx=10, pady=10)
+        self.boards = [] # Per player: (tile rows, status label)
+        self.duel = None
+        threading.Thread(target=self._read, name="worduel-spectate", daemon=True).start()
+        self.win.after(BOT_POLL_MS, self._poll)
+
+    def _read(self):
+        # Reader thread: no Tk calls in here
+        import json
+        try:
+            for line in self.sock.makefile("rb"): self.events.put(json.loads(line))
+        except (OSError, ValueError): pass
+        self.events.put({"type": "closed"})
+
+    def _poll(self):
+        if not self.win.winfo_exists(): return
+        while not self.events.empty(): self._handle(self.events.get())
+        self.win.after(BOT_POLL_MS, self._poll)
+
+    def _handle(self, ev):
+        kind = ev["type"]
+        if kind == "closed":
+            self.status.config(text="Broadcast ended.")
+            return
+        if kind == "snapshot":
+            self._rebuild(ev["duel"])
+            return
+        if kind == "start":
+            self._rebuild({"names": ev["names"], "length": ev["length"], "boards": [[] for _ in ev["names"]],
+                           "results": [None] * len(ev["names"]), "active": ev.get("active"), "over": False})
+            return
+        if self.duel is None: return
+        if kind == "guess":
+            board = self.duel["boards"][ev["player"]]
+            board.append([ev["word"], ev["colors"]])
+            self._paint_row(ev["player"], len(board) - 1, ev["word"], ev["colors"])
+        elif kind == "finish":
+            self.duel["results"][ev["player"]] = [ev["attempts"], ev["guessed"]]
+        elif kind == "over":
+            self.duel.update(over=True, secrets=ev["secrets"], ranking=ev["ranking"])
+        if "active" in ev: self.duel["active"] = ev["active"]
+        self._paint_status()
+
+    def _rebuild(self, duel):
+        self.duel = duel
+        for w in self.body.winfo_children(): w.destroy()
+        self.boards = []
+        if duel is None:
+            self.status.config(text="Waiting for a duel…")
+            return
+        cols = min(len(duel["names"]), DUEL_PANELS_PER_ROW)
+        for i, name in enumerate(duel["names"]):
+            col = THEMES.style(tk.Frame(self.body, padx=10), "surface")
+            col.grid(row=i // cols, column=i % cols, sticky="n")
+            THEMES.style(tk.Label(col, text=name, font=("Helvetica", 14, "bold")), "label").pack(pady=5)
+            grid = THEMES.style(tk.Frame(col), "surface")
+            grid.pack()
+            rows = []
+            for r in range(MAX_ATTEMPTS):
+                row = []
+                for c in range(duel["length"]):
+                    lbl = THEMES.style(tk.Label(grid, text="", width=3, height=1, relief="flat",
+                                                font=("Helvetica", 12, "bold")), "tile.empty")
+                    lbl.grid(row=r, column=c, padx=2, pady=2)
+                    row.append(lbl)
+                rows.append(row)
+            status = THEMES.style(tk.Label(col, font=("Arial", 9)), "label.muted")
+            status.pack(pady=4)
+            self.boards.append((rows, status))
+            for r, (word, colors) in enumerate(duel["boards"][i]): self._paint_row(i, r, word, colors)
+        self._paint_status()
+
+    def _paint_row(self, player, r, word, colors):
+        rows = self.boards[player][0]
+        if r >= len(rows): return
+        for lbl, ch, col in zip(rows[r], word, colors): THEMES.style(lbl, "tile." + col, text=ch.upper())
+
+    def _paint_status(self):
+        d = self.duel
+        for i, (_, status) in enumerate(self.boards):
+            res = d["results"][i]
+            if res: text = f"Solved in {res[0]}" if res[1] else "Out of guesses"
+            elif d.get("active") == i: text = "Guessing…"
+            else: text = f"Left: {MAX_ATTEMPTS - len(d['boards'][i])}"
+            if d.get("over") and d.get("secrets"): text += f" · word: {d['secrets'][i].upper()}"
+            status.config(text=text)
+        if d.get("over"):
+            best = d["results"][d["ranking"][0]]
+            winners = [i for i in d["ranking"] if d["results"][i] == best] if best and best[1] else []
+            if not winners: text = "Duel over: nobody solved it."
+            elif len(winners) > 1: text = "Duel over: it's a tie!"
+            else: text = f"Duel over: {d['names'][winners[0]]} wins!"
+            self.status.config(text=text)
+        else:
+            self.status.config(text="Live duel" + (f" · {d['names'][d['active']]} to play" if d.get("active") is not None else ""))
+
 # ---------------------------------------------------------
 # CHARACTER CREATOR (Cuter)
 # ---------------------------------------------------------
@@ -644,6 +2970,7 @@ class InlinePopupCharacterCreator:
         self.parent = parent_frame
         self.on_done = on_done
         self.available_bases, self.available_exprs, self.available_outfits = find_layer_files()
+        STARTUP.mark("asset scan")
         
         self.username_var = tk.StringVar(value=initial_name)
         # Ensure initial keys exist in their respective lists if they are found
@@ -654,62 +2981,58 @@ class InlinePopupCharacterCreator:
         self.tk_cache = {}
 
         # The grey frame acts as a subtle shadow/border
-        self.popup = tk.Frame(self.parent, bg=THEME["grey"], bd=0)
+        self.popup = THEMES.style(tk.Frame(self.parent, bd=0), "border")
         # MODIFICATION: Keeps the reduced size from the previous step.
         self.popup.place(relx=0.5, rely=0.5, anchor="center", width=450, height=470)
         
-        self.card = tk.Frame(self.popup, bg="white")
+        self.card = THEMES.style(tk.Frame(self.popup), "card")
         # Added padding inside the grey container for a more prominent border/shadow effect
         self.card.pack(fill="both", expand=True, padx=4, pady=4) 
 
-        tk.Label(self.card, text="Design Your Character", bg="white", fg=THEME["primary"], font=("Helvetica", 16, "bold")).pack(pady=(20,10))
+        THEMES.style(tk.Label(self.card, text="Design Your Character", font=("Helvetica", 16, "bold")), "card.title").pack(pady=(20,10))
 
-        content = tk.Frame(self.card, bg="white")
+        content = THEMES.style(tk.Frame(self.card), "card")
         content.pack(fill="both", expand=True, padx=20, pady=5)
 
         # Name
-        uname_frame = tk.Frame(content, bg="white")
+        uname_frame = THEMES.style(tk.Frame(content), "card")
         uname_frame.pack(pady=(5, 15))
-        tk.Label(uname_frame, text="Name:", bg="white", font=("Helvetica", 11), fg=THEME["muted"]).pack(side="left", padx=(0,8))
-        tk.Entry(uname_frame, textvariable=self.username_var, width=18, font=("Helvetica", 12), 
-                 relief="flat", bg=THEME["bg"]).pack(side="left", ipady=4)
+        THEMES.style(tk.Label(uname_frame, text="Name:", font=("Helvetica", 11)), "card.label").pack(side="left", padx=(0,8))
+        THEMES.style(tk.Entry(uname_frame, textvariable=self.username_var, width=18, font=("Helvetica", 12), 
+                              relief="flat"), "entry.soft").pack(side="left", ipady=4)
 
         # Toggles
-        toggles = tk.Frame(content, bg="white")
+        toggles = THEMES.style(tk.Frame(content), "card")
         toggles.pack(pady=(0,10))
         self.toggle_buttons = {}
         for cat in ("base", "expr", "outfit"):
-            # Added activebackground for solid button feel
             b = tk.Button(toggles, text=cat.capitalize(), width=8, font=("Helvetica", 10, "bold"),
-                          relief="flat", bd=0, activebackground=THEME["primary_hover"], 
-                          command=lambda c=cat: self._set_active_category(c))
+                          relief="flat", bd=0, command=lambda c=cat: self._set_active_category(c))
             b.pack(side="left", padx=5)
             self.toggle_buttons[cat] = b
         self._highlight_active_toggle()
 
         # Preview
-        pv = tk.Frame(content, bg="white")
+        pv = THEMES.style(tk.Frame(content), "card")
         pv.pack()
         
-        tk.Button(pv, text="❮", font=("Arial", 14), width=3, bg="white", relief="flat", activebackground=THEME["grey"], 
-                  command=lambda: self._cycle_active(-1)).grid(row=0, column=0, padx=10)
+        THEMES.style(tk.Button(pv, text="❮", font=("Arial", 14), width=3, relief="flat", 
+                               command=lambda: self._cycle_active(-1)), "button.plain").grid(row=0, column=0, padx=10)
         
-        self.preview_label_img = tk.Label(pv, bg="white")
+        self.preview_label_img = THEMES.style(tk.Label(pv), "card")
         self.preview_label_img.grid(row=0, column=1)
-        self.preview_canvas = tk.Canvas(pv, width=DISPLAY_SIZE, height=DISPLAY_SIZE, bg="white", highlightthickness=0)
+        self.preview_canvas = THEMES.style(tk.Canvas(pv, width=DISPLAY_SIZE, height=DISPLAY_SIZE, highlightthickness=0), "card")
         # Use label if PIL available, else canvas
         if not PIL_AVAILABLE: self.preview_canvas.grid(row=0, column=1)
             
-        tk.Button(pv, text="❯", font=("Arial", 14), width=3, bg="white", relief="flat", activebackground=THEME["grey"],
-                  command=lambda: self._cycle_active(1)).grid(row=0, column=2, padx=10)
+        THEMES.style(tk.Button(pv, text="❯", font=("Arial", 14), width=3, relief="flat",
+                               command=lambda: self._cycle_active(1)), "button.plain").grid(row=0, column=2, padx=10)
 
         # Actions
-        action_row = tk.Frame(content, bg="white")
+        action_row = THEMES.style(tk.Frame(content), "card")
         action_row.pack(side="bottom", pady=(10, 20))
-        # Added activebackground for Save button
-        tk.Button(action_row, text="Save & Continue", font=("Helvetica", 12, "bold"), 
-                  bg=THEME["primary"], fg="white", relief="flat", activebackground=THEME["primary_hover"], 
-                  padx=20, pady=6, command=self._submit).pack(side="left", padx=10)
+        THEMES.style(tk.Button(action_row, text="Save & Continue", font=("Helvetica", 12, "bold"), relief="flat", 
+                               padx=20, pady=6, command=self._submit), "button.primary").pack(side="left", padx=10)
 
         self._redraw_preview()
 
@@ -726,10 +3049,7 @@ class InlinePopupCharacterCreator:
     def _highlight_active_toggle(self):
         # CHANGE: Use secondary color for inactive state for a more finished look
         for c, b in self.toggle_buttons.items():
-            if c == self.active_category: 
-                b.config(bg=THEME["primary"], fg="white")
-            else: 
-                b.config(bg=THEME["secondary"], fg=THEME["text_main"])
+            THEMES.style(b, "button.primary" if c == self.active_category else "button.secondary")
 
     def _cycle_active(self, delta):
         lst = self._get_list(self.active_category)
@@ -765,6 +3085,10 @@ class InlinePopupCharacterCreator:
             })
 
     def _redraw_preview(self):
+        with METRICS.timer("preview_redraw_ms"):
+            self._redraw_preview_now()
+
+    def _redraw_preview_now(self):
         # Temp profile for drawing
         prof = {"color": self.color_key, "expression": self.expr_key, "outfit": self.outfit_key}
         if PIL_AVAILABLE:
@@ -773,11 +3097,8 @@ class InlinePopupCharacterCreator:
             expr_p = self.available_exprs.get(self.expr_key)
             outfit_p = self.available_outfits.get(self.outfit_key)
             
-            base_im = load_and_prepare_image(base_p)
-            expr_im = load_and_prepare_image(expr_p)
-            outfit_im = load_and_prepare_image(outfit_p)
-            # Use the global compose_layers which is designed to stack Base -> Outfit -> Expression
-            comp = compose_layers(base_im, outfit_im, expr_im)
+            # Stacks Base -> Outfit -> Expression (cached per layer combination)
+            comp = get_composed_avatar(base_p, outfit_p, expr_p)
             
             if comp:
                 tkimg = ImageTk.PhotoImage(comp)
@@ -792,6 +3113,91 @@ class InlinePopupCharacterCreator:
         self.preview_canvas.grid()
         draw_profile_avatar(self.preview_canvas, prof, DISPLAY_SIZE, DISPLAY_SIZE)
 
+# ---------------------------------------------------------
+# METRICS DEBUG OVERLAY
+# ---------------------------------------------------------
+class MetricsOverlay:
+    """Small always-on-top window listing live counters and latency percentiles."""
+    REFRESH_MS = 500
+
+    def __init__(self, master):
+        self.win = tk.Toplevel(master)
+        self.win.title("WorDuel Metrics")
+        THEMES.style(self.win, "surface")
+        self.win.attributes("-topmost", True)
+        self.text = THEMES.style(tk.Label(self.win, text="", justify="left", anchor="nw", font=("Courier", 9)), "label")
+        self.text.pack(fill="both", expand=True, padx=10, pady=10)
+        self._refresh()
+
+    def _refresh(self):
+        if not self.win.winfo_exists(): return
+        snap = METRICS.snapshot()
+        lines = [f"{k:<24}{v:>8}" for k, v in sorted(snap["counters"].items())]
+        lines.append("")
+        lines.append(f"{'ms':<24}{'n':>6}{'p50':>8}{'p95':>8}{'p99':>8}{'max':>9}")
+        for k, h in sorted(snap["histograms_ms"].items()):
+            lines.append(f"{k:<24}{h['count']:>6}{h['p50']:>8}{h['p95']:>8}{h['p99']:>8}{h['max']:>9}")
+        self.text.config(text="\n".join(lines))
+        self.win.after(self.REFRESH_MS, self._refresh)
+
+# ---------------------------------------------------------
+# VIEW CACHE
+# ---------------------------------------------------------
+class ViewManager:
+    """Shows one screen at a time inside parent, building each screen only once.
+
+    show(key, build) packs the cached frame for key, or makes a new frame and calls
+    build(frame) to fill it. build may return a reset() callable, run every time the
+    screen is shown again so it starts from a clean state. At most capacity screens stay
+    alive; the least recently shown one is destroyed to make room. Transient screens
+    (one-off boards and forms) are destroyed as soon as another screen is shown.
+    """
+    def __init__(self, parent, capacity=VIEW_CACHE_SIZE):
+        self.parent = parent
+        self.capacity = capacity
+        self.current = None
+        self._views = OrderedDict() # key -> (frame, reset), least recently shown first
+        self._transient = set()
+
+    def show(self, key, build, fresh=False, transient=False):
+        """Switches to the screen for key; fresh=True throws away any cached copy first."""
+        with METRICS.timer("view_switch_ms"):
+            if fresh: self.discard(key)
+            prev = self.current
+            if prev is not None and prev != key and prev in self._views:
+                if prev in self._transient: self.discard(prev)
+                else: self._views[prev][0].pack_forget()
+            entry = self._views.get(key)
+            if entry is not None:
+                METRICS.inc("view_cache_hits")
+                self._views.move_to_end(key)
+                frame, reset = entry
+                if reset: reset()
+            else:
+                METRICS.inc("view_cache_misses")
+                frame = THEMES.style(tk.Frame(self.parent), "surface")
+                self._views[key] = (frame, build(frame))
+                if transient: self._transient.add(key)
+                self._evict(keep=key)
+            frame.pack(fill="both", expand=True)
+            self.current = key
+        return frame
+
+    def frame(self, key):
+        entry = self._views.get(key)
+        return entry[0] if entry else None
+
+    def discard(self, key):
+        entry = self._views.pop(key, None)
+        self._transient.discard(key)
+        if entry: entry[0].destroy()
+        if self.current == key: self.current = None
+
+    def _evict(self, keep):
+        for key in list(self._views):
+            if len(self._views) <= self.capacity: break
+            if key != keep: self.discard(key)
+
 # ---------------------------------------------------------
 # MAIN APP
 # ---------------------------------------------------------
@@ -799,310 +3205,661 @@ class MainApp:
     def __init__(self, root, profile=None):
         self.root = root
         self.profile = profile or {}
-        self.profile_p2 = {} # <<< ADDED: Profile for Player 2 (Local Duel Opponent)
+        self.duel_profiles = [] # Profiles for every local duel player (P1 first)
+        self.broadcast = None # DuelBroadcaster for spectators (--broadcast PORT)
+        prefetch_leaderboard()
+        self.tk_cache = {}
         self.root.title("WorDuel")
-        self.root.configure(bg=THEME["bg"])
+        THEMES.style(self.root, "surface")
         try: root.state('zoomed')
         except: pass
 
-        self.frame = tk.Frame(root, bg=THEME["bg"])
+        self.frame = THEMES.style(tk.Frame(root), "surface")
         self.frame.pack(fill="both", expand=True)
 
         # Header
-        header = tk.Frame(self.frame, bg=THEME["bg"])
+        header = THEMES.style(tk.Frame(self.frame), "surface")
         header.pack(pady=(20, 10))
-        tk.Label(header, text="WorDuel", bg=THEME["bg"], fg=THEME["primary"], font=("Helvetica", 32, "bold")).pack()
+        THEMES.style(tk.Label(header, text="WorDuel", font=("Helvetica", 32, "bold")), "label.title").pack()
 
         # Nav
-        nav = tk.Frame(self.frame, bg=THEME["bg"])
+        nav = THEMES.style(tk.Frame(self.frame), "surface")
         nav.pack(pady=10)
-        # CHANGE: Use THEME["secondary"] for nav buttons for a more solid feel
-        self.btn_std = tk.Button(nav, text="Single Player", font=("Helvetica", 12, "bold"), width=15, height=2,
-                  bg=THEME["secondary"], fg=THEME["text_main"], relief="flat", activebackground=THEME["primary_hover"], 
-                  command=self.start_standard_flow)
+        # CHANGE: Use the secondary style for nav buttons for a more solid feel
+        self.btn_std = THEMES.style(tk.Button(nav, text="Single Player", font=("Helvetica", 12, "bold"), width=15, height=2,
+                                              relief="flat", command=self.start_standard_flow), "button.secondary")
         self.btn_std.grid(row=0, column=0, padx=10)
         
-        self.btn_duel = tk.Button(nav, text="Duel Mode", font=("Helvetica", 12, "bold"), width=15, height=2,
-                  bg=THEME["secondary"], fg=THEME["text_main"], relief="flat", activebackground=THEME["primary_hover"],
-                  command=self.open_duel_options)
+        self.btn_duel = THEMES.style(tk.Button(nav, text="Duel Mode", font=("Helvetica", 12, "bold"), width=15, height=2,
+                                               relief="flat", command=self.open_duel_options), "button.secondary")
         self.btn_duel.grid(row=0, column=1, padx=10)
 
+        # Palette switch (pastel / high contrast); restyles every open window in place
+        THEMES.style(tk.Button(nav, text="◐", font=("Helvetica", 14), width=3, height=1, relief="flat", bd=0,
+                               command=self.toggle_theme), "button.link").grid(row=0, column=2, padx=10)
+
         # Main Content
-        self.center_frame = tk.Frame(self.frame, bg=THEME["bg"])
+        self.center_frame = THEMES.style(tk.Frame(self.frame), "surface")
         self.center_frame.pack(fill="both", expand=True, padx=20, pady=10)
+        self.views = ViewManager(self.center_frame)
         
         self.link_entry = None
+        self.inbox = LinkInbox()
+        self._inbox_watch = None   # "Watch clipboard" BooleanVar, once the inbox screen exists
+        self._inbox_refresh = None # Redraws the inbox screen's rows
+        self._inbox_clip = None    # Clipboard text the poll last saw
+        self._inbox_job = None
         self._main_avatar_tk = None # Keep ref
+        self.metrics_overlay = None
+        if METRICS.enabled: self.root.bind_all("<F12>", lambda e: self.toggle_metrics_overlay())
 
         # Show creator first (for P1)
-        InlinePopupCharacterCreator(self.center_frame, on_done=self.on_profile_created, initial_name="Player 1")
+        self._show_creator(self.on_profile_created, "Player 1")
+
+    def toggle_metrics_overlay(self):
+        if self.metrics_overlay and self.metrics_overlay.win.winfo_exists():
+            self.metrics_overlay.win.destroy()
+            self.metrics_overlay = None
+        else:
+            self.metrics_overlay = MetricsOverlay(self.root)
+
+    def toggle_theme(self):
+        THEMES.cycle()
+
+    def _show_creator(self, on_done, initial_name, heading=None):
+        def build(frame):
+            if heading: THEMES.style(tk.Label(frame, text=heading, font=("Helvetica", 16, "bold")), "label").pack(pady=10)
+            InlinePopupCharacterCreator(frame, on_done=on_done, initial_name=initial_name)
+        # One-off screen: every creator starts from scratch
+        self.views.show("creator", build, fresh=True, transient=True)
 
     def on_profile_created(self, profile):
         self.profile = profile
         self.setup_main_menu()
 
     def setup_main_menu(self):
-        for w in self.center_frame.winfo_children(): w.destroy()
-        
+        self.views.show("menu", self._build_main_menu)
+
+    def _build_main_menu(self, frame):
         # Link Input
-        link_frame = tk.Frame(self.center_frame, bg=THEME["bg"])
+        link_frame = THEMES.style(tk.Frame(frame), "surface")
         link_frame.pack(pady=(10, 20))
-        tk.Label(link_frame, text="Have a duel link?", bg=THEME["bg"], fg=THEME["muted"]).pack(anchor="w", padx=5)
+        THEMES.style(tk.Label(link_frame, text="Have a duel link?"), "label.muted").pack(anchor="w", padx=5)
         
-        inp_box = tk.Frame(link_frame, bg="white", padx=5, pady=5)
+        inp_box = THEMES.style(tk.Frame(link_frame, padx=5, pady=5), "card")
         inp_box.pack()
-        self.link_entry = tk.Entry(inp_box, width=50, relief="flat", font=("Helvetica", 10))
+        self.link_entry = THEMES.style(tk.Entry(inp_box, width=50, relief="flat", font=("Helvetica", 10)), "entry")
         self.link_entry.pack(side="left", padx=5)
-        # CHANGE: Increased font/padding and added activebackground for a more solid feel
-        tk.Button(inp_box, text="JOIN", bg=THEME["primary"], fg="white", font=("Helvetica", 10, "bold"), 
-                  relief="flat", activebackground=THEME["primary_hover"], padx=10, pady=2,
-                  command=self._join_from_box).pack(side="left")
+        # CHANGE: Increased font/padding for a more solid feel
+        THEMES.style(tk.Button(inp_box, text="JOIN", font=("Helvetica", 10, "bold"), relief="flat", padx=10, pady=2,
+                               command=self._join_from_box), "button.primary").pack(side="left")
 
         # Avatar Display
-        if self.profile:
-            prof_frame = tk.Frame(self.center_frame, bg=THEME["bg"])
-            prof_frame.pack(pady=10)
-            
-            canv = tk.Canvas(prof_frame, width=200, height=200, bg=THEME["bg"], highlightthickness=0)
-            canv.pack()
-            draw_profile_avatar(canv, self.profile, 200, 200)
-            
-            # MODIFICATION: Display "Haii <username>" here.
-            username = self.profile.get("username", "Player")
-            tk.Label(prof_frame, text=f"Haii {username}", 
-                     bg=THEME["bg"], fg=THEME["text_main"], font=("Helvetica", 14, "bold")).pack(pady=5)
+        prof_frame = THEMES.style(tk.Frame(frame), "surface")
+        prof_frame.pack(pady=10)
+        canv = THEMES.style(tk.Canvas(prof_frame, width=200, height=200, highlightthickness=0), "surface")
+        canv.pack()
+        # MODIFICATION: Display "Haii <username>" here.
+        name_lbl = THEMES.style(tk.Label(prof_frame, font=("Helvetica", 14, "bold")), "label")
+        name_lbl.pack(pady=5)
+
+        THEMES.style(tk.Button(frame, text="Inbox", relief="flat", bd=0,
+                               command=self.show_inbox), "button.link").pack()
+        THEMES.style(tk.Button(frame, text="Stats", relief="flat", bd=0,
+                               command=self.show_stats), "button.link").pack()
+        THEMES.style(tk.Button(frame, text="Leaderboard", relief="flat", bd=0,
+                               command=self.show_leaderboard), "button.link").pack()
+
+        shown = {}
+        def reset():
+            self.link_entry.delete(0, tk.END)
+            # Only redraw the avatar when the profile changed since it was last drawn
+            if shown.get("profile") is not self.profile:
+                shown["profile"] = self.profile
+                draw_profile_avatar(canv, self.profile, 200, 200)
+                name_lbl.config(text=f"Haii {self.profile.get('username', 'Player')}")
+        reset()
+        return reset
+
+    def show_stats(self):
+        self.views.show("stats", self._build_stats)
+
+    def _build_stats(self, frame):
+        THEMES.style(tk.Label(frame, text="Response Times (this session)", font=("Helvetica", 14, "bold")), "label").pack(pady=15)
+        body = THEMES.style(tk.Frame(frame), "surface")
+        body.pack()
+        THEMES.style(tk.Button(frame, text="Back", relief="flat", bd=0,
+                               command=self.setup_main_menu), "button.link").pack(pady=10)
+
+        def reset():
+            # The numbers change every game, so only the table is rebuilt
+            for w in body.winfo_children(): w.destroy()
+            rows = TELEMETRY.summary()
+            if not rows:
+                THEMES.style(tk.Label(body, text="No guesses yet. Go play!"), "label.muted").pack(pady=10)
+                return
+            table = THEMES.style(tk.Frame(body), "surface")
+            table.pack(pady=10)
+            headers = ("Player", "Letters", "Guesses", "Think p50", "p95", "p99", "Render p50", "p95", "p99")
+            for c, h in enumerate(headers):
+                THEMES.style(tk.Label(table, text=h, font=("Helvetica", 10, "bold")), "label.muted").grid(row=0, column=c, padx=8)
+            fmt = lambda v, scale, unit: "-" if v is None else f"{v / scale:.1f}{unit}"
+            for r, ((player, length), m) in enumerate(rows.items(), 1):
+                think = m.get("think_ms", {})
+                render = m.get("render_ms", {})
+                cells = (player, length, think.get("n", 0),
+                         *(fmt(think.get(q), 1000, "s") for q in ("p50", "p95", "p99")),
+                         *(fmt(render.get(q), 1, "ms") for q in ("p50", "p95", "p99")))
+                for c, v in enumerate(cells):
+                    THEMES.style(tk.Label(table, text=v), "label").grid(row=r, column=c, padx=8)
+        reset()
+        return reset
+
+    def show_leaderboard(self):
+        self.views.show("leaderboard", self._build_leaderboard)
+
+    def _build_leaderboard(self, frame):
+        THEMES.style(tk.Label(frame, text="Leaderboard", font=("Helvetica", 14, "bold")), "label").pack(pady=15)
+        body = THEMES.style(tk.Frame(frame), "surface")
+        body.pack()
+        THEMES.style(tk.Button(frame, text="Back", relief="flat", bd=0,
+                               command=self.setup_main_menu), "button.link").pack(pady=10)
+
+        def reset():
+            # Ratings change after every duel, so only the table is rebuilt
+            for w in body.winfo_children(): w.destroy()
+            board = get_leaderboard()
+            if board is None:
+                THEMES.style(tk.Label(body, text="Loading ratings…"), "label.muted").pack(pady=10)
+                self._with_leaderboard(lambda board: body.winfo_exists() and reset())
+                return
+            if not board.ratings:
+                THEMES.style(tk.Label(body, text="No duels yet. Challenge someone!"), "label.muted").pack(pady=10)
+                return
+            me = _history_name(self.profile.get("username", "Player")) # As the board stores it
+            rows = board.top()
+            mine = board.rank(me)
+            if mine is not None and mine > len(rows):
+                rows += [None] + [r for r in board.around(me, 3) if r[0] > len(rows)] # None: a gap
+            table = THEMES.style(tk.Frame(body), "surface")
+            table.pack(pady=10)
+            for c, h in enumerate(("#", "Player", "Rating", "Duels", "Wins")):
+                THEMES.style(tk.Label(table, text=h, font=("Helvetica", 10, "bold")), "label.muted").grid(row=0, column=c, padx=8)
+            for r, row in enumerate(rows, 1):
+                if row is None:
+                    THEMES.style(tk.Label(table, text="…"), "label.muted").grid(row=r, column=0)
+                    continue
+                place, name, rating, games, wins = row
+                font = ("Helvetica", 10, "bold") if name == me else ("Helvetica", 10)
+                for c, v in enumerate((place, name, f"{rating:.0f}", games, wins)):
+                    THEMES.style(tk.Label(table, text=v, font=font), "label").grid(row=r, column=c, padx=8)
+            THEMES.style(tk.Label(body, text=f"{len(board.ratings)} rated players"), "label.muted").pack()
+        reset()
+        return reset
+
+    def _with_leaderboard(self, fn):
+        """Calls fn(board) once the ratings have been rebuilt; polls so Tk never waits on it."""
+        board = get_leaderboard()
+        if board is not None: fn(board)
+        else: self.root.after(BOT_POLL_MS, lambda: self._with_leaderboard(fn))
 
     def start_standard_flow(self):
-        for w in self.center_frame.winfo_children(): w.destroy()
-        tk.Label(self.center_frame, text="How many letters?", bg=THEME["bg"], fg=THEME["muted"], font=("Helvetica", 14)).pack(pady=15)
+        self.views.show("standard", self._build_standard_flow)
+
+    def _build_standard_flow(self, frame):
+        THEMES.style(tk.Label(frame, text="How many letters?", font=("Helvetica", 14)), "label.muted").pack(pady=15)
         
         len_var = tk.IntVar(value=5)
-        spin = tk.Spinbox(self.center_frame, from_=3, to=7, textvariable=len_var, width=5, font=("Helvetica", 16), relief="flat", justify="center")
+        spin = THEMES.style(tk.Spinbox(frame, from_=3, to=7, textvariable=len_var, width=5, font=("Helvetica", 16), relief="flat", justify="center"), "spinbox")
         spin.pack(pady=10, ipady=5)
+
+        # Secret word difficulty, from the precomputed ratings in difficulty.bin
+        tier_row = THEMES.style(tk.Frame(frame), "surface")
+        tier_row.pack(pady=5)
+        THEMES.style(tk.Label(tier_row, text="Word difficulty:"), "label.muted").pack(side="left", padx=5)
+        tier_var = tk.StringVar(value="Any")
+        THEMES.style(tk.OptionMenu(tier_row, tier_var, *DIFFICULTY_TIERS), "button.secondary",
+                     relief="flat", highlightthickness=0).pack(side="left", padx=5)
+
+        hard_var = tk.BooleanVar(value=False)
+        THEMES.style(tk.Checkbutton(frame, text="Hard mode (use every hint)", variable=hard_var,
+                                    relief="flat"), "check").pack()
         
-        tk.Button(self.center_frame, text="START GAME", bg=THEME["primary"], fg="white", 
-                  font=("Helvetica", 12, "bold"), relief="flat", activebackground=THEME["primary_hover"], padx=20, pady=10,
-                  command=lambda: self._start_standard(len_var.get())).pack(pady=20)
+        THEMES.style(tk.Button(frame, text="START GAME", font=("Helvetica", 12, "bold"), relief="flat", padx=20, pady=10,
+                               command=lambda: self._start_standard(len_var.get(), hard_var.get(), tier_var.get())), "button.primary").pack(pady=20)
         
-        # Changed back button style to have an active foreground color
-        tk.Button(self.center_frame, text="Back", bg=THEME["bg"], fg=THEME["muted"], relief="flat", bd=0, activeforeground=THEME["text_main"],
-                  command=self.setup_main_menu).pack()
+        THEMES.style(tk.Button(frame, text="Back", relief="flat", bd=0,
+                               command=self.setup_main_menu), "button.link").pack()
+        return lambda: (len_var.set(5), hard_var.set(False), tier_var.set("Any"))
 
-    def _start_standard(self, length):
-        secret = random.choice(WORDS_BY_LENGTH.get(length, WORDS_BY_LENGTH[5]))
+    def _start_standard(self, length, hard_mode=False, tier="Any"):
+        if length not in WORDS_BY_LENGTH: length = 5
+        secret = get_difficulty_picker().pick(length, tier)
         # Pass profile so standard game can show avatar on win
-        SingleGameWindow(self.root, secret, length, self.profile)
+        SingleGameWindow.acquire(self.root, secret, length, self.profile, hard_mode=hard_mode,
+                                 on_play_again=lambda: self._start_standard(length, hard_mode, tier))
 
     def open_duel_options(self):
-        for w in self.center_frame.winfo_children(): w.destroy()
-        
-        opt_frame = tk.Frame(self.center_frame, bg=THEME["bg"])
+        self.views.show("duel_options", self._build_duel_options)
+
+    def _build_duel_options(self, frame):
+        opt_frame = THEMES.style(tk.Frame(frame), "surface")
         opt_frame.pack(pady=20)
         
-        tk.Button(opt_frame, text="Local Duel (Same PC)", width=30, height=2, bg="white", relief="flat", activebackground=THEME["grey"], font=("Helvetica", 11),
-                  command=self.duel_same_device_setup).pack(pady=10)
+        THEMES.style(tk.Button(opt_frame, text="Local Duel (Same PC)", width=30, height=2, relief="flat", font=("Helvetica", 11),
+                               command=self.duel_same_device_setup), "button.plain").pack(pady=10)
         
-        tk.Button(opt_frame, text="Create Link (Send to Friend)", width=30, height=2, bg="white", relief="flat", activebackground=THEME["grey"], font=("Helvetica", 11),
-                  command=self.duel_share_link_setup).pack(pady=10)
+        THEMES.style(tk.Button(opt_frame, text="Create Link (Send to Friend)", width=30, height=2, relief="flat", font=("Helvetica", 11),
+                               command=self.duel_share_link_setup), "button.plain").pack(pady=10)
         
-        # Changed back button style to have an active foreground color
-        tk.Button(self.center_frame, text="Back", bg=THEME["bg"], fg=THEME["muted"], relief="flat", bd=0, activeforeground=THEME["text_main"],
-                  command=self.setup_main_menu).pack()
+        THEMES.style(tk.Button(frame, text="Back", relief="flat", bd=0,
+                               command=self.setup_main_menu), "button.link").pack()
 
     # ---------------------------
     # SAME DEVICE DUEL LOGIC
     # ---------------------------
-    # NEW: Initiates P2 setup before word input
+    # Asks how many players share the PC, then creates a character for each extra player
     def duel_same_device_setup(self):
-        self._start_p2_creator_for_duel()
+        self.views.show("duel_setup", self._build_duel_setup)
+
+    def _build_duel_setup(self, frame):
+        THEMES.style(tk.Label(frame, text="How many players?", font=("Helvetica", 14)), "label.muted").pack(pady=15)
+
+        count_var = tk.IntVar(value=2)
+        spin = THEMES.style(tk.Spinbox(frame, from_=2, to=MAX_DUEL_PLAYERS, textvariable=count_var, width=5, font=("Helvetica", 16), relief="flat", justify="center"), "spinbox")
+        spin.pack(pady=10, ipady=5)
+
+        # Computer opponents fill the last seats
+        bot_row = THEMES.style(tk.Frame(frame), "surface")
+        bot_row.pack(pady=10)
+        THEMES.style(tk.Label(bot_row, text="Bots:"), "label.muted").pack(side="left", padx=5)
+        bots_var = tk.IntVar(value=0)
+        THEMES.style(tk.Spinbox(bot_row, from_=0, to=MAX_DUEL_PLAYERS - 1, textvariable=bots_var, width=3, relief="flat", justify="center"),
+                     "spinbox").pack(side="left", padx=5)
+        level_var = tk.StringVar(value="Medium")
+        THEMES.style(tk.OptionMenu(bot_row, level_var, *BOT_LEVELS.keys()), "button.secondary",
+                     relief="flat", highlightthickness=0).pack(side="left", padx=5)
+
+        hard_var = tk.BooleanVar(value=False)
+        THEMES.style(tk.Checkbutton(frame, text="Hard mode (use every hint)", variable=hard_var,
+                                    relief="flat"), "check").pack()
+
+        THEMES.style(tk.Button(frame, text="NEXT", font=("Helvetica", 12, "bold"), relief="flat", padx=20, pady=10,
+                               command=lambda: self._begin_duel_roster(count_var.get(), bots_var.get(), level_var.get(), hard_var.get())),
+                     "button.primary").pack(pady=20)
+
+        THEMES.style(tk.Button(frame, text="Back", command=self.open_duel_options, relief="flat", bd=0), "button.link").pack()
+        return lambda: (count_var.set(2), bots_var.set(0), level_var.set("Medium"), hard_var.set(False))
+
+    def _begin_duel_roster(self, count, bots=0, level="Medium", hard_mode=False):
+        self.duel_hard_mode = hard_mode
+        self.duel_player_count = max(2, min(MAX_DUEL_PLAYERS, count))
+        # P1 is always the main (human) profile
+        self.duel_bot_count = max(0, min(self.duel_player_count - 1, bots))
+        self.duel_bot_level = level
+        self.duel_profiles = [self.profile]
+        self._start_next_creator_for_duel()
+
+    # Opens the creator for the next human player that still needs a profile
+    def _start_next_creator_for_duel(self):
+        idx = len(self.duel_profiles) + 1
+        if idx > self.duel_player_count - self.duel_bot_count:
+            for i in range(idx, self.duel_player_count + 1):
+                self.duel_profiles.append(self._make_bot_profile(i))
+            self._setup_local_duel_word_input()
+            return
+        self._show_creator(self._on_duel_profile_created, f"Player {idx}", heading=f"Player {idx}: Design Your Opponent")
+
+    def _on_duel_profile_created(self, profile):
+        self.duel_profiles.append(profile)
+        self._start_next_creator_for_duel()
+
+    def _make_bot_profile(self, idx):
+        bases, exprs, outfits = find_layer_files()
+        pick = lambda d, default: random.choice(list(d.keys())) if d else default
+        return {"username": f"Bot {idx} ({self.duel_bot_level})", "bot": self.duel_bot_level,
+                "color": pick(bases, "default"), "expression": pick(exprs, "smile"), "outfit": pick(outfits, "casual")}
 
-    # NEW: Opens the creator for P2
-    def _start_p2_creator_for_duel(self):
-        for w in self.center_frame.winfo_children(): w.destroy()
-        tk.Label(self.center_frame, text="Player 2: Design Your Opponent", bg=THEME["bg"], font=("Helvetica", 16, "bold")).pack(pady=10)
-        # Use P2 default name
-        InlinePopupCharacterCreator(self.center_frame, on_done=self._on_p2_profile_created, initial_name="Player 2")
+    def _pick_bot_secret(self, length):
+        pool = [w for w in WORDS_BY_LENGTH.get(length, []) if not VALID_WORDS or w in VALID_WORDS]
+        if not pool: pool = words_of_length(length)
+        return random.choice(pool)
 
-    # NEW: Callback after P2 creation, proceeds to word input
-    def _on_p2_profile_created(self, profile):
-        self.profile_p2 = profile
-        self._setup_local_duel_word_input()
+    def _duel_player_name(self, idx):
+        return self.duel_profiles[idx].get("username", f"Player {idx + 1}")
 
-    # NEW: Handles word input after P1 and P2 profiles are set
+    # Handles word input once every player has a profile
     def _setup_local_duel_word_input(self):
-        for w in self.center_frame.winfo_children(): w.destroy()
-        tk.Label(self.center_frame, text="Enter Secret Words", bg=THEME["bg"], font=("Helvetica", 14, "bold")).pack(pady=10)
-        
+        # Rebuilt every time: the rows depend on this duel's roster
+        self.views.show("duel_words", self._build_duel_word_input, fresh=True, transient=True)
+
+    def _build_duel_word_input(self, frame):
+        THEMES.style(tk.Label(frame, text="Enter Secret Words", font=("Helvetica", 14, "bold")), "label").pack(pady=10)
+
         # Simple inputs container
-        f = tk.Frame(self.center_frame, bg=THEME["bg"])
+        f = THEMES.style(tk.Frame(frame), "surface")
         f.pack(pady=10)
-        
-        p1_name = self.profile.get("username", "Player 1")
-        p2_name = self.profile_p2.get("username", "Player 2")
-        
-        # P1
-        tk.Label(f, text=f"{p1_name}'s Secret:", bg=THEME["bg"]).grid(row=0, column=0, padx=10, pady=5)
-        p1_word = tk.Entry(f, show="*")
-        p1_word.grid(row=0, column=1, padx=10, pady=5)
-        
-        # P2
-        tk.Label(f, text=f"{p2_name}'s Secret:", bg=THEME["bg"]).grid(row=1, column=0, padx=10, pady=5)
-        p2_word = tk.Entry(f, show="*")
-        p2_word.grid(row=1, column=1, padx=10, pady=5)
-
-        # Added activebackground for FIGHT button
-        tk.Button(self.center_frame, text="FIGHT!", bg=THEME["primary"], fg="white", font=("Helvetica", 12, "bold"), relief="flat", activebackground=THEME["primary_hover"],
-                  command=lambda: self._start_same_device_duel(p1_word.get().strip(), p2_word.get().strip())).pack(pady=20)
-        
-        tk.Button(self.center_frame, text="Back", command=self.open_duel_options, relief="flat", bd=0, bg=THEME["bg"], fg=THEME["muted"], activeforeground=THEME["text_main"]).pack()
 
-    def _start_same_device_duel(self, p1_w, p2_w):
-        p1_w = p1_w.lower()
-        p2_w = p2_w.lower()
-        
-        if not p1_w.isalpha() or not p2_w.isalpha(): 
+        entries = []
+        for i in range(len(self.duel_profiles)):
+            if self.duel_profiles[i].get("bot"): continue # Bots pick their own word
+            THEMES.style(tk.Label(f, text=f"{self._duel_player_name(i)}'s Secret:"), "label").grid(row=i, column=0, padx=10, pady=5)
+            e = THEMES.style(tk.Entry(f, show="*"), "entry")
+            e.grid(row=i, column=1, padx=10, pady=5)
+            entries.append(e)
+
+        THEMES.style(tk.Button(frame, text="FIGHT!", font=("Helvetica", 12, "bold"), relief="flat",
+                               command=lambda: self._start_same_device_duel([e.get().strip() for e in entries])), "button.primary").pack(pady=20)
+
+        THEMES.style(tk.Button(frame, text="Back", command=self.open_duel_options, relief="flat", bd=0), "button.link").pack()
+
+    def _start_same_device_duel(self, words):
+        words = [w.lower() for w in words]
+
+        if not all(w.isalpha() for w in words):
             messagebox.showerror("Oops", "Words must be letters only")
             return
-            
+
         # Validate secret words against the dictionary
-        if VALID_WORDS and (p1_w not in VALID_WORDS or p2_w not in VALID_WORDS):
-            messagebox.showerror("Oops", "Both secret words must be valid words from the dictionary.")
+        if VALID_WORDS and any(w not in VALID_WORDS for w in words):
+            messagebox.showerror("Oops", "Every secret word must be a valid word from the dictionary.")
             return
-        
+
         # Check lengths
-        if len(p1_w) != len(p2_w):
-            messagebox.showerror("Oops", "Both secret words must be the same length for a fair duel.")
+        if len({len(w) for w in words}) != 1:
+            messagebox.showerror("Oops", "All secret words must be the same length for a fair duel.")
             return
 
+        # Bots pick a word of the same length
+        bot_count = len(self.duel_profiles) - len(words)
+        if bot_count:
+            try: words = words + [self._pick_bot_secret(len(words[0])) for _ in range(bot_count)]
+            except IndexError:
+                messagebox.showerror("Oops", f"The bots don't know any {len(words[0])}-letter words.")
+                return
 
-        # Basic validation passed
-        for w in self.center_frame.winfo_children(): w.destroy()
-        
-        # Containers
-        container = tk.Frame(self.center_frame, bg=THEME["bg"])
-        container.pack(fill="both", expand=True)
-        
-        self.results = {"P1": None, "P2": None}
-        self.finished = {"P1": False, "P2": False}
-        self.p1_secret = p1_w
-        self.p2_secret = p2_w
-
-        # Panels
-        left = tk.Frame(container, bg=THEME["bg"], padx=10); left.pack(side="left", fill="both", expand=True)
-        right = tk.Frame(container, bg=THEME["bg"], padx=10); right.pack(side="right", fill="both", expand=True)
-        
-        # P1 tries to guess P2's word
-        p1_name = self.profile.get("username", "Player 1")
-        # CHANGED: Passed self.profile
-        self.panel_p1 = PlayerPanel(left, "P1", p1_name, len(p2_w), p2_w, self._player_finished, self._player_made_guess, self.profile)
-        self.panel_p1.pack()
-        
-        # P2 tries to guess P1's word
-        p2_name = self.profile_p2.get("username", "Player 2 (Opponent)")
-        # CHANGED: Passed self.profile_p2
-        self.panel_p2 = PlayerPanel(right, "P2", p2_name, len(p1_w), p1_w, self._player_finished, self._player_made_guess, self.profile_p2)
-        self.panel_p2.pack()
-        
-        self.active = "P1"
+        # Basic validation passed: the board lives only until the players leave it
+        container = self.views.show("duel", lambda f: None, fresh=True, transient=True)
+
+        n = len(words)
+        self.duel_ids = [f"P{i + 1}" for i in range(n)]
+        self.results = {pid: None for pid in self.duel_ids}
+        self.finished = {pid: False for pid in self.duel_ids}
+        self.duel_secrets = dict(zip(self.duel_ids, words))
+        self.duel_panels = {}
+        self.duel_bots = {}
+        self.duel_slots = {}
+        self._enabled_pid = None
+
+        # One empty slot per player; the PlayerPanel inside is only built on that player's first turn,
+        # with its avatar composed on the background thread meanwhile
+        for profile in self.duel_profiles: prefetch_avatar(profile)
+        cols = min(n, DUEL_PANELS_PER_ROW)
+        for c in range(cols): container.grid_columnconfigure(c, weight=1)
+        for i, pid in enumerate(self.duel_ids):
+            slot = THEMES.style(tk.Frame(container, padx=10), "surface")
+            slot.grid(row=i // cols, column=i % cols, sticky="n")
+            THEMES.style(tk.Label(slot, text=self._duel_player_name(i), font=("Helvetica", 14, "bold")), "label.muted").pack(pady=(5, 5))
+            self.duel_slots[pid] = slot
+
+        targets = [self.duel_secrets[self.duel_ids[(i + 1) % n]] for i in range(n)]
+        self.duel_recorder = ReplayRecorder.start("duel", len(words[0]), targets, [self._duel_player_name(i) for i in range(n)])
+
+        self.turns = TurnScheduler(self.duel_ids)
+        self.broadcast = get_broadcaster()
+        if self.broadcast:
+            self.broadcast.publish("start", names=[self._duel_player_name(i) for i in range(n)], length=len(words[0]),
+                                   active=self._active_seat())
         self._apply_turn_state()
 
+    def _ensure_duel_panel(self, pid):
+        panel = self.duel_panels.get(pid)
+        if panel is not None: return panel
+        i = self.duel_ids.index(pid)
+        # Each player guesses the next player's word (P1 -> P2's word, ..., PN -> P1's word)
+        target = self.duel_ids[(i + 1) % len(self.duel_ids)]
+        slot = self.duel_slots[pid]
+        for w in slot.winfo_children(): w.destroy()
+        panel = PlayerPanel(slot, pid, self._duel_player_name(i), len(self.duel_secrets[target]), self.duel_secrets[target],
+                            self._player_finished, self._player_made_guess, self.duel_profiles[i], hard_mode=self.duel_hard_mode)
+        panel.pack()
+        self.duel_panels[pid] = panel
+        level = self.duel_profiles[i].get("bot")
+        if level: self.duel_bots[pid] = BotPlayer(panel, level)
+        return panel
+
     def _apply_turn_state(self):
-        # Manage turns
-        if self.active == "P1":
-            self.panel_p1.enable(not self.finished["P1"])
-            self.panel_p2.enable(False)
-        else:
-            self.panel_p1.enable(False)
-            self.panel_p2.enable(not self.finished["P2"])
+        # Only the previously enabled panel and the new active one change state
+        prev = self._enabled_pid
+        if prev is not None and prev in self.duel_panels: self.duel_panels[prev].enable(False)
+        pid = self.turns.active
+        self._enabled_pid = pid
+        if pid is None: return
+        if pid != prev and self.duel_recorder: self.duel_recorder.turn(self.duel_ids.index(pid))
+        panel = self._ensure_duel_panel(pid)
+        bot = self.duel_bots.get(pid)
+        if bot:
+            # Humans can't type into a bot's board; it moves on its own
+            panel.enable(False)
+            bot.take_turn()
+            return
+        panel.enable(True)
+        panel.guess_entry.focus_set()
+
+    def _active_seat(self):
+        return None if self.turns.active is None else self.duel_ids.index(self.turns.active)
 
     def _player_made_guess(self, pid):
-        other = "P2" if pid == "P1" else "P1"
-        if not self.finished[other]: self.active = other
+        if self.duel_recorder: self.duel_recorder.guess(self.duel_ids.index(pid), self.duel_panels[pid].last_guess)
+        if self.turns.active == pid: self.turns.advance()
         self._apply_turn_state()
+        if self.broadcast:
+            panel = self.duel_panels[pid]
+            self.broadcast.publish("guess", player=self.duel_ids.index(pid), word=panel.last_guess,
+                                   colors=WordleEngine.check_guess(panel.last_guess, panel.secret), active=self._active_seat())
 
     def _player_finished(self, pid, attempts, guessed):
         self.results[pid] = (attempts, guessed)
         self.finished[pid] = True
-        self.panel_p1.enable(False)
-        self.panel_p2.enable(False)
-        
-        other = "P2" if pid == "P1" else "P1"
-        if not self.finished[other]:
-            self.active = other
+        self.duel_panels[pid].enable(False)
+        if self.duel_recorder: self.duel_recorder.result(self.duel_ids.index(pid), attempts, guessed)
+
+        nxt = self.turns.finish(pid)
+        if self.broadcast:
+            self.broadcast.publish("finish", player=self.duel_ids.index(pid), attempts=attempts, guessed=guessed,
+                                   active=self._active_seat())
+        if nxt is not None:
             self._apply_turn_state()
         else:
-            # Both finished
-            self._show_duel_winner_overlay()
+            # Everyone finished
+            self._enabled_pid = None
+            if self.duel_recorder:
+                self.duel_recorder.save()
+                self.duel_recorder = None
+            if self.broadcast:
+                self.broadcast.publish("over", ranking=[self.duel_ids.index(p) for p in self._rank_duel_results()],
+                                       secrets=[self.duel_panels[p].secret for p in self.duel_ids])
+            results = [(self._rating_name(self.duel_ids.index(p)), *self.results[p]) for p in self._rank_duel_results()]
+            ratings = self._show_duel_winner_overlay()
+            self._with_leaderboard(lambda board: self._show_duel_ratings(ratings, board, board.record(results)))
+
+    def _rating_name(self, idx):
+        """Leaderboard name for a duel seat: bots share one rating per level."""
+        profile = self.duel_profiles[idx]
+        return f"Bot ({profile['bot']})" if profile.get("bot") else self._duel_player_name(idx)
+
+    def _rank_duel_results(self):
+        """Returns player ids best-first: guessed before not guessed, then fewest attempts."""
+        order = {pid: i for i, pid in enumerate(self.duel_ids)}
+        return sorted(self.duel_ids, key=lambda p: (not self.results[p][1], self.results[p][0], order[p]))
 
     def _show_duel_winner_overlay(self):
-        # Determine winner
-        p1_a, p1_g = self.results["P1"]
-        p2_a, p2_g = self.results["P2"]
-        
-        winner_name = "Nobody"
-        
-        # Logic: Lowest attempts wins, providing they guessed it.
-        if p1_g and not p2_g: winner_name = "Player 1"
-        elif p2_g and not p1_g: winner_name = "Player 2"
-        elif p1_g and p2_g:
-            if p1_a < p2_a: winner_name = "Player 1"
-            elif p2_a < p1_a: winner_name = "Player 2"
-            else: winner_name = "Tie"
-        
+        """Shows the result card; returns the (empty) frame the rating changes go into."""
+        # Determine winner: lowest attempts wins, providing they guessed it.
+        ranking = self._rank_duel_results()
+        best_a, best_g = self.results[ranking[0]]
+        winners = [p for p in ranking if self.results[p] == (best_a, True)] if best_g else []
+
+        winner_idx = None
+        if not winners: winner_name = "Nobody"
+        elif len(winners) > 1: winner_name = "Tie"
+        else:
+            winner_idx = self.duel_ids.index(winners[0])
+            winner_name = f"Player {winner_idx + 1}"
+
         # Overlay
-        overlay = tk.Frame(self.center_frame, bg="white")
+        overlay = THEMES.style(tk.Frame(self.views.frame("duel") or self.center_frame), "overlay")
         overlay.place(relx=0, rely=0, relwidth=1, relheight=1)
-        
-        card = tk.Frame(overlay, bg=THEME["bg"], padx=40, pady=40)
+
+        card = THEMES.style(tk.Frame(overlay, padx=40, pady=40), "surface")
         card.place(relx=0.5, rely=0.5, anchor="center")
-        
-        tk.Label(card, text="DUEL OVER", font=("Helvetica", 24, "bold"), bg=THEME["bg"], fg=THEME["muted"]).pack(pady=10)
-        
-        # START CHANGE 1: Display Winner Avatar
+
+        THEMES.style(tk.Label(card, text="DUEL OVER", font=("Helvetica", 24, "bold")), "label.muted").pack(pady=10)
+
         if winner_name == "Tie":
-            tk.Label(card, text="It's a Tie!", font=("Helvetica", 18), bg=THEME["bg"], fg=THEME["primary"]).pack()
-            tk.Label(card, text="🤝", font=("Helvetica", 60), bg=THEME["bg"]).pack(pady=10)
+            THEMES.style(tk.Label(card, text="It's a Tie!", font=("Helvetica", 18)), "label.title").pack()
+            THEMES.style(tk.Label(card, text="🤝", font=("Helvetica", 60)), "label").pack(pady=10)
         elif winner_name == "Nobody":
-             tk.Label(card, text="Nobody won...", font=("Helvetica", 18), bg=THEME["bg"], fg=THEME["error"]).pack()
-             tk.Label(card, text="😭", font=("Helvetica", 60), bg=THEME["bg"]).pack(pady=10)
+            THEMES.style(tk.Label(card, text="Nobody won...", font=("Helvetica", 18)), "label.error").pack()
+            THEMES.style(tk.Label(card, text="😭", font=("Helvetica", 60)), "label").pack(pady=10)
         else:
-            tk.Label(card, text=f"{winner_name} Wins!", font=("Helvetica", 20, "bold"), bg=THEME["bg"], fg=THEME["success"]).pack(pady=10)
-            
-            winner_profile = None
-            if winner_name == "Player 1":
-                winner_profile = self.profile
-                # Use P1's customized name for the overlay text
-                p1_username = self.profile.get("username", "Player 1")
-                tk.Label(card, text=f"Congratulations, {p1_username}!", bg=THEME["bg"], fg=THEME["muted"]).pack()
-            elif winner_name == "Player 2":
-                winner_profile = self.profile_p2 # <<< Using P2's custom profile
-                # Use P2's customized name for the overlay text
-                p2_username = self.profile_p2.get("username", "Player 2")
-                tk.Label(card, text=f"Congratulations, {p2_username}!", bg=THEME["bg"], fg=THEME["muted"]).pack()
+            THEMES.style(tk.Label(card, text=f"{winner_name} Wins!", font=("Helvetica", 20, "bold")), "label.success").pack(pady=10)
+            # Use the winner's customized name for the overlay text
+            THEMES.style(tk.Label(card, text=f"Congratulations, {self._duel_player_name(winner_idx)}!"), "label.muted").pack()
 
+            winner_profile = self.duel_profiles[winner_idx]
             if winner_profile:
-                canv = tk.Canvas(card, width=120, height=120, bg=THEME["bg"], highlightthickness=0)
+                canv = THEMES.style(tk.Canvas(card, width=120, height=120, highlightthickness=0), "surface")
                 canv.pack(pady=10)
                 draw_profile_avatar(canv, winner_profile, 120, 120)
                 self.tk_cache["duel_win_avatar"] = canv # Cache to prevent GC
             else:
-                 tk.Label(card, text="👤", font=("Helvetica", 60), bg=THEME["bg"]).pack(pady=10)
-        # END CHANGE 1
+                THEMES.style(tk.Label(card, text="👤", font=("Helvetica", 60)), "label").pack(pady=10)
+
+        # Standings for everyone (mostly useful with more than two players)
+        if len(ranking) > 2:
+            board = THEMES.style(tk.Frame(card), "surface")
+            board.pack(pady=(5, 0))
+            for place, pid in enumerate(ranking, 1):
+                att, ok = self.results[pid]
+                name = self._duel_player_name(self.duel_ids.index(pid))
+                THEMES.style(tk.Label(board, text=f"{place}. {name}: {att if ok else 'X'}"), "label").pack(anchor="w")
+
+        ratings = THEMES.style(tk.Frame(card), "surface") # Filled by _show_duel_ratings
+        ratings.pack(pady=(10, 0))
+
+        THEMES.style(tk.Button(card, text="Back to Menu", font=("Helvetica", 12), relief="flat",
+                               command=self.setup_main_menu), "button.primary").pack(pady=20)
+        return ratings
+
+    def _show_duel_ratings(self, frame, board, deltas):
+        """Each player's new rating, change and rank, best result first (deltas keep the seat order given to record)."""
+        if not frame.winfo_exists(): return # Left the result card before the ratings were ready
+        for name, d in deltas.items():
+            THEMES.style(tk.Label(frame, text=f"{name}: {board.ratings[name]:.0f} ({d:+.0f})  ·  #{board.rank(name)}",
+                                  font=("Helvetica", 9)), "label.muted").pack(anchor="w")
 
-        tk.Button(card, text="Back to Menu", bg=THEME["primary"], fg="white", font=("Helvetica", 12), relief="flat", activebackground=THEME["primary_hover"],
-                  command=self.setup_main_menu).pack(pady=20)
+    # ---------------------------
+    # LINK INBOX
+    # ---------------------------
+    def show_inbox(self):
+        self.views.show("inbox", self._build_inbox)
+
+    def _build_inbox(self, frame):
+        THEMES.style(tk.Label(frame, text="Duel Inbox", font=("Helvetica", 14, "bold")), "label").pack(pady=(15, 5))
+        THEMES.style(tk.Label(frame, text="Copy duel links anywhere, or paste a batch below."), "label.muted").pack()
+
+        add_row = THEMES.style(tk.Frame(frame), "surface")
+        add_row.pack(pady=10)
+        paste = THEMES.style(tk.Entry(add_row, width=50, relief="flat", font=("Helvetica", 10)), "entry")
+        paste.pack(side="left", padx=5, ipady=3)
+        def add_pasted():
+            self.inbox.submit(LinkInbox.extract(paste.get()))
+            paste.delete(0, tk.END)
+            self._poll_inbox_soon()
+        paste.bind("<Return>", lambda e: add_pasted())
+        THEMES.style(tk.Button(add_row, text="Add", relief="flat", padx=10, command=add_pasted), "button.primary").pack(side="left")
+
+        if self._inbox_watch is None: self._inbox_watch = tk.BooleanVar(value=True)
+        THEMES.style(tk.Checkbutton(frame, text="Watch clipboard", variable=self._inbox_watch, relief="flat"), "check").pack()
+        status = THEMES.style(tk.Label(frame, font=("Helvetica", 10)), "label.muted")
+        status.pack(pady=5)
+        rows = THEMES.style(tk.Frame(frame), "surface")
+        rows.pack(pady=5)
+        THEMES.style(tk.Button(frame, text="Back", relief="flat", bd=0,
+                               command=self.setup_main_menu), "button.link").pack(pady=10)
+
+        def play(entry):
+            def done(summary):
+                self.inbox.mark_done(entry, summary)
+                refresh()
+            self._play_link(entry, on_done=done, announce=False)
+
+        def remove(entry):
+            self.inbox.remove(entry)
+            refresh()
+
+        def refresh():
+            if not rows.winfo_exists(): return # Screen evicted; the poll carries on without it
+            for w in rows.winfo_children(): w.destroy()
+            entries = self.inbox.pending()
+            counts = {s: sum(e["state"] == s for e in entries) for s in INBOX_STATES}
+            text = "   ·   ".join(f"{counts[s]} {label.lower()}" for s, label in INBOX_STATES.items() if counts[s])
+            status.config(text=("Decoding links…   " if self.inbox.busy else "") + (text or "No duels yet."))
+            for r, e in enumerate(entries):
+                state_style = "label" if e["state"] in ("finish", "challenge") else "label.muted"
+                THEMES.style(tk.Label(rows, text=INBOX_STATES[e["state"]], font=("Helvetica", 10, "bold")), state_style).grid(row=r, column=0, sticky="w", padx=8)
+                if e["state"] == "invalid": detail = e["problem"]
+                elif e["state"] == "done": detail = e["summary"]
+                elif e["kind"] == "return": detail = f"{e['length']} letters · Friend: {e['attempts'] if e['guessed'] else 'X'}"
+                else: detail = f"{e['length']} letters"
+                THEMES.style(tk.Label(rows, text=detail), "label.muted").grid(row=r, column=1, sticky="w", padx=8)
+                if e["state"] in ("finish", "challenge"):
+                    THEMES.style(tk.Button(rows, text="Play", relief="flat", padx=8, command=lambda e=e: play(e)),
+                                 "button.primary").grid(row=r, column=2, padx=4, pady=2)
+                THEMES.style(tk.Button(rows, text="✕", relief="flat", bd=0, command=lambda e=e: remove(e)),
+                             "button.link").grid(row=r, column=3, padx=4)
+
+        self._inbox_refresh = refresh
+
+        def reset():
+            paste.delete(0, tk.END)
+            refresh()
+            self._poll_inbox_soon()
+        reset()
+        return reset
+
+    def _poll_inbox(self):
+        # Runs on the root, not the inbox screen: keeps collecting while the player is off in a
+        # game, even once the view cache has dropped the screen
+        self._inbox_job = None
+        if self._inbox_watch.get():
+            try: text = self.root.clipboard_get()
+            except tk.TclError: text = ""
+            if text != self._inbox_clip:
+                self._inbox_clip = text
+                self.inbox.submit(LinkInbox.extract(text))
+        was_busy = self.inbox.busy
+        if self.inbox.collect() or was_busy != self.inbox.busy: self._inbox_refresh()
+        self._inbox_job = self.root.after(BOT_POLL_MS if self.inbox.busy else INBOX_POLL_MS, self._poll_inbox)
+
+    def _poll_inbox_soon(self):
+        if self._inbox_job: self.root.after_cancel(self._inbox_job)
+        self._inbox_job = self.root.after(BOT_POLL_MS, self._poll_inbox)
 
     # ---------------------------
     # LINK DUEL LOGIC
     # ---------------------------
     def duel_share_link_setup(self):
-        for w in self.center_frame.winfo_children(): w.destroy()
-        tk.Label(self.center_frame, text="Create Challenge Link", bg=THEME["bg"], font=("Helvetica", 14, "bold")).pack(pady=15)
+        self.views.show("link_setup", self._build_link_setup)
+
+    def _build_link_setup(self, frame):
+        THEMES.style(tk.Label(frame, text="Create Challenge Link", font=("Helvetica", 14, "bold")), "label").pack(pady=15)
         
-        f = tk.Frame(self.center_frame, bg=THEME["bg"])
+        f = THEMES.style(tk.Frame(frame), "surface")
         f.pack()
-        tk.Label(f, text="Your Secret Word:", bg=THEME["bg"]).grid(row=0, column=0, padx=10)
-        w_entry = tk.Entry(f, show="*"); w_entry.grid(row=0, column=1)
+        THEMES.style(tk.Label(f, text="Your Secret Word:"), "label").grid(row=0, column=0, padx=10)
+        w_entry = THEMES.style(tk.Entry(f, show="*"), "entry"); w_entry.grid(row=0, column=1)
         
         def generate():
             secret = w_entry.get().strip().lower()
@@ -1118,119 +3875,125 @@ class MainApp:
             link = DuelLinkFlow.create_initial_link(len(secret), secret)
             
             # Show link
-            top = tk.Toplevel(self.root)
+            top = THEMES.style(tk.Toplevel(self.root), "surface")
             top.title("Copy Link")
             top.geometry("600x150")
-            tk.Label(top, text="Send this link to your friend:").pack(pady=10)
-            e = tk.Entry(top, width=80); e.pack(padx=10); e.insert(0, link)
-            tk.Button(top, text="Done", activebackground=THEME["grey"], command=lambda: [top.destroy(), self.setup_main_menu()]).pack(pady=10)
+            THEMES.style(tk.Label(top, text="Send this link to your friend:"), "label").pack(pady=10)
+            e = THEMES.style(tk.Entry(top, width=80), "entry"); e.pack(padx=10); e.insert(0, link)
+            THEMES.style(tk.Button(top, text="Done", command=lambda: [top.destroy(), self.setup_main_menu()]), "button.plain").pack(pady=10)
 
-        # Added activebackground for Generate Link button
-        tk.Button(self.center_frame, text="Generate Link", bg=THEME["primary"], fg="white", font=("Helvetica", 11, "bold"),
-                  relief="flat", activebackground=THEME["primary_hover"], command=generate).pack(pady=20)
-        # Changed back button style to have an active foreground color
-        tk.Button(self.center_frame, text="Back", command=self.setup_main_menu, relief="flat", bd=0, bg=THEME["bg"], fg=THEME["muted"], activeforeground=THEME["text_main"]).pack()
+        THEMES.style(tk.Button(frame, text="Generate Link", font=("Helvetica", 11, "bold"),
+                               relief="flat", command=generate), "button.primary").pack(pady=20)
+        THEMES.style(tk.Button(frame, text="Back", command=self.setup_main_menu, relief="flat", bd=0), "button.link").pack()
+        return lambda: w_entry.delete(0, tk.END)
 
     def _join_from_box(self):
         txt = self.link_entry.get().strip()
         if not txt: return
-        
-        # 1. Check if Return Payload (Friend played, now telling Host result)
-        if "ret:" in txt or "ret%3A" in txt:
-             try:
-                lr, secB, attB, guessB = DuelLinkFlow.decode_return_link(txt)
-                # Host plays now
-                
-                # Check 1: Validate length of the decoded word
-                if len(secB) != lr: 
-                    messagebox.showerror("Error", "Link corrupted: Word length mismatch.")
-                    return
-                # Check 2: Validate the secret word itself
-                if VALID_WORDS and secB not in VALID_WORDS:
-                    messagebox.showerror("Error", "Link contains an invalid secret word. Cannot proceed.")
-                    return
-                
-                def on_host_finish(attA, guessA):
-                    # Compare
-                    winner = "Tie"
-                    if guessA and not guessB: winner = self.profile.get("username", "You")
-                    elif guessB and not guessA: winner = "Friend"
-                    elif guessA and guessB:
-                        if attA < attB: winner = self.profile.get("username", "You")
-                        elif attB < attA: winner = "Friend"
-                    
-                    # Show result overlay
-                    msg = f"Winner: {winner}\n({self.profile.get('username', 'You')}: {attA if guessA else 'X'}, Friend: {attB if guessB else 'X'})"
-                    
+        try: link = DuelLinkFlow.decode_link(txt)
+        except ValueError:
+            messagebox.showerror("Error", "Invalid Link")
+            return
+        problem = DuelLinkFlow.problem(link)
+        if problem:
+            messagebox.showerror("Error", problem)
+            return
+        self._play_link(link)
+
+    def _play_link(self, link, on_done=None, announce=True):
+        """Plays a decoded, validated link. on_done gets a one-line summary once the round is over;
+        announce=False (the inbox) leaves the result to on_done instead of message boxes."""
+        me = self.profile.get("username", "You")
+
+        # 1. Return link: the friend played, the host plays the friend's word and the duel is decided
+        if link["kind"] == "return":
+            lr, secB, attB, guessB = link["length"], link["secret"], link["attempts"], link["guessed"]
+
+            def on_host_finish(attA, guessA):
+                # Compare
+                winner = "Tie"
+                if guessA and not guessB: winner = me
+                elif guessB and not guessA: winner = "Friend"
+                elif guessA and guessB:
+                    if attA < attB: winner = me
+                    elif attB < attA: winner = "Friend"
+                score = f"{me}: {attA if guessA else 'X'}, Friend: {attB if guessB else 'X'}"
+
+                def report(board):
+                    key = _history_name(me) # record() keys its result by the stored name
+                    delta = board.record([(me, attA, guessA), ("Friend", attB, guessB)], kind="link")[key]
+                    rating = f"Rating: {board.ratings[key]:.0f} ({delta:+.0f}), #{board.rank(key)}"
+                    if on_done: on_done(f"Winner: {winner} ({score}) · {rating}")
+                    if not announce: return
+
                     # New reveal for the host player if they lost (guessing the friend's word)
                     if not guessA:
                          messagebox.showinfo(
                             f"{self.profile.get('username', 'Your')} Game Over", 
                             f"You ran out of guesses!\nThe secret word was: {secB.upper()}"
                         )
-                        
-                    messagebox.showinfo("Duel Result", msg)
-                
-                SingleGameWindow(self.root, secB, lr, self.profile, title="Duel: Your Turn", on_finish=on_host_finish)
-                return
-             except Exception as e:
-                 messagebox.showerror("Error", f"Invalid Return Link: {e}")
-                 return
+                    messagebox.showinfo("Duel Result", f"Winner: {winner}\n({score})\n{rating}")
+                self._with_leaderboard(report)
 
-        # 2. Check if Initial Load (Friend joining Host)
-        try:
-            length, secretA = DuelLinkFlow.decode_initial_link(txt)
+            SingleGameWindow.acquire(self.root, secB, lr, self.profile, title="Duel: Your Turn", on_finish=on_host_finish)
+            return
+
+        # 2. Initial link: the friend guesses the host's word, then sends a return link
+        length, secretA = link["length"], link["secret"]
+
+        def on_friend_finish(attB, guessB):
+            if on_done: on_done(f"You: {attB if guessB else 'X'} · return link next")
+            # New reveal for the friend player if they lost (guessing the host's word)
+            if announce and not guessB:
+                 messagebox.showinfo(
+                    f"{self.profile.get('username', 'Your')} Game Over", 
+                    f"You ran out of guesses!\nThe secret word was: {secretA.upper()}"
+                )
             
-            # Check 1: Validate the secret word itself
-            if VALID_WORDS and secretA not in VALID_WORDS:
-                messagebox.showerror("Error", "Link contains an invalid secret word. Cannot proceed.")
-                return
+            # Popup to ask for secret
+            pop = THEMES.style(tk.Toplevel(self.root), "surface")
+            pop.title("Round 2 Setup")
+            pop.geometry("400x200")
+            THEMES.style(tk.Label(pop, text="You finished! Now enter a secret for your friend:"), "label").pack(pady=10)
+            e_sec = THEMES.style(tk.Entry(pop), "entry"); e_sec.pack(pady=5)
             
-            def on_friend_finish(attB, guessB):
-                # Friend finished guessing Host's word.
-                # Now Friend creates return link with their stats + their secret
+            def make_ret():
+                s = e_sec.get().strip().lower()
+                if not s.isalpha() or len(s) != length: 
+                    messagebox.showerror("Error", f"Word must be {length} letters."); return
+                
+                # Validate return secret word against dictionary
+                if VALID_WORDS and s not in VALID_WORDS:
+                    messagebox.showerror("Error", "Secret word must be a valid word from the dictionary.")
+                    return
                 
-                # New reveal for the friend player if they lost (guessing the host's word)
-                if not guessB:
-                     messagebox.showinfo(
-                        f"{self.profile.get('username', 'Your')} Game Over", 
-                        f"You ran out of guesses!\nThe secret word was: {secretA.upper()}"
-                    )
+                ret_link = DuelLinkFlow.create_return_link(length, s, attB, guessB)
                 
-                # Popup to ask for secret
-                pop = tk.Toplevel(self.root)
-                pop.title("Round 2 Setup")
-                pop.geometry("400x200")
-                tk.Label(pop, text="You finished! Now enter a secret for your friend:").pack(pady=10)
-                e_sec = tk.Entry(pop); e_sec.pack(pady=5)
+                # Show return link
+                top2 = THEMES.style(tk.Toplevel(self.root), "surface")
+                top2.title("Send Back")
+                top2.geometry("600x150")
+                THEMES.style(tk.Label(top2, text="Send this back to the Host:"), "label").pack(pady=10)
+                e2 = THEMES.style(tk.Entry(top2, width=80), "entry"); e2.pack(padx=10); e2.insert(0, ret_link)
+                pop.destroy()
                 
-                def make_ret():
-                    s = e_sec.get().strip().lower()
-                    if not s.isalpha() or len(s) != length: 
-                        messagebox.showerror("Error", f"Word must be {length} letters."); return
-                    
-                    # Validate return secret word against dictionary
-                    if VALID_WORDS and s not in VALID_WORDS:
-                        messagebox.showerror("Error", "Secret word must be a valid word from the dictionary.")
-                        return
-                    
-                    ret_link = DuelLinkFlow.create_return_link(length, s, attB, guessB)
-                    
-                    # Show return link
-                    top2 = tk.Toplevel(self.root)
-                    top2.title("Send Back")
-                    top2.geometry("600x150")
-                    tk.Label(top2, text="Send this back to the Host:").pack(pady=10)
-                    e2 = tk.Entry(top2, width=80); e2.pack(padx=10); e2.insert(0, ret_link)
-                    pop.destroy()
-                    
-                tk.Button(pop, text="Create Return Link", activebackground=THEME["grey"], command=make_ret).pack(pady=10)
-
-            SingleGameWindow(self.root, secretA, length, self.profile, title="Duel: Guess Host's Word", on_finish=on_friend_finish)
-        except Exception as e:
-            messagebox.showerror("Error", "Invalid Link")
+            THEMES.style(tk.Button(pop, text="Create Return Link", command=make_ret), "button.plain").pack(pady=10)
+
+        SingleGameWindow.acquire(self.root, secretA, length, self.profile, title="Duel: Guess Host's Word", on_finish=on_friend_finish)
+
+def _on_first_paint(root):
+    root.update_idletasks()
+    STARTUP.mark("first paint")
+    STARTUP.report()
+    if STARTUP.budget_ms is not None:
+        # Budget runs are startup checks: stop here and report through the exit code
+        root.destroy()
+        sys.exit(1 if STARTUP.over_budget() else 0)
 
 if __name__ == "__main__":
     root = tk.Tk()
+    STARTUP.mark("Tk root")
     app = MainApp(root)
+    STARTUP.mark("main window built")
+    if STARTUP.enabled: root.after_idle(lambda: _on_first_paint(root))
     root.mainloop()
\ No newline at end of file